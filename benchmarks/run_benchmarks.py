@@ -0,0 +1,261 @@
+"""
+Benchmarks for discovering, resolving and loading dynamic fixtures.
+
+Synthetic apps with the given number of fixture modules are generated in a
+temporary directory, with the dependencies between the fixtures shaped as:
+
+- deep: every fixture depends on the previous one
+- wide: every fixture depends on the first one
+- random: every fixture depends on up to three random earlier fixtures
+
+For every size and shape the following is measured against an in-memory
+SQLite database:
+
+- discover: `Loader.load_disk`, importing all fixture modules
+- resolve_all: `Graph.resolve_node` for all fixtures
+- resolve_nodes: `Graph.resolve_nodes` for the last ten fixtures
+- lookup: `LoadFixtureRunner.get_fixture_node` for every fixture
+- load: `LoadFixtureRunner.load_plan` for all fixtures, rolled back
+
+The results are written as JSON, e.g.:
+
+    $ python benchmarks/run_benchmarks.py --sizes 10,1000 --output results.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+FIXTURES_PER_APP = 100
+SHAPES = ("deep", "wide", "random")
+
+FIXTURE_TEMPLATE = """from django.contrib.auth.models import Group
+from dynamic_fixtures.fixtures import BaseFixture
+
+
+class Fixture(BaseFixture):
+    dependencies = {dependencies!r}
+
+    def load(self):
+        Group.objects.create(name="{app_label}.{name}")
+"""
+
+
+def get_dependencies(shape, index, rng):
+    """
+    :param str shape: deep, wide or random
+    :param int index: index of the fixture
+    :param random.Random rng:
+    :return: list of indexes of the fixtures the fixture depends on
+    """
+    if index == 0:
+        return []
+    if shape == "deep":
+        return [index - 1]
+    if shape == "wide":
+        return [0]
+    return sorted(rng.sample(range(index), min(rng.randint(0, 3), index)))
+
+
+def get_node(prefix, index):
+    return (
+        "%s_%s" % (prefix, index // FIXTURES_PER_APP),
+        "%05d_fixture" % index,
+    )
+
+
+def generate_apps(directory, prefix, size, shape, seed):
+    """
+    Write the packages of the synthetic apps.
+
+    :return: tuple of the app labels and all nodes
+    """
+    rng = random.Random(seed)
+    app_labels = []
+    nodes = []
+    for index in range(size):
+        app_label, name = get_node(prefix, index)
+        fixtures_dir = os.path.join(directory, app_label, "fixtures")
+        if not os.path.isdir(fixtures_dir):
+            os.makedirs(fixtures_dir)
+            for package in (os.path.dirname(fixtures_dir), fixtures_dir):
+                open(os.path.join(package, "__init__.py"), "w").close()
+            app_labels.append(app_label)
+
+        dependencies = [
+            get_node(prefix, dependency)
+            for dependency in get_dependencies(shape, index, rng)
+        ]
+        with open(os.path.join(fixtures_dir, name + ".py"), "w") as fixture_file:
+            fixture_file.write(
+                FIXTURE_TEMPLATE.format(
+                    dependencies=dependencies, app_label=app_label, name=name
+                )
+            )
+        nodes.append((app_label, name))
+    return app_labels, nodes
+
+
+def unload_modules(prefix):
+    for module_name in list(sys.modules):
+        if module_name.startswith(prefix + "_"):
+            del sys.modules[module_name]
+
+
+def measure(function, repeat, setup=None):
+    """
+    :return: dict with the timings in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+        "runs": timings,
+    }
+
+
+def run_scenario(size, shape, repeat, seed):
+    from django.db import transaction
+    from django.test.utils import override_settings
+    from dynamic_fixtures.fixtures.loader import Loader
+    from dynamic_fixtures.fixtures.runner import LoadFixtureRunner
+
+    prefix = "bench_%s_%s" % (shape, size)
+    directory = tempfile.mkdtemp(prefix="dynamic-fixtures-bench-")
+    sys.path.insert(0, directory)
+    try:
+        app_labels, nodes = generate_apps(directory, prefix, size, shape, seed)
+        installed_apps = list(settings.INSTALLED_APPS) + app_labels
+        with override_settings(INSTALLED_APPS=installed_apps):
+            results = {}
+
+            def discover():
+                Loader().load_disk()
+
+            results["discover"] = measure(
+                discover, repeat, setup=lambda: unload_modules(prefix)
+            )
+
+            runner = LoadFixtureRunner()
+            graph = runner.graph
+            results["resolve_all"] = measure(graph.resolve_node, repeat)
+            results["resolve_nodes"] = measure(
+                lambda: graph.resolve_nodes(nodes[-10:]), repeat
+            )
+
+            def lookup():
+                # A fresh runner, so memoized lookups are not measured
+                fresh = LoadFixtureRunner(loader=runner.loader)
+                fresh._graph = graph
+                for app_label, name in nodes:
+                    fresh.get_fixture_node(app_label=app_label, fixture_prefix=name)
+
+            results["lookup"] = measure(lookup, repeat)
+
+            plan = runner.get_plan()
+
+            def load():
+                with transaction.atomic():
+                    runner.load_plan(plan, progress_callback=None)
+                    transaction.set_rollback(True)
+
+            results["load"] = measure(load, repeat)
+    finally:
+        unload_modules(prefix)
+        sys.path.remove(directory)
+        shutil.rmtree(directory)
+
+    return {"size": size, "shape": shape, "results": results}
+
+
+def setup_django():
+    settings.configure(
+        DATABASES={
+            "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        },
+        INSTALLED_APPS=["django.contrib.auth", "django.contrib.contenttypes"],
+        USE_TZ=True,
+    )
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="10,1000,10000",
+        help="Comma separated numbers of fixture modules.",
+    )
+    parser.add_argument(
+        "--shapes",
+        default=",".join(SHAPES),
+        help="Comma separated shapes of the dependency graph.",
+    )
+    parser.add_argument(
+        "--repeat", default=3, type=int, help="Number of runs per benchmark."
+    )
+    parser.add_argument(
+        "--seed", default=0, type=int, help="Seed for the random dependencies."
+    )
+    parser.add_argument(
+        "--output", default=None, help="File to write the results to, else stdout."
+    )
+    options = parser.parse_args(argv)
+
+    shapes = options.shapes.split(",")
+    for shape in shapes:
+        if shape not in SHAPES:
+            parser.error("Unknown shape %s" % shape)
+
+    setup_django()
+
+    scenarios = []
+    for size in [int(size) for size in options.sizes.split(",")]:
+        for shape in shapes:
+            sys.stderr.write("Benchmarking %s fixtures, %s...\n" % (size, shape))
+            scenarios.append(run_scenario(size, shape, options.repeat, options.seed))
+
+    report = {
+        "created": datetime.datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "platform": platform.platform(),
+        "repeat": options.repeat,
+        "seed": options.seed,
+        "scenarios": scenarios,
+    }
+    output = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
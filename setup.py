@@ -24,6 +24,9 @@ setup(
         'doc': [
             'Sphinx==1.4.4',
             'sphinx-autobuild==0.6.0',
+        ],
+        'numpy': [
+            'numpy>=1.17',
         ]
     },
     setup_requires=[
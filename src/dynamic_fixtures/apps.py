@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class DynamicFixturesConfig(AppConfig):
+    name = "dynamic_fixtures"
+    verbose_name = "Dynamic fixtures"
+    default_auto_field = "django.db.models.AutoField"
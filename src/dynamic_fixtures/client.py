@@ -0,0 +1,98 @@
+"""
+Thin client for a fixture server started with
+`./manage.py load_dynamic_fixtures --serve <socket>`. It doesn't import
+Django, so it starts fast:
+
+    $ python -m dynamic_fixtures.client <socket> [app_label] [fixture_name]
+"""
+
+import argparse
+import json
+import socket
+import sys
+
+
+def send_request(socket_path, request, timeout=None):
+    """
+    Send a request to a fixture server.
+
+    :param str socket_path: path of the Unix socket of the server
+    :param dict request: see `FixtureServer.handle_request`
+    :param float timeout: seconds to wait for the response, None to wait
+                          until the fixtures are loaded.
+    :return: dict with the response
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(socket_path)
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode("utf-8") + b"\n")
+            stream.flush()
+            return json.loads(stream.readline().decode("utf-8"))
+    finally:
+        client.close()
+
+
+def format_event(event):
+    """
+    :param dict event: progress event of a load response
+    :return: str
+    """
+    node = "{}.{}".format(*event["node"]) if event["node"] else ""
+    if event["action"] == "load_success":
+        return "Loaded fixture {} ({:.03} seconds)".format(
+            node, event["elapsed_time"] or 0.0
+        )
+    if event["action"] == "bulk_flush":
+        return "  Inserted {} rows in bulk".format(event["rows"])
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load fixtures with a fixture server.")
+    parser.add_argument("socket", help="Unix socket of the server.")
+    parser.add_argument("app_label", default=None, nargs="?")
+    parser.add_argument("fixture_name", default=None, nargs="?")
+    parser.add_argument("--list", action="store_true", help="List the fixtures.")
+    parser.add_argument("--dry-run", action="store_true", help="Roll back all changes.")
+    parser.add_argument("--database", default=None, help="Database alias.")
+    parser.add_argument("--stop", action="store_true", help="Stop the server.")
+    options = parser.parse_args(argv)
+
+    if options.stop:
+        action = "stop"
+    elif options.list:
+        action = "list"
+    else:
+        action = "load"
+    response = send_request(
+        options.socket,
+        {
+            "action": action,
+            "app_label": options.app_label,
+            "fixture_name": options.fixture_name,
+            "dry_run": options.dry_run,
+            "database": options.database,
+        },
+    )
+    if not response["ok"]:
+        sys.stderr.write(response["error"] + "\n")
+        return 1
+
+    if action == "stop":
+        return 0
+    for node in response.get("nodes", []):
+        sys.stdout.write("{}.{}\n".format(*node))
+    for event in response.get("events", []):
+        line = format_event(event)
+        if line is not None:
+            sys.stdout.write(line + "\n")
+    sys.stdout.write("Total of {} fixtures\n".format(response["count"]))
+    if action == "load" and options.dry_run:
+        sys.stdout.write("Dry-run: all changes are rolled back.\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import json
+
+
+def read_durations(path):
+    """
+    Read the durations of fixtures from a profile written by
+    `FixtureProfiler.as_json`.
+
+    :param str path: path of the JSON file
+    :return: dict of node and duration in seconds
+    """
+    with open(path) as profile_file:
+        profiles = json.load(profile_file)
+    return {
+        (profile["app_label"], profile["fixture"]): profile["wall_time"]
+        for profile in profiles
+    }
+
+
+class PlanAnalysis(object):
+    """
+    Analysis of the dependency graph of a plan: the levels which can be loaded
+    in parallel, the critical path and the bottlenecks.
+    """
+
+    def __init__(self, graph, plan, durations=None):
+        """
+        :param Graph graph: the dependency graph
+        :param list plan: resolved list of nodes
+        :param dict durations: node and duration in seconds from earlier runs.
+                               Nodes without duration get the mean duration,
+                               or 1 second when no durations are known.
+        """
+        self.graph = graph
+        self.plan = plan
+        self.durations = durations or {}
+        known = [self.durations[node] for node in plan if node in self.durations]
+        self.default_duration = sum(known) / len(known) if known else 1.0
+
+    def get_duration(self, node):
+        return self.durations.get(node, self.default_duration)
+
+    @property
+    def levels(self):
+        return self.graph.get_levels(self.plan)
+
+    def get_critical_path(self):
+        """
+        The longest path through the graph weighted by duration, which is the
+        minimal time to load the plan with unlimited parallelism.
+
+        :return: tuple of list of nodes and the total duration
+        """
+        finish = {}
+        previous = {}
+        for node in self.plan:
+            start = 0.0
+            previous[node] = None
+            for dependency in self.graph.nodes[node]:
+                if finish[dependency] > start:
+                    start = finish[dependency]
+                    previous[node] = dependency
+            finish[node] = start + self.get_duration(node)
+
+        if not finish:
+            return [], 0.0
+
+        node = max(self.plan, key=lambda item: finish[item])
+        total = finish[node]
+        path = []
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return list(reversed(path)), total
+
+    def get_dependent_counts(self):
+        """
+        Count for every node how many nodes in the plan depend on it, directly
+        or indirectly.
+
+        :return: dict of node and number of dependent nodes
+        """
+        index = {node: position for position, node in enumerate(self.plan)}
+        # Bitmask of the dependent nodes of every node
+        dependents = dict.fromkeys(self.plan, 0)
+        for node in reversed(self.plan):
+            for dependency in self.graph.nodes[node]:
+                dependents[dependency] |= dependents[node] | (1 << index[node])
+        return {node: bin(mask).count("1") for node, mask in dependents.items()}
+
+    def get_bottlenecks(self, limit=10):
+        """
+        Nodes which most nodes depend on.
+
+        :param int limit: maximum number of nodes to return
+        :return: list of tuples of node and number of dependent nodes
+        """
+        counts = self.get_dependent_counts()
+        nodes = sorted(
+            (node for node in self.plan if counts[node]),
+            key=lambda node: (-counts[node], node),
+        )
+        return [(node, counts[node]) for node in nodes[:limit]]
+
+    def as_dict(self):
+        levels = {}
+        for depth, level in enumerate(self.levels):
+            for node in level:
+                levels[node] = depth
+        path, total = self.get_critical_path()
+        return {
+            "nodes": [
+                {
+                    "app_label": node[0],
+                    "fixture": node[1],
+                    "level": levels[node],
+                    "duration": self.get_duration(node),
+                    "dependencies": [list(dep) for dep in self.graph.nodes[node]],
+                }
+                for node in self.plan
+            ],
+            "level_widths": [len(level) for level in self.levels],
+            "critical_path": [list(node) for node in path],
+            "critical_path_duration": total,
+        }
+
+    def as_json(self):
+        return json.dumps(self.as_dict(), indent=2)
+
+    def as_dot(self):
+        critical = set(self.get_critical_path()[0])
+        lines = ["digraph fixtures {", "  rankdir=LR;"]
+        for node in self.plan:
+            attributes = 'label="{}.{}\\n{:.3f}s"'.format(
+                node[0], node[1], self.get_duration(node)
+            )
+            if node in critical:
+                attributes += ", color=red"
+            lines.append('  "{}.{}" [{}];'.format(node[0], node[1], attributes))
+        for node in self.plan:
+            for dependency in self.graph.nodes[node]:
+                lines.append(
+                    '  "{}.{}" -> "{}.{}";'.format(dependency[0], dependency[1], *node)
+                )
+        lines.append("}")
+        return "\n".join(lines)
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS, transaction
+from dynamic_fixtures.fixtures.bulk import BulkCollector
+from dynamic_fixtures.fixtures.exceptions import DryRun
+from dynamic_fixtures.fixtures.runner import LoadFixtureRunner
+
+
+class AsyncLoadFixtureRunner(LoadFixtureRunner):
+    """
+    Runner which loads fixtures with asyncio.
+
+    Fixtures of which all dependencies are loaded are started concurrently.
+    Fixtures with an `async def load` overlap while they wait for I/O; fixtures
+    with a regular `load` and all database work run one at a time with
+    `sync_to_async`, in the same thread and transaction.
+
+    Requires Django 3.0+.
+    """
+
+    async def aload_fixtures(
+        self,
+        nodes=None,
+        progress_callback=None,
+        dry_run=False,
+        concurrency=10,
+        database=DEFAULT_DB_ALIAS,
+    ):
+        """Load all fixtures for given nodes.
+
+        If no nodes are given all fixtures will be loaded.
+        :param list nodes: list of nodes to be loaded.
+        :param callable progress_callback: Callback which will be called while
+                                           handling the nodes.
+        :param bool dry_run: roll back all changes when done.
+        :param int concurrency: maximum number of fixtures loaded at the same
+                                time.
+        :param str database: database alias to load the fixtures in which
+                             don't set a database themselves.
+        :return: number of loaded fixtures
+        """
+        if progress_callback and not callable(progress_callback):
+            raise Exception("Callback should be callable")
+
+        plan = await sync_to_async(self.get_plan, thread_sensitive=True)(nodes=nodes)
+        databases = await sync_to_async(self.assign_databases, thread_sensitive=True)(
+            plan, database
+        )
+        self.reset_registry(plan)
+
+        stack = ExitStack()
+        await sync_to_async(self._enter_transactions, thread_sensitive=True)(
+            stack, databases
+        )
+        try:
+            await self.aload_plan(
+                plan=plan, progress_callback=progress_callback, concurrency=concurrency
+            )
+            if dry_run:
+                raise DryRun
+        except BaseException as e:
+            await sync_to_async(stack.__exit__, thread_sensitive=True)(
+                type(e), e, e.__traceback__
+            )
+            if not isinstance(e, DryRun):
+                raise
+        else:
+            await sync_to_async(stack.__exit__, thread_sensitive=True)(None, None, None)
+
+        return len(plan)
+
+    @staticmethod
+    def _enter_transactions(stack, databases):
+        # One transaction per database
+        for alias in databases:
+            stack.enter_context(transaction.atomic(using=alias))
+
+    async def aload_plan(self, plan, progress_callback, concurrency=10):
+        """
+        Load the plan, every fixture is started as soon as its dependencies
+        are loaded.
+
+        :param list plan: resolved list of nodes
+        :param callable progress_callback: Callback which will be called while
+                                           handling the nodes.
+        :param int concurrency: maximum number of fixtures loaded at the same
+                                time.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        waiting = {}
+        dependents = {node: [] for node in plan}
+        for node in plan:
+            waiting[node] = set(self.graph.nodes[node]) & set(dependents)
+            for dependency in waiting[node]:
+                dependents[dependency].append(node)
+
+        async def load(node):
+            async with semaphore:
+                if progress_callback:
+                    progress_callback("load_start", node)
+                elapsed_time = await self.aload_node(node)
+                self.complete_node(node, elapsed_time, progress_callback)
+            return node
+
+        tasks = {
+            asyncio.ensure_future(load(node)) for node in plan if not waiting[node]
+        }
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    node = task.result()
+                    for dependent in dependents[node]:
+                        waiting[dependent].discard(node)
+                        if not waiting[dependent]:
+                            tasks.add(asyncio.ensure_future(load(dependent)))
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
+
+    async def aload_node(self, node):
+        """
+        Load a single fixture.
+
+        :param tuple node: node to be loaded
+        :return: elapsed time in seconds
+        """
+        start = time.time()
+        fixture = self.loader.disk_fixtures[node]
+        if asyncio.iscoroutinefunction(fixture.load):
+            # Only insert when flushed, a flush from `add` would query the
+            # database from the event loop.
+            fixture.bulk = BulkCollector(batch_size=None, using=fixture.database)
+            fixture.registry = self.registry
+            objects = await fixture.load()
+            await sync_to_async(fixture.bulk.flush, thread_sensitive=True)()
+            if isinstance(objects, (list, tuple)):
+                self.registry.register(node, objects)
+        else:
+            await sync_to_async(self.load_node, thread_sensitive=True)(node)
+        return time.time() - start
@@ -1,16 +1,139 @@
+import os
+import sys
+
+from dynamic_fixtures.fixtures import datafiles
+from dynamic_fixtures.fixtures.bulk import BulkCollector
+from dynamic_fixtures.fixtures.registry import FixtureRegistry
+from dynamic_fixtures.fixtures.writers import CopyWriter
+
+
 class BaseFixture(object):
     def __init__(self, name, app_label):
         self._name = name
         self._app_label = app_label
 
+        # Add unsaved model instances to insert them in batches, e.g.:
+        # self.bulk.add(Author(name="John Doe"))
+        self.bulk = BulkCollector(batch_size=self.bulk_batch_size)
+
+        # Objects returned by `load` of the fixtures loaded before, which is
+        # shared by the runner, see `get_object`.
+        self.registry = FixtureRegistry()
+
     # Other fixtures which should be loaded first. This should be a list of:
     # ('app_label', 'fixture_name')
     dependencies = []
 
+    # Whether the fixture may be loaded in a worker thread when the runner
+    # loads fixtures in parallel. Set to False to always load the fixture on
+    # the main thread.
+    parallel = True
+
+    # Alias of the database to load the fixture in. When not set the fixture
+    # is loaded in the database the runner is asked to load in. While loading,
+    # `self.database` contains the alias in use.
+    database = None
+
+    # Number of instances added to `self.bulk` which are kept in memory before
+    # they get inserted.
+    bulk_batch_size = 1000
+
     def load(self):
         """
         Load the fixtures.
         This method should be overridden to actual load the fixture data.
-        :return: A list of created fixture models.
+
+        It can also be written as a generator which yields unsaved model
+        instances, or lists of them, which get inserted in batches.
+        :return: A list of created fixture models, which fixtures depending
+                 on this fixture can look up with `get_object`.
         """
         raise NotImplementedError()
+
+    def get_data_path(self, filename):
+        """
+        Get the path of a data file relative to the fixture module.
+
+        :param str filename: name of the data file, e.g. 'authors.csv'
+        :return: absolute path of the data file
+        """
+        module = sys.modules[type(self).__module__]
+        return os.path.join(os.path.dirname(os.path.abspath(module.__file__)), filename)
+
+    def read_csv(self, filename, encoding="utf-8", **fmtparams):
+        """
+        Read the rows of a CSV file next to the fixture module lazily. The
+        file is memory-mapped, so rows can be turned into model instances
+        and added to `self.bulk` without reading the whole file first.
+
+        :param str filename: name of the CSV file
+        :param str encoding: encoding of the CSV file
+        :param fmtparams: arguments for `csv.DictReader`, e.g. `delimiter`
+        :return: generator of dicts with the values by column name
+        """
+        return datafiles.read_csv(
+            self.get_data_path(filename), encoding=encoding, **fmtparams
+        )
+
+    def read_jsonl(self, filename, encoding="utf-8"):
+        """
+        Read the objects of a JSON lines file next to the fixture module
+        lazily.
+
+        :param str filename: name of the JSON lines file
+        :param str encoding: encoding of the file
+        :return: generator of the decoded objects
+        """
+        return datafiles.read_jsonl(self.get_data_path(filename), encoding=encoding)
+
+    def copy_writer(self, model, fields=None, batch_size=None):
+        """
+        Get a writer which streams rows straight into the table of a model,
+        with COPY on PostgreSQL. Use it as a context manager, the remaining
+        rows are written when the block is left, e.g.:
+
+            with self.copy_writer(Event) as writer:
+                writer.add_all(Event(sequence=i) for i in range(1000000))
+
+        :param model: model class to write rows of
+        :param list fields: names of the fields to write, all concrete fields
+                            except the auto field by default.
+        :param int batch_size: number of rows to buffer before they get
+                               written.
+        :rtype: CopyWriter
+        """
+        kwargs = {}
+        if batch_size is not None:
+            kwargs["batch_size"] = batch_size
+        return CopyWriter(model, fields=fields, using=self.database, **kwargs)
+
+    def get_object(self, model, **fields):
+        """
+        Get an object created by a fixture this fixture depends on, e.g.
+        `self.get_object(Author, name="John Doe")`. The objects returned by
+        `load` of the direct dependencies are looked up in memory by their
+        fields; other objects, and lookups like `name__startswith`, are
+        queried from the database.
+
+        :param model: model class
+        :return: the object
+        """
+        if self.registry.can_lookup(model, fields):
+            try:
+                return self.registry.lookup(self.dependencies, model, fields)
+            except model.DoesNotExist:
+                pass
+        return model._default_manager.db_manager(self.database).get(**fields)
+
+    def aget_object(self, model, **fields):
+        """
+        Variant of `get_object` for async `load` methods, which queries the
+        database with `sync_to_async`, e.g.
+        `await self.aget_object(Author, name="John Doe")`.
+
+        :param model: model class
+        :return: awaitable which returns the object
+        """
+        from asgiref.sync import sync_to_async
+
+        return sync_to_async(self.get_object, thread_sensitive=True)(model, **fields)
@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+
+from django.db import transaction
+from dynamic_fixtures.fixtures.loader import Graph
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class BulkCollector(object):
+    """
+    Collects model instances and inserts them with `bulk_create`.
+
+    Instances are buffered per model and inserted when the number of buffered
+    instances reaches the batch size, or when the collector is flushed. Models
+    get inserted after the models they refer to, so foreign keys to instances
+    in the same flush are set once the referred instances have a primary key.
+
+    Note that primary keys are only set on the instances for database
+    backends which can return them from a bulk insert (e.g. PostgreSQL and
+    SQLite 3.35+).
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, using=None):
+        """
+        :param int batch_size: number of instances to buffer before they get
+                               inserted, None to only insert on `flush`.
+        :param str using: database alias to insert into.
+        """
+        self.batch_size = batch_size
+        self.using = using
+        self.rows = 0
+        self.flush_time = 0.0
+        self._pending = OrderedDict()
+        self._pending_count = 0
+
+    def add(self, obj):
+        """
+        Add a model instance to be inserted.
+
+        :param obj: unsaved model instance
+        """
+        self._pending.setdefault(type(obj), []).append(obj)
+        self._pending_count += 1
+        if self.batch_size and self._pending_count >= self.batch_size:
+            self.flush()
+
+    def add_all(self, objs):
+        """
+        Add multiple model instances to be inserted.
+
+        :param iterable objs: unsaved model instances
+        """
+        for obj in objs:
+            self.add(obj)
+
+    def flush(self):
+        """
+        Insert all buffered instances in one transaction.
+
+        :return: number of inserted rows
+        """
+        if not self._pending_count:
+            return 0
+
+        start = time.time()
+        pending = self._pending
+        self._pending = OrderedDict()
+        self._pending_count = 0
+
+        rows = 0
+        with transaction.atomic(using=self.using):
+            for model in self.get_flush_order(pending):
+                objs = pending[model]
+                model._default_manager.db_manager(self.using).bulk_create(
+                    objs, batch_size=self.batch_size
+                )
+                rows += len(objs)
+
+        self.rows += rows
+        self.flush_time += time.time() - start
+        return rows
+
+    @staticmethod
+    def get_flush_order(models):
+        """
+        Sort models so every model comes after the models it refers to.
+
+        :param list models: model classes
+        :return: list of model classes
+        """
+        concrete_models = {}
+        for model in models:
+            concrete_models.setdefault(model._meta.concrete_model, []).append(model)
+
+        graph = Graph()
+        for model in models:
+            graph.add_node(model)
+        for model in models:
+            for field in model._meta.concrete_fields:
+                if not (field.many_to_one or field.one_to_one):
+                    continue
+                target = field.remote_field.model._meta.concrete_model
+                for dependency in concrete_models.get(target, []):
+                    if dependency is not model:
+                        graph.add_dependency(model, dependency)
+
+        return graph.resolve_nodes(list(models))
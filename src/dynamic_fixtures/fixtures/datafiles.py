@@ -0,0 +1,75 @@
+import csv
+import json
+import mmap
+from contextlib import contextmanager
+
+
+@contextmanager
+def open_data_file(path):
+    """
+    Memory-map a data file for reading, so it is paged in by the OS instead
+    of being read into memory as a whole.
+
+    :param str path: path of the data file
+    :return: context manager which gives the memory-mapped file
+    """
+    with open(path, "rb") as data_file:
+        try:
+            data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            yield _EmptyFile()
+            return
+        try:
+            yield data
+        finally:
+            data.close()
+
+
+class _EmptyFile(object):
+    def readline(self):
+        return b""
+
+
+def iter_lines(path, encoding="utf-8"):
+    """
+    Read the lines of a data file one by one.
+
+    :param str path: path of the data file
+    :param str encoding: encoding of the data file
+    :return: generator of lines, including the line endings
+    """
+    with open_data_file(path) as data:
+        line = data.readline()
+        if line.startswith(b"\xef\xbb\xbf") and encoding.lower() in ("utf-8", "utf8"):
+            # Skip the byte order mark
+            line = line[3:]
+        while line:
+            yield line.decode(encoding)
+            line = data.readline()
+
+
+def read_csv(path, encoding="utf-8", **fmtparams):
+    """
+    Read the rows of a CSV file lazily.
+
+    :param str path: path of the CSV file
+    :param str encoding: encoding of the CSV file
+    :param fmtparams: arguments for `csv.DictReader`, e.g. `delimiter`
+    :return: generator of dicts with the values by column name
+    """
+    for row in csv.DictReader(iter_lines(path, encoding=encoding), **fmtparams):
+        yield row
+
+
+def read_jsonl(path, encoding="utf-8"):
+    """
+    Read the objects of a JSON lines file lazily. Empty lines are skipped.
+
+    :param str path: path of the JSON lines file
+    :param str encoding: encoding of the file
+    :return: generator of the decoded objects
+    """
+    for line in iter_lines(path, encoding=encoding):
+        if line.strip():
+            yield json.loads(line)
@@ -10,5 +10,17 @@ class FixtureNotFound(Exception):
     pass
 
 
+class UnsupportedOptionsError(ValueError):
+    pass
+
+
+class CircularDependencyError(Exception):
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super(CircularDependencyError, self).__init__(
+            "Circular dependency %s" % " > ".join(str(node) for node in cycle)
+        )
+
+
 class DryRun(Exception):
     pass
@@ -0,0 +1,262 @@
+import bisect
+import datetime
+import itertools
+import random
+
+from dynamic_fixtures.fixtures.basefixture import BaseFixture
+
+
+def get_numpy():
+    """
+    Import NumPy once values are generated, so fixture modules which import
+    this module don't pay for importing NumPy.
+
+    :return: the numpy module or None when it is not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class RandomSource(object):
+    """
+    Generates columns of random values at once, with NumPy when it is
+    installed and with the `random` module otherwise.
+    """
+
+    def __init__(self, seed=None, use_numpy=None):
+        """
+        :param int seed: seed for reproducible values
+        :param bool use_numpy: whether to use NumPy, by default when it is
+                               installed.
+        """
+        numpy = get_numpy() if use_numpy is not False else None
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise Exception("NumPy is not installed")
+        self.use_numpy = use_numpy
+        if use_numpy:
+            self._rng = numpy.random.default_rng(seed)
+        else:
+            self._rng = random.Random(seed)
+
+    def integers(self, low, high, count):
+        """
+        :return: list of random integers from low up to and including high
+        """
+        if self.use_numpy:
+            return self._rng.integers(low, high, size=count, endpoint=True).tolist()
+        randint = self._rng.randint
+        return [randint(low, high) for _ in range(count)]
+
+    def uniform(self, low, high, count):
+        """
+        :return: list of random floats between low and high
+        """
+        if self.use_numpy:
+            return self._rng.uniform(low, high, size=count).tolist()
+        uniform = self._rng.uniform
+        return [uniform(low, high) for _ in range(count)]
+
+    def choices(self, population, count, weights=None):
+        """
+        :return: list of random elements of the population
+        """
+        if self.use_numpy:
+            p = None
+            if weights is not None:
+                total = float(sum(weights))
+                p = [weight / total for weight in weights]
+            indexes = self._rng.choice(len(population), size=count, p=p).tolist()
+            return [population[index] for index in indexes]
+        if hasattr(self._rng, "choices"):
+            return self._rng.choices(population, weights=weights, k=count)
+        return self._choices(population, count, weights)
+
+    def _choices(self, population, count, weights=None):
+        # random.Random.choices is only available on Python 3.6+
+        rand = self._rng.random
+        if weights is None:
+            size = len(population)
+            return [population[int(rand() * size)] for _ in range(count)]
+        cumulative = list(itertools.accumulate(weights))
+        total = float(cumulative[-1])
+        last = len(cumulative) - 1
+        return [
+            population[bisect.bisect(cumulative, rand() * total, 0, last)]
+            for _ in range(count)
+        ]
+
+
+class Column(object):
+    """
+    Generates the values of a field for a chunk of rows.
+    """
+
+    def generate(self, source, start, count):
+        """
+        :param RandomSource source: source of random values
+        :param int start: index of the first row of the chunk
+        :param int count: number of rows in the chunk
+        :return: list of values
+        """
+        raise NotImplementedError()
+
+
+class Constant(Column):
+    def __init__(self, value):
+        self.value = value
+
+    def generate(self, source, start, count):
+        return [self.value] * count
+
+
+class Sequence(Column):
+    """
+    Values based on the index of the row, e.g. `Sequence('user-{}')`.
+    """
+
+    def __init__(self, template=None, start=0):
+        """
+        :param str template: format string for the number, the number itself
+                             when omitted.
+        :param int start: number of the first row
+        """
+        self.template = template
+        self.start = start
+
+    def generate(self, source, start, count):
+        numbers = range(self.start + start, self.start + start + count)
+        if self.template is None:
+            return list(numbers)
+        return [self.template.format(number) for number in numbers]
+
+
+class Integer(Column):
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def generate(self, source, start, count):
+        return source.integers(self.low, self.high, count)
+
+
+class Float(Column):
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def generate(self, source, start, count):
+        return source.uniform(self.low, self.high, count)
+
+
+class Choice(Column):
+    def __init__(self, choices, weights=None):
+        """
+        :param list choices: values to choose from
+        :param list weights: relative weights of the values
+        """
+        self.choices = list(choices)
+        self.weights = weights
+
+    def generate(self, source, start, count):
+        return source.choices(self.choices, count, weights=self.weights)
+
+
+class DateTime(Column):
+    def __init__(self, start, end):
+        """
+        :param start: earliest datetime or date
+        :param end: latest datetime or date
+        """
+        self.start = start
+        self.end = end
+
+    def generate(self, source, start, count):
+        seconds = (self.end - self.start).total_seconds()
+        if isinstance(self.start, datetime.datetime):
+            offsets = source.uniform(0, seconds, count)
+            return [self.start + datetime.timedelta(seconds=o) for o in offsets]
+        offsets = source.integers(0, int(seconds // 86400), count)
+        return [self.start + datetime.timedelta(days=o) for o in offsets]
+
+
+class Function(Column):
+    """
+    Values returned by a function of the row index and the random source,
+    for values which can't be generated in columns.
+    """
+
+    def __init__(self, function):
+        self.function = function
+
+    def generate(self, source, start, count):
+        return [self.function(index, source) for index in range(start, start + count)]
+
+
+class GeneratedFixture(BaseFixture):
+    """
+    Fixture which generates `count` instances of `model`. The values of the
+    fields are generated per column for a chunk of rows at a time, e.g.:
+
+        class Fixture(GeneratedFixture):
+            model = Event
+            count = 1000000
+            columns = {
+                'name': Sequence('event-{}'),
+                'kind': Choice(['click', 'view'], weights=[1, 9]),
+                'duration': Float(0, 60),
+            }
+    """
+
+    # Model to create instances of
+    model = None
+
+    # Number of instances to create
+    count = 0
+
+    # Column generators by field name
+    columns = {}
+
+    # Number of rows generated at a time
+    chunk_size = 10000
+
+    # Seed for reproducible data, random data when None
+    seed = None
+
+    # Write rows with `copy_writer` instead of creating model instances and
+    # inserting them with `self.bulk`, which is a lot faster.
+    use_copy = False
+
+    def get_random_source(self):
+        return RandomSource(seed=self.seed)
+
+    def iter_columns(self):
+        """
+        Generate the values in chunks.
+
+        :return: generator of lists with a list of values for every column,
+                 in the order of `columns`
+        """
+        names = list(self.columns)
+        source = self.get_random_source()
+        for start in range(0, self.count, self.chunk_size):
+            count = min(self.chunk_size, self.count - start)
+            yield [self.columns[name].generate(source, start, count) for name in names]
+
+    def load(self):
+        names = list(self.columns)
+        if self.use_copy:
+            with self.copy_writer(
+                self.model, fields=names, batch_size=self.chunk_size
+            ) as writer:
+                for columns in self.iter_columns():
+                    writer.add_columns(columns)
+            return
+
+        model = self.model
+        for columns in self.iter_columns():
+            yield [model(**dict(zip(names, row))) for row in zip(*columns)]
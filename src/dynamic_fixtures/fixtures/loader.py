@@ -1,16 +1,67 @@
+import hashlib
+import json
 import logging
 import os
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from importlib import import_module
 
 from django.apps import apps
+from dynamic_fixtures.apps import DynamicFixturesConfig
+from dynamic_fixtures.fixtures.exceptions import (
+    BadFixtureError,
+    CircularDependencyError,
+)
 
 logger = logging.getLogger(__name__)
 FIXTURES_MODULE_NAME = "fixtures"
+MANIFEST_FILE_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def inspect_fixture_module(module_name):
+    """
+    Import a fixture module and get the dependencies of its fixture. Runs in a
+    worker process of `Loader.prefetch`.
+
+    :param str module_name: full name of the fixture module
+    :return: tuple of the dependencies, None when the module has no Fixture
+             class, and an error message when the module can't be imported
+    """
+    try:
+        if not apps.ready:
+            # Spawned instead of forked
+            import django
+
+            django.setup()
+        fixture_module = import_module(module_name)
+    except Exception as e:
+        return None, "%s: %s" % (type(e).__name__, e)
+    if not hasattr(fixture_module, "Fixture"):
+        return None, None
+    dependencies = fixture_module.Fixture.dependencies
+    return [list(dependency) for dependency in dependencies], None
 
 
 class Loader(object):
-    def __init__(self):
+    def __init__(self, lazy=False, cache_dir=None, import_workers=None):
+        """
+        :param bool lazy: only import a fixture module when the fixture is
+                          requested from `disk_fixtures`.
+        :param str cache_dir: directory to keep a manifest of the fixture
+                              dependencies in. Implies `lazy`.
+        :param int import_workers: import and validate the fixture modules in
+                                   this number of worker processes first.
+        """
+        self.lazy = lazy or cache_dir is not None
+        self.cache_dir = cache_dir
+        self.import_workers = import_workers
         self.disk_fixtures = None
+        self.fixture_modules = None
+        self.fixture_files = None
+        self._manifest = {}
+        self._manifest_changed = False
+        self._dependencies = {}
 
     @classmethod
     def fixtures_module(cls, app_label):
@@ -19,15 +70,45 @@ class Loader(object):
 
     def load_disk(self):
 
-        self.disk_fixtures = {}
+        self.fixture_modules = {}
+        self.fixture_files = {}
+        self.disk_fixtures = LazyFixtures(self) if self.lazy else LoadedFixtures(self)
+        self._manifest = self.read_cache()
+        self._manifest_changed = False
+        self._dependencies = {}
 
-        for app_config in apps.get_app_configs():
+        for app_config in self.get_app_configs():
             # No models no need for fixtures
             if app_config.models_module is None:
                 logger.info("No models found for {}".format(app_config.label))
 
             self.handle_app_config(app_config=app_config)
 
+        if self.lazy:
+            self.skip_cached_modules()
+
+        if self.import_workers:
+            self.prefetch()
+            if not self.lazy:
+                for node in self.fixture_modules:
+                    fixture = self.load_fixture(node)
+                    if fixture is not None:
+                        self.disk_fixtures[node] = fixture
+
+    @staticmethod
+    def get_app_configs():
+        """
+        Get the apps to discover fixtures in. This package itself is left
+        out, its `fixtures` package holds the library and not fixtures.
+
+        :return: list of app configs
+        """
+        return [
+            app_config
+            for app_config in apps.get_app_configs()
+            if app_config.name != DynamicFixturesConfig.name
+        ]
+
     def handle_app_config(self, app_config):
 
         # Get the fixtures module directory
@@ -40,18 +121,243 @@ class Loader(object):
 
         fixture_names = self.get_fixture_files(directory=directory)
 
-        # Load them
         for fixture_name in fixture_names:
-            fixture_module = import_module("%s.%s" % (module_name, fixture_name))
-            if not hasattr(fixture_module, "Fixture"):
+            node = (app_config.label, fixture_name)
+            self.fixture_modules[node] = "%s.%s" % (module_name, fixture_name)
+            self.fixture_files[node] = os.path.join(directory, fixture_name + ".py")
+
+            if self.lazy or self.import_workers:
+                # Imported when requested, or after prefetching
+                continue
+
+            # Load them
+            fixture = self.load_fixture(node)
+            if fixture is not None:
+                self.disk_fixtures[node] = fixture
+
+    def load_fixture(self, node):
+        """
+        Import the module of a fixture and instantiate the fixture.
+
+        :param tuple node: app label and fixture name
+        :return: The fixture or None when the module has no Fixture class
+        """
+        app_label, fixture_name = node
+        fixture_module = import_module(self.fixture_modules[node])
+        if not hasattr(fixture_module, "Fixture"):
+            logger.error(
+                "Fixture %s in app %s has no Fixture class" % (fixture_name, app_label)
+            )
+            return None
+        return fixture_module.Fixture(fixture_name, app_label)
+
+    def skip_fixture(self, node):
+        """
+        Leave out a fixture module which has no Fixture class. With a cache
+        directory this is kept in the manifest, so the module isn't imported
+        again as long as it doesn't change.
+
+        :param tuple node: app label and fixture name
+        """
+        self.disk_fixtures.skip(node)
+        if self.cache_dir is not None:
+            self._manifest["%s.%s" % node] = {
+                "stamp": self.get_fixture_stamp(node),
+                "dependencies": None,
+            }
+            self._manifest_changed = True
+
+    def skip_cached_modules(self):
+        """
+        Leave out the fixture modules which had no Fixture class according to
+        the manifest, without importing them.
+        """
+        for node in self.fixture_modules:
+            entry = self._manifest.get("%s.%s" % node)
+            if entry is None or entry["dependencies"] is not None:
+                continue
+            if entry["stamp"] == self.get_fixture_stamp(node):
                 logger.error(
-                    "Fixture %s in app %s has no Fixture class"
-                    % (fixture_name, app_config.label)
+                    "Fixture %s in app %s has no Fixture class" % (node[1], node[0])
                 )
+                self.disk_fixtures.skip(node)
+
+    def release_fixture(self, node):
+        """
+        Drop the instance of a fixture, and everything it holds on to, once
+        it is loaded. The fixture is instantiated again when it is requested.
+
+        :param tuple node: app label and fixture name
+        """
+        if hasattr(self.disk_fixtures, "release"):
+            self.disk_fixtures.release(node)
+
+    def get_dependencies(self, node):
+        """
+        Get the dependencies of a fixture.
+
+        When a cache directory is set the dependencies are taken from the
+        manifest, as long as the fixture file didn't change, so the fixture
+        module doesn't need to be imported.
+
+        :param tuple node: app label and fixture name
+        :return: list of nodes
+        """
+        if self.cache_dir is None:
+            if node in self._dependencies:
+                return self._dependencies[node]
+            return self.disk_fixtures[node].dependencies
+
+        key = "%s.%s" % node
+        stamp = self.get_fixture_stamp(node)
+        entry = self._manifest.get(key)
+        if entry is not None and entry["stamp"] == stamp:
+            if entry["dependencies"] is None:
+                # No Fixture class
+                raise KeyError(node)
+            return [tuple(dependency) for dependency in entry["dependencies"]]
+
+        if node in self._dependencies:
+            dependencies = self._dependencies[node]
+        else:
+            dependencies = [
+                tuple(dependency)
+                for dependency in self.disk_fixtures[node].dependencies
+            ]
+        self._manifest[key] = {"stamp": stamp, "dependencies": dependencies}
+        self._manifest_changed = True
+        return dependencies
+
+    def prefetch(self):
+        """
+        Import the fixture modules in a pool of worker processes. This warms
+        the bytecode cache, reports broken fixture modules before anything is
+        loaded and gathers the dependencies without importing the modules in
+        this process. Fixtures of which the dependencies are in the manifest
+        are skipped.
+        """
+        nodes = []
+        for node in sorted(self.fixture_modules):
+            entry = self._manifest.get("%s.%s" % node)
+            if entry is None or entry["stamp"] != self.get_fixture_stamp(node):
+                nodes.append(node)
+        if not nodes:
+            return
+
+        with ProcessPoolExecutor(max_workers=self.import_workers) as executor:
+            results = executor.map(
+                inspect_fixture_module, [self.fixture_modules[node] for node in nodes]
+            )
+            errors = []
+            for node, (dependencies, error) in zip(nodes, results):
+                if error is not None:
+                    errors.append("%s.%s (%s)" % (node[0], node[1], error))
+                elif dependencies is None:
+                    logger.error(
+                        "Fixture %s in app %s has no Fixture class" % (node[1], node[0])
+                    )
+                    if self.lazy:
+                        self.skip_fixture(node)
+                else:
+                    self._dependencies[node] = [
+                        tuple(dependency) for dependency in dependencies
+                    ]
+
+        if errors:
+            raise BadFixtureError(
+                "The following fixture modules can't be imported: %s"
+                % ", ".join(errors)
+            )
+
+    def get_fixture_hash(self, node):
+        """
+        :param tuple node: app label and fixture name
+        :return: SHA-256 hex digest of the fixture source
+        """
+        with open(self.fixture_files[node], "rb") as fixture_file:
+            return hashlib.sha256(fixture_file.read()).hexdigest()
+
+    def get_fixture_stamp(self, node):
+        """
+        :param tuple node: app label and fixture name
+        :return: modification time and size of the fixture file
+        """
+        stat = os.stat(self.fixture_files[node])
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def scan_fixture_files(self):
+        """
+        Find the fixture files of all apps without importing the fixtures.
+
+        :return: dict of node and path of the fixture file
+        """
+        fixture_files = {}
+        for app_config in self.get_app_configs():
+            module_name = self.fixtures_module(app_config.label)
+            directory = self.get_module_directory(module_name=module_name)
+            if directory is None:
                 continue
-            self.disk_fixtures[app_config.label, fixture_name] = fixture_module.Fixture(
-                fixture_name, app_config.label
+            for fixture_name in self.get_fixture_files(directory=directory):
+                fixture_files[(app_config.label, fixture_name)] = os.path.join(
+                    directory, fixture_name + ".py"
+                )
+        return fixture_files
+
+    def get_fingerprint(self):
+        """
+        :return: hex digest which changes when a fixture file is added,
+                 removed or changed
+        """
+        fingerprint = hashlib.sha256()
+        for node in sorted(self.fixture_files):
+            fingerprint.update(
+                json.dumps([list(node), self.get_fixture_stamp(node)]).encode("utf-8")
             )
+        return fingerprint.hexdigest()
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.cache_dir, MANIFEST_FILE_NAME)
+
+    def read_cache(self):
+        """
+        Read the manifest from the cache directory.
+
+        :return: dict of fixture dependencies and file stamps
+        """
+        if self.cache_dir is None:
+            return {}
+        try:
+            with open(self.manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+        except (IOError, ValueError):
+            # Missing or corrupt, start over.
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest["fixtures"]
+
+    def save_cache(self):
+        """
+        Write the manifest to the cache directory when it was changed.
+        """
+        if self.cache_dir is None or not self._manifest_changed:
+            return
+
+        fixtures = {
+            "%s.%s" % node: self._manifest["%s.%s" % node]
+            for node in self.fixture_modules
+            if "%s.%s" % node in self._manifest
+        }
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        temp_path = "%s.%s" % (self.manifest_path, os.getpid())
+        with open(temp_path, "w") as manifest_file:
+            json.dump(
+                {"version": MANIFEST_VERSION, "fixtures": fixtures}, manifest_file
+            )
+        os.replace(temp_path, self.manifest_path)
+        self._manifest_changed = False
 
     @staticmethod
     def get_fixture_files(directory):
@@ -84,6 +390,100 @@ class Loader(object):
         return directory
 
 
+class LoadedFixtures(dict):
+    """
+    Dict of the fixtures of an eager loader. A released fixture is replaced by
+    a placeholder and instantiated again when it is requested.
+    """
+
+    _released = object()
+
+    def __init__(self, loader):
+        super(LoadedFixtures, self).__init__()
+        self._loader = loader
+
+    def __getitem__(self, node):
+        fixture = dict.__getitem__(self, node)
+        if fixture is self._released:
+            fixture = self._loader.load_fixture(node)
+            dict.__setitem__(self, node, fixture)
+        return fixture
+
+    def get(self, node, default=None):
+        return self[node] if node in self else default
+
+    def items(self):
+        return [(node, self[node]) for node in self]
+
+    def values(self):
+        return [self[node] for node in self]
+
+    def release(self, node):
+        """
+        Forget the instance of a fixture, the module stays imported.
+
+        :param tuple node: app label and fixture name
+        """
+        if node in self:
+            dict.__setitem__(self, node, self._released)
+
+
+class LazyFixtures(Mapping):
+    """
+    Mapping of all discovered fixtures which imports the module of a fixture
+    when it is requested for the first time.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._fixtures = {}
+        self._skipped = set()
+
+    def __getitem__(self, node):
+        if node not in self._fixtures:
+            if node not in self._loader.fixture_modules or node in self._skipped:
+                raise KeyError(node)
+            fixture = self._loader.load_fixture(node)
+            if fixture is None:
+                # No Fixture class, which is logged and skipped like the eager
+                # loader does.
+                self._loader.skip_fixture(node)
+                raise KeyError(node)
+            self._fixtures[node] = fixture
+        return self._fixtures[node]
+
+    def __iter__(self):
+        for node in self._loader.fixture_modules:
+            if node not in self._skipped:
+                yield node
+
+    def __len__(self):
+        return len(self._loader.fixture_modules) - len(self._skipped)
+
+    def skip(self, node):
+        """
+        Leave out a fixture module which turned out to have no Fixture class.
+
+        :param tuple node: app label and fixture name
+        """
+        self._skipped.add(node)
+
+    def release(self, node):
+        """
+        Forget the instance of a fixture, the module stays imported.
+
+        :param tuple node: app label and fixture name
+        """
+        self._fixtures.pop(node, None)
+
+    def is_loaded(self, node):
+        """
+        :param tuple node: app label and fixture name
+        :return: Whether the module of the fixture is imported already
+        """
+        return node in self._fixtures
+
+
 class Graph(object):
     """A dependency graph
     """
@@ -108,6 +508,15 @@ class Graph(object):
             )
         self._nodes[node].append(dependency)
 
+    def remove_node(self, node):
+        for other, dependencies in self._nodes.items():
+            if node in dependencies:
+                raise KeyError(
+                    'Dependency "%s" required for "%s" but is not set.'
+                    % (str(node), str(other))
+                )
+        self._nodes.pop(node, None)
+
     def __iter__(self):
         for resolved_node in self.resolve_node():
             yield resolved_node
@@ -124,34 +533,118 @@ class Graph(object):
         """
         if not nodes:
             return []
-        resolved = []
-        for node in nodes:
-            if node in resolved:
-                continue
-            self.resolve_node(node, resolved)
-        return resolved
+        return self._resolve(nodes, [])
 
-    def resolve_node(self, node=None, resolved=None, seen=None):
+    def resolve_node(self, node=None, resolved=None):
         """
         Resolve a single node or all when node is omitted.
         """
-        if seen is None:
-            seen = []
         if resolved is None:
             resolved = []
         if node is None:
-            dependencies = sorted(self._nodes.keys())
+            nodes = sorted(self._nodes.keys())
         else:
-            dependencies = self._nodes[node]
-            seen.append(node)
-        for dependency in dependencies:
-            if dependency in resolved:
+            nodes = [node]
+        return self._resolve(nodes, resolved)
+
+    def get_levels(self, plan):
+        """
+        Split a resolved plan in levels.
+
+        The nodes in a level only depend on nodes in the levels before it,
+        so all nodes within a level can be loaded independently of each other.
+
+        Dependencies which are not in the plan, e.g. because they are already
+        loaded, are ignored.
+
+        :param list plan: resolved list of nodes, e.g. from `resolve_nodes`
+        :return: A list of levels, each a list of nodes in plan order
+        """
+        depths = {}
+        levels = []
+        for node in plan:
+            depth = 0
+            for dependency in self._nodes[node]:
+                if dependency in depths:
+                    depth = max(depth, depths[dependency] + 1)
+            depths[node] = depth
+            if depth == len(levels):
+                levels.append([])
+            levels[depth].append(node)
+        return levels
+
+    def get_components(self, plan):
+        """
+        Split a resolved plan in connected components, e.g. groups of nodes
+        which are connected through dependencies in either direction.
+        Dependencies which are not in the plan are ignored.
+
+        :param list plan: resolved list of nodes, e.g. from `resolve_nodes`
+        :return: A list of components, each a list of nodes in plan order,
+                 ordered by their first node in the plan.
+        """
+        parents = {node: node for node in plan}
+
+        def find(node):
+            while parents[node] != node:
+                parents[node] = parents[parents[node]]
+                node = parents[node]
+            return node
+
+        for node in plan:
+            for dependency in self._nodes[node]:
+                if dependency not in parents:
+                    continue
+                root, dependency_root = find(node), find(dependency)
+                if root != dependency_root:
+                    parents[dependency_root] = root
+
+        components = {}
+        ordered = []
+        for node in plan:
+            root = find(node)
+            if root not in components:
+                components[root] = []
+                ordered.append(components[root])
+            components[root].append(node)
+        return ordered
+
+    def _resolve(self, nodes, resolved):
+        """
+        Resolve the given nodes depth-first, dependencies first, in the order
+        in which they are declared.
+
+        The traversal is iterative and keeps the resolved nodes and the nodes
+        on the current path in sets, so resolving is linear in the size of the
+        graph and not limited by the recursion limit.
+
+        :param list nodes: nodes to start from
+        :param list resolved: already resolved nodes, extended in place
+        :raises CircularDependencyError: when a cycle is found
+        :return: the resolved nodes
+        """
+        resolved_set = set(resolved)
+        for node in nodes:
+            if node in resolved_set:
                 continue
-            if dependency in seen:
-                raise Exception(
-                    "Circular dependency %s > %s", str(node), str(dependency)
-                )
-            self.resolve_node(dependency, resolved, seen)
-        if node is not None:
-            resolved.append(node)
+            path = [node]
+            on_path = {node}
+            stack = [iter(self._nodes[node])]
+            while stack:
+                for dependency in stack[-1]:
+                    if dependency in resolved_set:
+                        continue
+                    if dependency in on_path:
+                        start = path.index(dependency)
+                        raise CircularDependencyError(path[start:] + [dependency])
+                    path.append(dependency)
+                    on_path.add(dependency)
+                    stack.append(iter(self._nodes[dependency]))
+                    break
+                else:
+                    stack.pop()
+                    done = path.pop()
+                    on_path.discard(done)
+                    resolved.append(done)
+                    resolved_set.add(done)
         return resolved
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+
+PLAN_VERSION = 1
+
+
+class CompiledPlan(object):
+    """
+    A resolved plan together with the dependencies of its nodes, which can be
+    reused without resolving the graph again.
+    """
+
+    def __init__(self, nodes, plan, dependencies, fingerprint=None):
+        """
+        :param list nodes: the requested nodes, None for all nodes
+        :param list plan: resolved list of nodes
+        :param dict dependencies: node and list of its dependencies, for every
+                                  node in the plan
+        :param str fingerprint: fingerprint of the fixtures the plan was
+                                resolved from
+        """
+        self.nodes = nodes
+        self.plan = plan
+        self.dependencies = dependencies
+        self.fingerprint = fingerprint
+
+    def __len__(self):
+        return len(self.plan)
+
+    def __iter__(self):
+        return iter(self.plan)
+
+    @staticmethod
+    def get_key(nodes, fingerprint=None):
+        """
+        The order of the nodes is part of the key, as the order of the plan
+        depends on it.
+
+        :param list nodes: the requested nodes, None for all nodes
+        :param str fingerprint: fingerprint of the fixtures
+        :return: hex digest identifying the nodes and the fixtures
+        """
+        key = hashlib.sha256()
+        key.update((fingerprint or "").encode("utf-8"))
+        if nodes is None:
+            key.update(b"*")
+        else:
+            for node in nodes:
+                key.update(("%s.%s\n" % node).encode("utf-8"))
+        return key.hexdigest()
+
+    def as_dict(self):
+        return {
+            "version": PLAN_VERSION,
+            "fingerprint": self.fingerprint,
+            "nodes": None if self.nodes is None else [list(n) for n in self.nodes],
+            "plan": [list(node) for node in self.plan],
+            "dependencies": [
+                [list(node), [list(dependency) for dependency in dependencies]]
+                for node, dependencies in self.dependencies.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        :param dict data: plan as returned by `as_dict`
+        :rtype: CompiledPlan
+        """
+        if data.get("version") != PLAN_VERSION:
+            raise ValueError("Unsupported plan version %s" % data.get("version"))
+        nodes = data["nodes"]
+        return cls(
+            nodes=None if nodes is None else [tuple(node) for node in nodes],
+            plan=[tuple(node) for node in data["plan"]],
+            dependencies={
+                tuple(node): [tuple(dependency) for dependency in dependencies]
+                for node, dependencies in data["dependencies"]
+            },
+            fingerprint=data["fingerprint"],
+        )
+
+    def save(self, path):
+        """
+        Write the plan as JSON, atomically.
+
+        :param str path:
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        temp_path = "%s.%s" % (path, os.getpid())
+        with open(temp_path, "w") as plan_file:
+            json.dump(self.as_dict(), plan_file)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param str path:
+        :return: the plan, or None when it is missing or corrupt
+        """
+        try:
+            with open(path) as plan_file:
+                return cls.from_dict(json.load(plan_file))
+        except (IOError, ValueError, KeyError, TypeError):
+            return None
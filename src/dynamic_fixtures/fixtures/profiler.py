@@ -0,0 +1,250 @@
+import json
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+INSERT_RE = re.compile(r'^\s*INSERT\s+INTO\s+["`\[]?([\w.]+)["`\]]?', re.IGNORECASE)
+
+
+class FixtureProfile(object):
+    """
+    Profile of a single loaded fixture.
+    """
+
+    def __init__(self, node):
+        self.node = node
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+        self.rows = {}
+        self.peak_memory = 0
+
+    @property
+    def total_rows(self):
+        return sum(self.rows.values())
+
+    def as_dict(self):
+        return {
+            "app_label": self.node[0],
+            "fixture": self.node[1],
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "queries": self.queries,
+            "query_time": self.query_time,
+            "rows": self.rows,
+            "peak_memory": self.peak_memory,
+        }
+
+
+class FixtureProfiler(object):
+    """
+    Collects a profile for every loaded fixture: wall and CPU time, number of
+    queries and query time, rows inserted per model and peak memory.
+
+    Memory is traced for the whole process, so the peak memory of fixtures
+    which are loaded in parallel can't be told apart.
+
+    Queries are counted with a database execute wrapper, which requires
+    Django 2.0+.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.profiles = []
+        self._models = None
+
+    @staticmethod
+    def is_supported():
+        """
+        :return: whether the installed Django version supports profiling
+        """
+        return hasattr(BaseDatabaseWrapper, "execute_wrapper")
+
+    @contextmanager
+    def profile(self, node, using=None):
+        """
+        Profile the fixture which is loaded within the context.
+
+        :param tuple node: node which is loaded
+        :param str using: database alias to count the queries of, defaults to
+                          the database of the profiler.
+        """
+        profile = FixtureProfile(node)
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        memory_start = tracemalloc.get_traced_memory()[0]
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            connection = connections[using or self.using]
+            with connection.execute_wrapper(self._wrapper(profile)):
+                yield profile
+        finally:
+            profile.wall_time = time.perf_counter() - wall_start
+            profile.cpu_time = time.process_time() - cpu_start
+            profile.peak_memory = max(
+                0, tracemalloc.get_traced_memory()[1] - memory_start
+            )
+            if started_tracing:
+                tracemalloc.stop()
+            self.profiles.append(profile)
+
+    def get_sorted(self):
+        """
+        :return: profiles, the slowest first
+        """
+        return sorted(self.profiles, key=lambda profile: -profile.wall_time)
+
+    def as_json(self):
+        return json.dumps(
+            [profile.as_dict() for profile in self.get_sorted()], indent=2
+        )
+
+    def _wrapper(self, profile):
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                profile.queries += 1
+                profile.query_time += time.perf_counter() - start
+                match = INSERT_RE.match(sql)
+                if match:
+                    label = self.get_model_label(match.group(1))
+                    profile.rows[label] = profile.rows.get(
+                        label, 0
+                    ) + self.count_inserted_rows(sql, params, many)
+
+        return wrapper
+
+    def get_model_label(self, table):
+        if self._models is None:
+            self._models = {
+                model._meta.db_table: model._meta.label for model in apps.get_models()
+            }
+        return self._models.get(table, table)
+
+    @staticmethod
+    def count_inserted_rows(sql, params, many):
+        """
+        Count the rows inserted by an INSERT query.
+
+        :param str sql: the query
+        :param params: parameters of the query
+        :param bool many: whether the query is executed for many parameters
+        :return: number of rows
+        """
+        if many:
+            try:
+                return len(params)
+            except TypeError:
+                # An iterator, can't be counted without consuming it.
+                return 0
+
+        parts = re.split(r"\bVALUES\b", sql, maxsplit=1, flags=re.IGNORECASE)
+        if len(parts) != 2:
+            # e.g. INSERT INTO ... SELECT
+            return 0
+
+        rows = 0
+        depth = 0
+        for character in parts[1]:
+            if depth == 0 and character not in "(, \t\r\n":
+                # End of the values, e.g. RETURNING or ON CONFLICT
+                break
+            if character == "(":
+                if depth == 0:
+                    rows += 1
+                depth += 1
+            elif character == ")":
+                depth -= 1
+        return rows
+
+
+class MemoryStep(object):
+    """
+    Memory use of a single loaded fixture.
+    """
+
+    def __init__(self, node, peak, retained, released):
+        self.node = node
+        self.peak = peak
+        self.retained = retained
+        self.released = released
+
+    def as_dict(self):
+        return {
+            "app_label": self.node[0],
+            "fixture": self.node[1],
+            "peak": self.peak,
+            "retained": self.retained,
+            "released": ["%s.%s" % node for node in self.released],
+        }
+
+
+class MemoryTracker(object):
+    """
+    Records the peak memory while loading every fixture and the memory which
+    is retained after the fixtures which are no longer needed are released,
+    both relative to the memory in use when the run started.
+
+    Memory is traced for the whole process, like the `FixtureProfiler` does.
+    Before Python 3.9 the peak can't be reset, so it is the peak since the
+    start of the run.
+    """
+
+    def __init__(self):
+        self.steps = []
+        self._baseline = 0
+        self._started_tracing = False
+
+    def start(self):
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def record(self, node, released):
+        """
+        Record the memory use of a loaded fixture.
+
+        :param tuple node: the loaded node
+        :param list released: nodes of which the fixtures were released
+        :return: MemoryStep
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        step = MemoryStep(
+            node,
+            peak=max(0, peak - self._baseline),
+            retained=max(0, current - self._baseline),
+            released=released,
+        )
+        self.steps.append(step)
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        return step
+
+    @property
+    def peak(self):
+        return max([step.peak for step in self.steps] or [0])
+
+    def as_json(self):
+        return json.dumps([step.as_dict() for step in self.steps], indent=2)
@@ -0,0 +1,61 @@
+from django.db import DEFAULT_DB_ALIAS
+
+
+class FixtureRecorder(object):
+    """
+    Keeps track of the fixtures which are loaded in a database, like Django's
+    MigrationRecorder does for migrations.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    @property
+    def applied_fixtures(self):
+        # Imported here so the recorder can be imported before the app
+        # registry is ready.
+        from dynamic_fixtures.models import AppliedFixture
+
+        return AppliedFixture.objects.using(self.using)
+
+    def applied_hashes(self):
+        """
+        :return: dict of node and hash of all applied fixtures
+        """
+        return {
+            (app_label, name): fixture_hash
+            for app_label, name, fixture_hash in self.applied_fixtures.values_list(
+                "app_label", "name", "hash"
+            )
+        }
+
+    def clear(self):
+        """
+        Forget all recorded fixtures.
+        """
+        self.applied_fixtures.delete()
+
+    def record_applied(self, node, fixture_hash):
+        """
+        Record a fixture as applied.
+
+        :param tuple node: app label and fixture name
+        :param str fixture_hash: hash of the loaded fixture
+        """
+        app_label, name = node
+        self.applied_fixtures.update_or_create(
+            app_label=app_label, name=name, defaults={"hash": fixture_hash}
+        )
+
+
+class CheckpointRecorder(FixtureRecorder):
+    """
+    Keeps track of the fixtures which are completed in a run which commits
+    every fixture, so an interrupted run can be resumed.
+    """
+
+    @property
+    def applied_fixtures(self):
+        from dynamic_fixtures.models import FixtureCheckpoint
+
+        return FixtureCheckpoint.objects.using(self.using)
@@ -0,0 +1,169 @@
+import threading
+
+
+class FixtureRegistry(object):
+    """
+    Keeps the objects returned by the `load` method of fixtures in memory, so
+    fixtures depending on them can look them up without querying the
+    database.
+
+    Lookups use an index per fixture, model and set of fields, which is built
+    on the first lookup.
+    """
+
+    def __init__(self):
+        self._objects = {}
+        self._indexes = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, node):
+        return node in self._objects
+
+    def __len__(self):
+        return sum(len(objects) for objects in self._objects.values())
+
+    def register(self, node, objects):
+        """
+        Register the objects created by a fixture.
+
+        :param tuple node: node of the fixture
+        :param list objects: model instances, other values are ignored
+        """
+        objects = [obj for obj in objects or [] if hasattr(obj, "_meta")]
+        with self._lock:
+            self._objects.setdefault(node, []).extend(objects)
+            self._drop_indexes(node)
+
+    def release(self, node):
+        """
+        Forget the objects of a fixture.
+
+        :param tuple node: node of the fixture
+        """
+        with self._lock:
+            self._objects.pop(node, None)
+            self._drop_indexes(node)
+
+    def get_objects(self, node, model=None):
+        """
+        :param tuple node: node of the fixture
+        :param model: only return instances of this model
+        :return: list of the registered objects of the fixture
+        """
+        objects = self._objects.get(node, [])
+        if model is not None:
+            objects = [obj for obj in objects if isinstance(obj, model)]
+        return list(objects)
+
+    @staticmethod
+    def get_lookup(model, fields):
+        """
+        Translate the lookup to attribute names and values, e.g. `author=obj`
+        to `author_id=obj.pk`.
+
+        :param model: model class
+        :param dict fields: field names and values
+        :return: tuple of the attribute names and the values, or None when a
+                 name isn't a concrete field, e.g. `name__startswith`
+        """
+        opts = model._meta
+        lookup = {}
+        for name, value in fields.items():
+            field = opts.pk if name == "pk" else None
+            if field is None:
+                for concrete_field in opts.concrete_fields:
+                    if name in (concrete_field.name, concrete_field.attname):
+                        field = concrete_field
+                        break
+                else:
+                    return None
+            if field.is_relation and name == field.name and hasattr(value, "_meta"):
+                value = value.pk
+            lookup[field.attname] = value
+        names = tuple(sorted(lookup))
+        return names, tuple(lookup[name] for name in names)
+
+    def can_lookup(self, model, fields):
+        """
+        :param model: model class
+        :param dict fields: field names and values
+        :return: whether the objects can be looked up by these fields
+        """
+        return bool(fields) and self.get_lookup(model, fields) is not None
+
+    def _drop_indexes(self, node):
+        for key in list(self._indexes):
+            if key[0] == node:
+                del self._indexes[key]
+
+    def _get_index(self, node, model, names):
+        with self._lock:
+            index = self._indexes.get((node, model, names))
+            if index is None:
+                index = {}
+                for obj in self._objects.get(node, []):
+                    if type(obj) is not model:
+                        continue
+                    if names is None:
+                        key = tuple(obj.natural_key())
+                    else:
+                        key = tuple(getattr(obj, name) for name in names)
+                    index.setdefault(key, []).append(obj)
+                self._indexes[(node, model, names)] = index
+            return index
+
+    def _find(self, nodes, model, names, key, description):
+        if nodes is None:
+            nodes = list(self._objects)
+        matches = []
+        for node in nodes:
+            matches.extend(self._get_index(tuple(node), model, names).get(key, []))
+        if not matches:
+            raise model.DoesNotExist(
+                "%s matching %s is not registered" % (model.__name__, description)
+            )
+        if len(matches) > 1:
+            raise model.MultipleObjectsReturned(
+                "%s %s matching %s are registered"
+                % (len(matches), model.__name__, description)
+            )
+        return matches[0]
+
+    def lookup(self, nodes, model, fields):
+        """
+        Get an object of the given fixtures by the values of its fields.
+
+        :param list nodes: nodes of the fixtures to look in, None for all
+        :param model: model class
+        :param dict fields: names of concrete fields and values
+        :return: the object
+        :raises model.DoesNotExist: when no object is registered
+        :raises model.MultipleObjectsReturned: when more objects are
+                                               registered
+        """
+        lookup = self.get_lookup(model, fields)
+        if not fields or lookup is None:
+            raise ValueError(
+                "%s can't be looked up by %s" % (model.__name__, ", ".join(fields))
+            )
+        names, key = lookup
+        return self._find(nodes, model, names, key, fields)
+
+    def get(self, model, **fields):
+        """
+        Get a registered object of any fixture by the values of its fields,
+        e.g. `registry.get(Author, name="John Doe")`, see `lookup`.
+
+        :param model: model class
+        :return: the object
+        """
+        return self.lookup(None, model, fields)
+
+    def get_by_natural_key(self, model, *key):
+        """
+        Get a registered object by its natural key.
+
+        :param model: model class which instances have a `natural_key` method
+        :return: the object
+        """
+        return self._find(None, model, None, tuple(key), key)
@@ -1,24 +1,71 @@
+import bisect
+import functools
+import gc
+import hashlib
+import inspect
+import os
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 
-from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from dynamic_fixtures.fixtures.bulk import BulkCollector
 from dynamic_fixtures.fixtures.exceptions import (
     DryRun,
     FixtureNotFound,
     MultipleFixturesFound,
+    UnsupportedOptionsError,
 )
-from dynamic_fixtures.fixtures.loader import Graph, Loader
+from dynamic_fixtures.fixtures.loader import Graph, LazyFixtures, Loader
+from dynamic_fixtures.fixtures.plan import CompiledPlan
+from dynamic_fixtures.fixtures.recorder import CheckpointRecorder, FixtureRecorder
+from dynamic_fixtures.fixtures.registry import FixtureRegistry
+from dynamic_fixtures.fixtures.snapshot import SnapshotStore
 
 
 class LoadFixtureRunner(object):
-    def __init__(self):
-        self.loader = Loader()
+    #: Number of compiled plans kept in memory
+    plan_cache_size = 32
+
+    def __init__(self, loader=None):
+        """
+        :param Loader loader: loader to discover the fixtures with, a new
+                              eager loader is used when omitted.
+        """
+        self.loader = loader if loader is not None else Loader()
         self.loader.load_disk()
 
         self._graph = None
+        self._expanded = set()
+        self._clear_indexes()
+
+        self.registry = FixtureRegistry()
+        self._dependents = {}
+        self._registry_lock = threading.Lock()
+        self._collect_garbage = False
+        self._memory_tracker = None
+
+    def _clear_indexes(self):
+        self._app_nodes = None
+        self._name_indexes = {}
+        self._matches = {}
+        self._plans = OrderedDict()
+
+    def refresh(self):
+        """
+        Discover the fixtures again, e.g. after fixture files were added or
+        removed. The graph and the lookup indexes are rebuilt when needed.
+        """
+        self.loader.load_disk()
+        self._graph = None
+        self._expanded = set()
+        self._clear_indexes()
 
     @property
     def graph(self):
-        if not self._graph:
+        if self._graph is None:
             self.init_graph()
         return self._graph
 
@@ -29,25 +76,108 @@ class LoadFixtureRunner(object):
 
         To avoid errors about missing nodes all nodes get loaded first before
         setting the dependencies.
+
+        When the loader is lazy the dependencies are only set for the nodes
+        which are needed for a plan, see `expand_graph`.
         """
         self._graph = Graph()
+        self._expanded = set()
+        self._clear_indexes()
 
         # First add all nodes
         for key in self.loader.disk_fixtures.keys():
             self.graph.add_node(key)
 
+        if self.is_lazy:
+            return
+
         # Then set dependencies
         for key, fixture in self.loader.disk_fixtures.items():
             for dependency in fixture.dependencies:
                 self.graph.add_dependency(key, dependency)
 
+    @property
+    def is_lazy(self):
+        return isinstance(self.loader.disk_fixtures, LazyFixtures)
+
+    def expand_graph(self, nodes):
+        """
+        Set the dependencies of the given nodes and, recursively, of their
+        dependencies. Only the fixtures of these nodes get imported. Modules
+        without Fixture class are removed from the graph, like the eager
+        loader leaves them out.
+
+        :param list nodes: nodes to be expanded
+        """
+        pending = [node for node in nodes if node not in self._expanded]
+        while pending:
+            node = pending.pop()
+            if node in self._expanded:
+                continue
+            self._expanded.add(node)
+            try:
+                dependencies = self.loader.get_dependencies(node)
+            except KeyError:
+                if node in self.loader.disk_fixtures:
+                    raise
+                self.graph.remove_node(node)
+                self._app_nodes = None
+                self._name_indexes = {}
+                self._matches = {}
+                continue
+            for dependency in dependencies:
+                self.graph.add_dependency(node, dependency)
+                if dependency not in self._expanded:
+                    pending.append(dependency)
+        self.loader.save_cache()
+
     def get_app_nodes(self, app_label):
         """
         Get all nodes for given app
         :param str app_label: app label
         :rtype: list
         """
-        return [node for node in self.graph.nodes if node[0] == app_label]
+        if self._app_nodes is None:
+            # Group the nodes per app once, in graph order
+            app_nodes = {}
+            for node in self.graph.nodes:
+                app_nodes.setdefault(node[0], []).append(node)
+            self._app_nodes = app_nodes
+        return list(self._app_nodes.get(app_label, []))
+
+    def get_name_index(self, app_label):
+        """
+        Get the sorted fixture names of given app, built once per app.
+        :param str app_label: app label
+        :rtype: list
+        """
+        if app_label not in self._name_indexes:
+            self._name_indexes[app_label] = sorted(
+                node[1] for node in self.get_app_nodes(app_label=app_label)
+            )
+        return self._name_indexes[app_label]
+
+    def find_fixture_nodes(self, app_label, fixture_prefix):
+        """
+        Get all nodes in given app of which the name starts with given prefix.
+
+        The names matching a prefix are adjacent in the sorted name index, so
+        they are found with a binary search. Results are memoized until the
+        graph is rebuilt.
+        :param str app_label: App label
+        :param str fixture_prefix: first part of the fixture name
+        :return: list of found nodes, sorted by name
+        """
+        key = (app_label, fixture_prefix)
+        if key not in self._matches:
+            names = self.get_name_index(app_label)
+            nodes = []
+            for i in range(bisect.bisect_left(names, fixture_prefix), len(names)):
+                if not names[i].startswith(fixture_prefix):
+                    break
+                nodes.append((app_label, names[i]))
+            self._matches[key] = nodes
+        return list(self._matches[key])
 
     def get_fixture_node(self, app_label, fixture_prefix):
         """
@@ -56,8 +186,9 @@ class LoadFixtureRunner(object):
         :param str fixture_prefix: first part of the fixture name
         :return: list of found fixtures.
         """
-        app_nodes = self.get_app_nodes(app_label=app_label)
-        nodes = [node for node in app_nodes if node[1].startswith(fixture_prefix)]
+        nodes = self.find_fixture_nodes(
+            app_label=app_label, fixture_prefix=fixture_prefix
+        )
 
         if len(nodes) > 1:
             raise MultipleFixturesFound(
@@ -72,41 +203,578 @@ class LoadFixtureRunner(object):
             )
         return nodes
 
-    def load_fixtures(self, nodes=None, progress_callback=None, dry_run=False):
+    def get_fixture_nodes(self, fixtures):
+        """
+        Get the fixtures for many app labels and prefixes at once.
+        :param list fixtures: list of (app_label, fixture_prefix)
+        :return: list of found fixtures, in the given order.
+        """
+        nodes = []
+        for app_label, fixture_prefix in fixtures:
+            nodes.extend(
+                self.get_fixture_node(
+                    app_label=app_label, fixture_prefix=fixture_prefix
+                )
+            )
+        return nodes
+
+    def load_fixtures(
+        self,
+        nodes=None,
+        progress_callback=None,
+        dry_run=False,
+        workers=None,
+        incremental=False,
+        snapshot_dir=None,
+        profiler=None,
+        commit_every=None,
+        database=DEFAULT_DB_ALIAS,
+        commit_each=False,
+        resume=False,
+        collect_garbage=False,
+        memory_tracker=None,
+    ):
         """Load all fixtures for given nodes.
 
         If no nodes are given all fixtures will be loaded.
         :param list nodes: list of nodes to be loaded.
         :param callable progress_callback: Callback which will be called while
                                            handling the nodes.
+        :param bool dry_run: roll back all changes when done.
+        :param int workers: load independent fixtures in parallel using this
+                            number of worker threads.
+        :param bool incremental: only load the fixtures which changed, or of
+                                 which a dependency changed, since they were
+                                 loaded incrementally before.
+        :param str snapshot_dir: directory with snapshots of loaded plans. When
+                                 a snapshot of the plan exists it is restored
+                                 instead of loading the fixtures, otherwise a
+                                 snapshot is saved after loading.
+        :param FixtureProfiler profiler: profiler which collects a profile of
+                                         every loaded fixture.
+        :param int commit_every: don't load all fixtures in one transaction but
+                                 commit every time this number of instances
+                                 collected in bulk is inserted.
+        :param str database: database alias to load the fixtures in which
+                             don't set a database themselves.
+        :param bool commit_each: load every fixture in its own transaction and
+                                 record it as completed, so the run can be
+                                 resumed when it fails.
+        :param bool resume: skip the fixtures completed by the previous run
+                            which committed every fixture, as long as they,
+                            and their dependencies, didn't change. Implies
+                            `commit_each`.
+        :param bool collect_garbage: run a full garbage collection after every
+                                     fixture, once the fixtures which are no
+                                     longer needed are released.
+        :param MemoryTracker memory_tracker: tracker which records the peak and
+                                             retained memory of every fixture.
+        :return: number of loaded fixtures
         """
 
         if progress_callback and not callable(progress_callback):
             raise Exception("Callback should be callable")
 
+        commit_each = commit_each or resume
+        if commit_each and dry_run:
+            raise UnsupportedOptionsError(
+                "Dry-run is not supported when committing every fixture"
+            )
+
+        if commit_each and (commit_every or (workers and workers > 1)):
+            raise UnsupportedOptionsError(
+                "Committing every fixture is not supported in parallel or when "
+                "committing in chunks"
+            )
+
+        if workers and workers > 1 and dry_run:
+            raise UnsupportedOptionsError(
+                "Dry-run is not supported when loading in parallel"
+            )
+
+        if commit_every and dry_run:
+            raise UnsupportedOptionsError(
+                "Dry-run is not supported when committing in chunks"
+            )
+
+        if commit_every and workers and workers > 1:
+            raise UnsupportedOptionsError(
+                "Committing in chunks is not supported in parallel"
+            )
+
         plan = self.get_plan(nodes=nodes)
+        databases = self.assign_databases(plan, database)
+
+        hashes = None
+        if incremental or snapshot_dir or commit_each:
+            hashes = self.get_node_hashes(plan)
 
+        snapshots = None
+        if snapshot_dir and not dry_run:
+            if len(databases) > 1:
+                raise UnsupportedOptionsError(
+                    "Snapshots are not supported for multiple databases"
+                )
+            snapshots = SnapshotStore(snapshot_dir, using=database)
+            snapshot_key = snapshots.get_key(hashes)
+            if snapshots.exists(snapshot_key):
+                start = time.time()
+                snapshots.restore(snapshot_key)
+                if progress_callback:
+                    progress_callback("snapshot_restore", None, time.time() - start)
+                return len(plan)
+
+        checkpoint_hashes = hashes
+        if commit_each:
+            checkpoints = {
+                alias: CheckpointRecorder(using=alias) for alias in databases
+            }
+            if resume:
+                completed = {
+                    alias: recorder.applied_hashes()
+                    for alias, recorder in checkpoints.items()
+                }
+                remaining = []
+                for node in plan:
+                    if completed[self.get_database(node)].get(node) == hashes[node]:
+                        if progress_callback:
+                            progress_callback("resume_skip", node)
+                    else:
+                        remaining.append(node)
+                plan = remaining
+            else:
+                # A new run
+                for recorder in checkpoints.values():
+                    recorder.clear()
+
+        if incremental:
+            applied = {
+                alias: FixtureRecorder(using=alias).applied_hashes()
+                for alias in databases
+            }
+            plan = [
+                node
+                for node in plan
+                if applied[self.loader.disk_fixtures[node].database].get(node)
+                != hashes[node]
+            ]
+        else:
+            hashes = None
+
+        self.reset_registry(plan)
+        self._collect_garbage = collect_garbage
+        self._memory_tracker = memory_tracker
+        if memory_tracker is not None:
+            memory_tracker.start()
         try:
-            with transaction.atomic():
-                self.load_plan(plan=plan, progress_callback=progress_callback)
-                if dry_run:
-                    raise DryRun
-        except DryRun:
-            # Dry-run to get the atomic transaction rolled back
-            pass
+            if workers and workers > 1:
+                self.load_plan_parallel(
+                    plan=plan,
+                    progress_callback=progress_callback,
+                    workers=workers,
+                    hashes=hashes,
+                    profiler=profiler,
+                )
+            elif commit_each:
+                self.load_plan_checkpointed(
+                    plan=plan,
+                    progress_callback=progress_callback,
+                    checkpoint_hashes=checkpoint_hashes,
+                    hashes=hashes,
+                    profiler=profiler,
+                )
+            elif commit_every:
+                # Without an outer transaction every flush of the bulk collectors
+                # is committed.
+                self.load_plan(
+                    plan=plan,
+                    progress_callback=progress_callback,
+                    hashes=hashes,
+                    profiler=profiler,
+                    batch_size=commit_every,
+                )
+            else:
+                try:
+                    with ExitStack() as stack:
+                        # One transaction per database, the fixtures are loaded
+                        # one after another so all of them are rolled back
+                        # together.
+                        for alias in databases:
+                            stack.enter_context(transaction.atomic(using=alias))
+                        self.load_plan(
+                            plan=plan,
+                            progress_callback=progress_callback,
+                            hashes=hashes,
+                            profiler=profiler,
+                        )
+                        if dry_run:
+                            raise DryRun
+                except DryRun:
+                    # Dry-run to get the atomic transaction rolled back
+                    pass
+        finally:
+            if memory_tracker is not None:
+                memory_tracker.stop()
+            self._collect_garbage = False
+            self._memory_tracker = None
+
+        if snapshots is not None:
+            start = time.time()
+            snapshots.save(snapshot_key)
+            if progress_callback:
+                progress_callback("snapshot_save", None, time.time() - start)
 
         return len(plan)
 
-    def load_plan(self, plan, progress_callback):
+    def load_plan(
+        self, plan, progress_callback, hashes=None, profiler=None, batch_size=None
+    ):
         # Load every fixture in the plan.
         for node in plan:
             if progress_callback:
                 progress_callback("load_start", node)
 
-            start = time.time()
-            self.loader.disk_fixtures[node].load()
+            elapsed_time = self.load_node(
+                node, hashes=hashes, profiler=profiler, batch_size=batch_size
+            )
+            self.complete_node(node, elapsed_time, progress_callback)
+
+    def load_plan_checkpointed(
+        self, plan, progress_callback, checkpoint_hashes, hashes=None, profiler=None
+    ):
+        """
+        Load every fixture in the plan in its own transaction, in which the
+        fixture is also recorded as completed.
+
+        :param list plan: resolved list of nodes
+        :param callable progress_callback:
+        :param dict checkpoint_hashes: node and hash to record the completed
+                                       fixtures with
+        :param dict hashes: when given the fixtures are recorded as applied
+                            with their hash from this dict.
+        :param FixtureProfiler profiler: profiler to profile the fixtures with
+        """
+        for node in plan:
             if progress_callback:
-                progress_callback("load_success", node, time.time() - start)
+                progress_callback("load_start", node)
+
+            using = self.get_database(node)
+            with transaction.atomic(using=using):
+                elapsed_time = self.load_node(node, hashes=hashes, profiler=profiler)
+                CheckpointRecorder(using=using).record_applied(
+                    node, checkpoint_hashes[node]
+                )
+            self.complete_node(node, elapsed_time, progress_callback)
+
+    def load_node(self, node, hashes=None, profiler=None, batch_size=None):
+        """
+        Load a single fixture.
+
+        The fixture gets a fresh bulk collector which is flushed after the
+        fixture is loaded.
+
+        :param tuple node: node to be loaded
+        :param dict hashes: when given the fixture is recorded as applied with
+                            its hash from this dict.
+        :param FixtureProfiler profiler: profiler to profile the fixture with
+        :param int batch_size: batch size of the bulk collector, defaults to
+                               the `bulk_batch_size` of the fixture.
+        :return: elapsed time in seconds
+        """
+        start = time.time()
+        fixture = self.loader.disk_fixtures[node]
+        fixture.bulk = BulkCollector(
+            batch_size=batch_size or fixture.bulk_batch_size, using=fixture.database
+        )
+        fixture.registry = self.registry
+        if profiler is not None:
+            with profiler.profile(node, using=fixture.database):
+                objects = self.run_fixture(fixture)
+        else:
+            objects = self.run_fixture(fixture)
+        if hashes is not None:
+            FixtureRecorder(using=fixture.database).record_applied(node, hashes[node])
+        self.registry.register(node, objects)
+        return time.time() - start
+
+    def reset_registry(self, plan):
+        """
+        Start with an empty registry and count the fixtures in the plan which
+        depend on every fixture, so the objects of a fixture can be released
+        once all of them are loaded.
+
+        :param list plan: resolved list of nodes
+        """
+        self.registry = FixtureRegistry()
+        self._dependents = {node: 0 for node in plan}
+        for node in plan:
+            for dependency in self.graph.nodes[node]:
+                if dependency in self._dependents:
+                    self._dependents[dependency] += 1
+
+    def release_node(self, node):
+        """
+        Release the fixtures, and their registered objects, which no fixture
+        still to be loaded depends on, now the given fixture is loaded.
+
+        :param tuple node: the loaded node
+        :return: list of the released nodes
+        """
+        if node not in self._dependents:
+            return []
+        released = []
+        with self._registry_lock:
+            if not self._dependents[node]:
+                released.append(node)
+            for dependency in self.graph.nodes[node]:
+                if dependency in self._dependents:
+                    self._dependents[dependency] -= 1
+                    if not self._dependents[dependency]:
+                        released.append(dependency)
+            for released_node in released:
+                self.registry.release(released_node)
+                self.loader.release_fixture(released_node)
+        return released
+
+    def complete_node(self, node, elapsed_time, progress_callback):
+        """
+        Report a loaded fixture and release what is no longer needed.
+
+        :param tuple node: loaded node
+        :param float elapsed_time: time it took to load the node
+        :param callable progress_callback: Callback which will be called while
+                                           handling the nodes.
+        """
+        self.report_success(node, elapsed_time, progress_callback)
+        released = self.release_node(node)
+        if self._collect_garbage:
+            gc.collect()
+        if self._memory_tracker is not None:
+            self._memory_tracker.record(node, released)
+
+    def assign_databases(self, plan, database):
+        """
+        Set the database of every fixture in the plan: the database the
+        fixture class declares or else the given database.
+
+        :param list plan: resolved list of nodes
+        :param str database: default database alias
+        :return: list of the database aliases used by the plan
+        """
+        databases = []
+        for node in plan:
+            fixture = self.loader.disk_fixtures[node]
+            fixture.database = getattr(type(fixture), "database", None) or database
+            if fixture.database not in databases:
+                databases.append(fixture.database)
+        return databases
+
+    def get_database(self, node):
+        """
+        :param tuple node: node in the plan
+        :return: database alias the fixture is loaded in
+        """
+        return self.loader.disk_fixtures[node].database
+
+    @staticmethod
+    def run_fixture(fixture):
+        """
+        Call `load` of a fixture and insert the instances it collected.
+
+        When `load` is a generator it is consumed lazily; the instances, or
+        lists of instances, it yields are added to the bulk collector of the
+        fixture so they get inserted in batches.
+
+        :param BaseFixture fixture: fixture to load
+        :return: the list returned by `load`, None for generators
+        """
+        result = fixture.load()
+        if inspect.isgenerator(result):
+            for item in result:
+                if isinstance(item, (list, tuple)):
+                    fixture.bulk.add_all(item)
+                else:
+                    fixture.bulk.add(item)
+            result = None
+        fixture.bulk.flush()
+        if isinstance(result, (list, tuple)):
+            return result
+        return None
+
+    def get_node_hashes(self, plan):
+        """
+        Calculate a hash for every node in the plan from the source of the
+        fixture and the hashes of its dependencies, so a node gets a new hash
+        when the fixture or any of its upstream fixtures changed.
+
+        :param list plan: resolved list of nodes
+        :return: dict of node and hash
+        """
+        hashes = {}
+        for node in plan:
+            digest = hashlib.sha256(self.loader.get_fixture_hash(node).encode())
+            for dependency in sorted(self.graph.nodes[node]):
+                digest.update(hashes[dependency].encode())
+            hashes[node] = digest.hexdigest()
+        return hashes
+
+    def report_success(self, node, elapsed_time, progress_callback):
+        """
+        Report a loaded fixture and the rows it inserted in bulk.
+
+        :param tuple node: loaded node
+        :param float elapsed_time: time it took to load the node
+        :param callable progress_callback: Callback which will be called while
+                                           handling the nodes.
+        """
+        if not progress_callback:
+            return
+
+        progress_callback("load_success", node, elapsed_time)
+
+        bulk = self.loader.disk_fixtures[node].bulk
+        if bulk.rows and self.accepts_rows(progress_callback):
+            progress_callback("bulk_flush", node, bulk.flush_time, rows=bulk.rows)
+
+    @staticmethod
+    def accepts_rows(progress_callback):
+        """
+        Callbacks written for `(action, node, elapsed_time=None)` don't get the
+        "bulk_flush" event, which passes the number of rows as `rows`.
+
+        :param callable progress_callback:
+        :return: whether the callback accepts the `rows` keyword argument
+        """
+        try:
+            parameters = inspect.signature(progress_callback).parameters
+        except (TypeError, ValueError):
+            return False
+        return "rows" in parameters or any(
+            parameter.kind == inspect.Parameter.VAR_KEYWORD
+            for parameter in parameters.values()
+        )
+
+    def load_plan_parallel(
+        self, plan, progress_callback, workers, hashes=None, profiler=None
+    ):
+        """
+        Load the plan level by level, the fixtures within a level are loaded
+        concurrently in a pool of worker threads.
+
+        Every fixture is loaded in its own transaction on the connection of
+        the thread it runs in, so fixtures which were loaded before a failure
+        are not rolled back. Fixtures with `parallel = False` are loaded on
+        the main thread.
+
+        :param list plan: resolved list of nodes
+        :param callable progress_callback: Callback which will be called while
+                                           handling the nodes.
+        :param int workers: number of worker threads
+        :param dict hashes: hashes to record the loaded fixtures with
+        :param FixtureProfiler profiler: profiler to profile the fixtures with
+        """
+        if progress_callback:
+            progress_callback = self.synchronize_callback(progress_callback)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for level in self.graph.get_levels(plan):
+                futures = []
+                serial = []
+                for node in level:
+                    if self.loader.disk_fixtures[node].parallel:
+                        future = executor.submit(
+                            self._load_node_in_worker,
+                            node,
+                            hashes,
+                            profiler,
+                            progress_callback,
+                        )
+                        futures.append((node, future))
+                    else:
+                        serial.append(node)
+
+                for node in serial:
+                    if progress_callback:
+                        progress_callback("load_start", node)
+                    with transaction.atomic(using=self.get_database(node)):
+                        elapsed_time = self.load_node(
+                            node, hashes=hashes, profiler=profiler
+                        )
+                    self.complete_node(node, elapsed_time, progress_callback)
+
+                for node, future in futures:
+                    elapsed_time = future.result()
+                    self.complete_node(node, elapsed_time, progress_callback)
+
+    @staticmethod
+    def synchronize_callback(progress_callback):
+        """
+        Wrap a progress callback so it is only called by one thread at a time.
+
+        :param callable progress_callback: callback to wrap
+        :return: the wrapped callback
+        :rtype: callable
+        """
+        lock = threading.Lock()
+
+        @functools.wraps(progress_callback)
+        def synchronized(*args, **kwargs):
+            with lock:
+                return progress_callback(*args, **kwargs)
+
+        return synchronized
+
+    def _load_node_in_worker(self, node, hashes, profiler, progress_callback):
+        if progress_callback:
+            progress_callback("load_start", node)
+        try:
+            with transaction.atomic(using=self.get_database(node)):
+                return self.load_node(node, hashes=hashes, profiler=profiler)
+        finally:
+            # Django connections are per thread, don't leave it open.
+            connections.close_all()
+
+    def get_shard(self, plan, index, count, durations=None):
+        """
+        Get the part of a plan for one of a number of shards.
+
+        The plan is split in connected components, which are spread over the
+        shards so the total duration per shard is balanced. The assignment is
+        deterministic, so every shard can calculate its own part.
+
+        :param list plan: resolved list of nodes
+        :param int index: number of the shard, starting at 1
+        :param int count: total number of shards
+        :param dict durations: node and duration in seconds from earlier runs,
+                               nodes without duration count for the mean
+                               duration, or 1 second when none are known.
+        :return: list of nodes of the shard in plan order
+        """
+        if not 1 <= index <= count:
+            raise ValueError("Shard %s is not in the range 1-%s" % (index, count))
+
+        durations = durations or {}
+        known = [durations[node] for node in plan if node in durations]
+        default_duration = sum(known) / len(known) if known else 1.0
+
+        components = self.graph.get_components(plan)
+        weights = [
+            sum(durations.get(node, default_duration) for node in component)
+            for component in components
+        ]
+        loads = [0.0] * count
+        shard = []
+        # Heaviest components first, each to the shard with the lowest load.
+        for position in sorted(
+            range(len(components)), key=lambda item: (-weights[item], item)
+        ):
+            target = loads.index(min(loads))
+            loads[target] += weights[position]
+            if target == index - 1:
+                shard.extend(components[position])
+
+        order = {node: position for position, node in enumerate(plan)}
+        return sorted(shard, key=order.get)
 
     def get_plan(self, nodes=None):
         """
@@ -116,6 +784,83 @@ class LoadFixtureRunner(object):
         :param list nodes: list of nodes to be loaded.
         :return:
         """
+        return list(self.compile_plan(nodes=nodes).plan)
+
+    def compile_plan(self, nodes=None):
+        """
+        Get the compiled plan for given nodes.
+
+        Compiled plans are kept in memory for the same nodes until the
+        graph is rebuilt. When the loader has a cache directory they are also
+        stored on disk, for as long as no fixture file changes.
+
+        :param list nodes: list of nodes to be loaded.
+        :rtype: CompiledPlan
+        """
+        # The order of the plan depends on the order of the requested nodes
+        key = tuple(nodes) if nodes else None
+        compiled = self._plans.get(key)
+        if compiled is not None:
+            self._plans.move_to_end(key)
+            return compiled
+
+        cache_dir = getattr(self.loader, "cache_dir", None)
+        path = fingerprint = None
+        if cache_dir is not None:
+            fingerprint = self.loader.get_fingerprint()
+            path = os.path.join(
+                cache_dir, "plans", CompiledPlan.get_key(nodes, fingerprint) + ".json"
+            )
+            compiled = CompiledPlan.load(path)
+            if compiled is not None and compiled.fingerprint == fingerprint:
+                self.apply_plan(compiled)
+            else:
+                compiled = None
+
+        if compiled is None:
+            plan = self.resolve_plan(nodes=nodes)
+            compiled = CompiledPlan(
+                nodes=None if nodes is None else list(nodes),
+                plan=plan,
+                dependencies={node: list(self.graph.nodes[node]) for node in plan},
+                fingerprint=fingerprint,
+            )
+            if path is not None:
+                compiled.save(path)
+
+        self._plans[key] = compiled
+        if len(self._plans) > self.plan_cache_size:
+            self._plans.popitem(last=False)
+        return compiled
+
+    def apply_plan(self, compiled):
+        """
+        Set the dependencies of a compiled plan in the graph, so a lazy graph
+        doesn't need to be expanded for its nodes.
+
+        :param CompiledPlan compiled:
+        """
+        if not self.is_lazy:
+            return
+        for node in compiled.plan:
+            if node in self._expanded:
+                continue
+            self._expanded.add(node)
+            for dependency in compiled.dependencies[node]:
+                self.graph.add_dependency(node, dependency)
+
+    def resolve_plan(self, nodes=None):
+        """
+        Resolve the graph for given nodes.
+
+        :param list nodes: list of nodes to be loaded.
+        :return: list of nodes
+        """
+        if self.is_lazy:
+            self.expand_graph(nodes or list(self.graph.nodes))
+            if nodes:
+                nodes = [node for node in nodes if node in self.graph.nodes]
+
         if nodes:
             plan = self.graph.resolve_nodes(nodes)
         else:
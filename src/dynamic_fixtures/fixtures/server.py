@@ -0,0 +1,186 @@
+import importlib
+import json
+import logging
+import os
+import socket
+import sys
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class FixtureServer(object):
+    """
+    Keeps a runner warm in a long-lived process and loads fixtures on request
+    of clients connecting to a Unix socket, see `dynamic_fixtures.client`.
+
+    Every request is a single line of JSON, e.g.:
+
+        {"action": "load", "app_label": "my_app", "dry_run": true}
+
+    and gets a single line of JSON as response. Requests are handled one at a
+    time. Before every request the fixture files are checked; when files were
+    added, removed or changed, the changed modules are imported again.
+    """
+
+    def __init__(self, socket_path, runner):
+        """
+        :param str socket_path: path of the Unix socket to listen on
+        :param LoadFixtureRunner runner: runner to load the fixtures with
+        """
+        self.socket_path = socket_path
+        self.runner = runner
+        self._stamps = self.get_stamps()
+        self._stopped = False
+
+    def get_stamps(self):
+        """
+        :return: dict of node and modification time and size of its file
+        """
+        stamps = {}
+        for node, path in self.runner.loader.scan_fixture_files().items():
+            stat = os.stat(path)
+            stamps[node] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def reload(self):
+        """
+        Rediscover the fixtures when fixture files changed since the last
+        request.
+
+        :return: True when the fixtures were rediscovered
+        """
+        stamps = self.get_stamps()
+        if stamps == self._stamps:
+            return False
+
+        fixture_modules = self.runner.loader.fixture_modules or {}
+        for node in set(stamps) | set(self._stamps):
+            if stamps.get(node) != self._stamps.get(node) and node in fixture_modules:
+                # Imported again when the fixtures are rediscovered
+                sys.modules.pop(fixture_modules[node], None)
+        importlib.invalidate_caches()
+        self.runner.refresh()
+        self._stamps = stamps
+        logger.info("Fixture files changed, reloaded the fixtures")
+        return True
+
+    def get_nodes(self, app_label=None, fixture_name=None):
+        if app_label is None:
+            return None
+        if fixture_name is None:
+            return self.runner.get_app_nodes(app_label=app_label)
+        return self.runner.get_fixture_node(
+            app_label=app_label, fixture_prefix=fixture_name
+        )
+
+    def handle_request(self, request):
+        """
+        :param dict request: action (load, list, ping or stop), app_label,
+                             fixture_name, dry_run and database
+        :return: dict with the response
+        """
+        action = request.get("action")
+        if action == "ping":
+            return {"ok": True}
+        if action == "stop":
+            self._stopped = True
+            return {"ok": True}
+        if action not in ("load", "list"):
+            return {"ok": False, "error": "Unknown action %s" % action}
+
+        close_old_connections()
+        try:
+            reloaded = self.reload()
+            nodes = self.get_nodes(
+                app_label=request.get("app_label"),
+                fixture_name=request.get("fixture_name"),
+            )
+            if action == "list":
+                plan = self.runner.get_plan(nodes=nodes)
+                return {
+                    "ok": True,
+                    "reloaded": reloaded,
+                    "nodes": [list(node) for node in plan],
+                    "count": len(plan),
+                }
+
+            events = []
+
+            def progress_callback(action, node, elapsed_time=None, rows=None):
+                events.append(
+                    {
+                        "action": action,
+                        "node": list(node) if node else node,
+                        "elapsed_time": elapsed_time,
+                        "rows": rows,
+                    }
+                )
+
+            kwargs = {}
+            if request.get("database"):
+                kwargs["database"] = request["database"]
+            count = self.runner.load_fixtures(
+                nodes=nodes,
+                progress_callback=progress_callback,
+                dry_run=bool(request.get("dry_run")),
+                **kwargs
+            )
+            return {"ok": True, "reloaded": reloaded, "events": events, "count": count}
+        except Exception as e:
+            logger.exception("Request %s failed", request)
+            return {"ok": False, "error": "%s: %s" % (type(e).__name__, e)}
+        finally:
+            close_old_connections()
+
+    def handle_connection(self, connection):
+        with connection.makefile("rwb") as stream:
+            line = stream.readline()
+            try:
+                request = json.loads(line.decode("utf-8"))
+            except ValueError:
+                response = {"ok": False, "error": "Invalid request"}
+            else:
+                response = self.handle_request(request)
+            stream.write(json.dumps(response).encode("utf-8") + b"\n")
+            stream.flush()
+
+    def bind(self):
+        """
+        :return: listening socket
+        """
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except (IOError, OSError):
+                # Left behind by a server which is gone
+                os.unlink(self.socket_path)
+            else:
+                raise Exception(
+                    "A server is already listening on %s" % self.socket_path
+                )
+            finally:
+                probe.close()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        server.listen(5)
+        return server
+
+    def serve_forever(self):
+        """
+        Handle requests until a stop request is received.
+        """
+        server = self.bind()
+        self._stopped = False
+        try:
+            while not self._stopped:
+                connection, _ = server.accept()
+                with connection:
+                    self.handle_connection(connection)
+        finally:
+            server.close()
+            os.unlink(self.socket_path)
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import sqlite3
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.migrations.recorder import MigrationRecorder
+
+
+class SnapshotStore(object):
+    """
+    Stores snapshots of the database state after fixtures are loaded.
+
+    SQLite databases are copied with the SQLite backup API, which is
+    available on Python 3.7+. The data of other databases is stored as a
+    serialized dump of all models. Restoring a dump is meant for a freshly
+    migrated database.
+    """
+
+    def __init__(self, directory, using=DEFAULT_DB_ALIAS):
+        """
+        :param str directory: directory to store the snapshots in
+        :param str using: database alias
+        """
+        self.directory = directory
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    @property
+    def use_backup(self):
+        """
+        Whether the database is copied with the SQLite backup API, instead of
+        stored as a serialized dump.
+        """
+        return self.connection.vendor == "sqlite" and hasattr(
+            sqlite3.Connection, "backup"
+        )
+
+    def get_key(self, hashes):
+        """
+        Key for a snapshot of a loaded plan.
+
+        The applied migrations are part of the key, as a snapshot contains the
+        schema of the database, or data which fits it.
+
+        :param dict hashes: node and hash for every node in the plan, see
+                            `LoadFixtureRunner.get_node_hashes`
+        :return: hex digest
+        """
+        digest = hashlib.sha256(self.connection.vendor.encode())
+        for node in sorted(hashes):
+            digest.update(("%s.%s:" % node + hashes[node]).encode())
+        for migration in sorted(self.get_applied_migrations()):
+            digest.update(("migration:%s.%s" % migration).encode())
+        return digest.hexdigest()
+
+    def get_applied_migrations(self):
+        """
+        :return: list of app label and name of the applied migrations
+        """
+        return list(MigrationRecorder(self.connection).applied_migrations())
+
+    def get_path(self, key):
+        extension = "sqlite3" if self.use_backup else "json"
+        return os.path.join(self.directory, "%s.%s" % (key, extension))
+
+    def exists(self, key):
+        return os.path.exists(self.get_path(key))
+
+    def save(self, key):
+        """
+        Save the current database state as snapshot.
+
+        :param str key: key of the snapshot
+        """
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        path = self.get_path(key)
+        temp_path = "%s.%s" % (path, os.getpid())
+        if self.use_backup:
+            self.connection.ensure_connection()
+            target = sqlite3.connect(temp_path)
+            try:
+                self.connection.connection.backup(target)
+            finally:
+                target.close()
+        else:
+            with open(temp_path, "w") as snapshot_file:
+                serializers.serialize("json", self.get_objects(), stream=snapshot_file)
+        os.replace(temp_path, path)
+
+    def restore(self, key):
+        """
+        Restore the database state from a snapshot.
+
+        :param str key: key of the snapshot
+        """
+        path = self.get_path(key)
+        if self.use_backup:
+            self.connection.ensure_connection()
+            source = sqlite3.connect(path)
+            try:
+                source.backup(self.connection.connection)
+            finally:
+                source.close()
+        else:
+            with open(path) as snapshot_file, transaction.atomic(using=self.using):
+                models = set()
+                for obj in serializers.deserialize(
+                    "json", snapshot_file, using=self.using
+                ):
+                    obj.save(using=self.using)
+                    models.add(type(obj.object))
+                self.reset_sequences(models)
+
+    def reset_sequences(self, models):
+        """
+        Reset the sequences of the primary keys after rows are inserted with
+        their primary key, like `loaddata` does.
+
+        :param set models: model classes
+        """
+        statements = self.connection.ops.sequence_reset_sql(no_style(), list(models))
+        if statements:
+            with self.connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+    def get_objects(self):
+        for model in apps.get_models():
+            if model._meta.proxy or not model._meta.managed:
+                continue
+            for obj in model._base_manager.using(self.using).order_by("pk"):
+                yield obj
@@ -0,0 +1,275 @@
+import binascii
+import datetime
+import io
+import json
+import time
+
+from django.db import connections, transaction
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def format_copy_value(value):
+    """
+    Format a value for the text format of PostgreSQL's COPY.
+
+    :param value: value prepared for the database
+    :return: str
+    """
+    if value is None:
+        return "\\N"
+    return (
+        format_text_value(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def format_text_value(value):
+    """
+    Format a value as the text PostgreSQL parses values of its type from.
+
+    :param value: value prepared for the database, not None
+    :return: str
+    """
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + binascii.hexlify(bytes(value)).decode("ascii")
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return format_array_value(value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if hasattr(value, "dumps"):
+        # JSON adapters of psycopg2 and psycopg 3, e.g. for a JSONField
+        if hasattr(value, "adapted"):
+            return value.dumps(value.adapted)
+        if hasattr(value, "obj"):
+            return value.dumps(value.obj)
+    return str(value)
+
+
+def format_array_value(values):
+    """
+    Format a list, e.g. of an ArrayField, as PostgreSQL array literal.
+
+    :param values: list or tuple of values, may be nested
+    :return: str
+    """
+    elements = []
+    for value in values:
+        if value is None:
+            elements.append("NULL")
+        elif isinstance(value, (list, tuple)):
+            elements.append(format_array_value(value))
+        else:
+            element = format_text_value(value)
+            elements.append('"%s"' % element.replace("\\", "\\\\").replace('"', '\\"'))
+    return "{%s}" % ",".join(elements)
+
+
+class CopyWriter(object):
+    """
+    Writes rows of a model straight into its table, for data sets which are
+    too large even for `bulk_create`.
+
+    On PostgreSQL rows are streamed with `COPY ... FROM STDIN`, on SQLite they
+    are inserted with `executemany` and on other databases with multi-row
+    INSERT statements. Rows are written with the connection of the database,
+    so within the transaction of the runner, and they are rolled back in
+    dry-run mode.
+
+    Unlike `bulk_create` no signals are sent, no primary keys are set on
+    instances and only `pre_save` of the fields is applied to instances.
+    """
+
+    def __init__(self, model, fields=None, using=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        :param model: model class to write rows of
+        :param list fields: names of the fields to write, all concrete fields
+                            except the auto field by default.
+        :param str using: database alias to write into.
+        :param int batch_size: number of rows to buffer before they get
+                               written.
+        """
+        opts = model._meta
+        self.model = model
+        if fields is None:
+            self.fields = [f for f in opts.concrete_fields if f is not opts.auto_field]
+        else:
+            self.fields = [opts.get_field(name) for name in fields]
+        self.using = using
+        self.batch_size = batch_size
+        self.rows = 0
+        self.write_time = 0.0
+        self._pending = []
+
+    @property
+    def connection(self):
+        return connections[self.using or "default"]
+
+    @property
+    def method(self):
+        """
+        :return: 'copy', 'executemany' or 'insert'
+        """
+        vendor = self.connection.vendor
+        if vendor == "postgresql":
+            return "copy"
+        if vendor == "sqlite":
+            return "executemany"
+        return "insert"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        else:
+            self._pending = []
+
+    def add(self, row):
+        """
+        Add a row to be written.
+
+        :param row: unsaved model instance, dict with values by field name or
+                    sequence of values in the order of the fields
+        """
+        self.add_all([row])
+
+    def add_all(self, rows):
+        """
+        Add multiple rows to be written.
+
+        :param iterable rows: rows, see `add`
+        """
+        connection = self.connection
+        for row in rows:
+            self._pending.append(self.get_values(row, connection))
+            if self.batch_size and len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def add_columns(self, columns):
+        """
+        Add rows given as columns, which is faster than adding them row by
+        row as every column is prepared for the database at once.
+
+        :param list columns: lists of values, one for every field in the
+                             order of the fields
+        """
+        if len(columns) != len(self.fields):
+            raise ValueError(
+                "Expected %s columns but got %s" % (len(self.fields), len(columns))
+            )
+        connection = self.connection
+        prepared = []
+        for field, values in zip(self.fields, columns):
+            get_db_prep_save = field.get_db_prep_save
+            prepared.append([get_db_prep_save(value, connection) for value in values])
+        self._pending.extend(zip(*prepared))
+        if self.batch_size and len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def get_values(self, row, connection=None):
+        """
+        :param row: row, see `add`
+        :param connection: connection of the database, looked up when omitted
+        :return: tuple of values prepared for the database
+        """
+        if connection is None:
+            connection = self.connection
+        if isinstance(row, self.model):
+            values = [field.pre_save(row, True) for field in self.fields]
+        elif isinstance(row, dict):
+            values = [
+                (
+                    row[field.name]
+                    if field.name in row
+                    else row.get(field.attname, field.get_default())
+                )
+                for field in self.fields
+            ]
+        else:
+            values = row
+            if len(values) != len(self.fields):
+                raise ValueError(
+                    "Expected %s values but got %s" % (len(self.fields), len(values))
+                )
+        return tuple(
+            field.get_db_prep_save(value, connection)
+            for field, value in zip(self.fields, values)
+        )
+
+    def flush(self):
+        """
+        Write all buffered rows.
+
+        :return: number of written rows
+        """
+        if not self._pending:
+            return 0
+
+        start = time.time()
+        pending = self._pending
+        self._pending = []
+
+        with transaction.atomic(using=self.using):
+            with self.connection.cursor() as cursor:
+                getattr(self, "write_%s" % self.method)(cursor, pending)
+
+        self.rows += len(pending)
+        self.write_time += time.time() - start
+        return len(pending)
+
+    @property
+    def table(self):
+        return self.connection.ops.quote_name(self.model._meta.db_table)
+
+    @property
+    def columns(self):
+        quote_name = self.connection.ops.quote_name
+        return ", ".join(quote_name(field.column) for field in self.fields)
+
+    def write_copy(self, cursor, rows):
+        data = io.StringIO()
+        for values in rows:
+            data.write("\t".join(format_copy_value(value) for value in values))
+            data.write("\n")
+        data.seek(0)
+
+        sql = "COPY %s (%s) FROM STDIN" % (self.table, self.columns)
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, "copy_expert"):
+            # psycopg2
+            raw_cursor.copy_expert(sql, data)
+        else:
+            # psycopg 3
+            with raw_cursor.copy(sql) as copy:
+                copy.write(data.getvalue())
+
+    def write_executemany(self, cursor, rows):
+        placeholders = ", ".join(["%s"] * len(self.fields))
+        cursor.executemany(
+            "INSERT INTO %s (%s) VALUES (%s)"
+            % (self.table, self.columns, placeholders),
+            rows,
+        )
+
+    def write_insert(self, cursor, rows):
+        placeholders = "(%s)" % ", ".join(["%s"] * len(self.fields))
+        batch_size = max(
+            self.connection.ops.bulk_batch_size(self.fields, rows) or len(rows), 1
+        )
+        for start in range(0, len(rows), batch_size):
+            end = start + batch_size
+            batch = rows[start:end]
+            cursor.execute(
+                "INSERT INTO %s (%s) VALUES %s"
+                % (self.table, self.columns, ", ".join([placeholders] * len(batch))),
+                [value for values in batch for value in values],
+            )
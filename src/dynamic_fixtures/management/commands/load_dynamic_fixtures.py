@@ -1,7 +1,15 @@
 import logging
 
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from dynamic_fixtures.client import send_request
+from dynamic_fixtures.fixtures.analysis import PlanAnalysis, read_durations
+from dynamic_fixtures.fixtures.exceptions import UnsupportedOptionsError
+from dynamic_fixtures.fixtures.loader import Loader
+from dynamic_fixtures.fixtures.profiler import FixtureProfiler, MemoryTracker
 from dynamic_fixtures.fixtures.runner import LoadFixtureRunner
+from dynamic_fixtures.fixtures.server import FixtureServer
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +18,9 @@ class Command(BaseCommand):
 
     help_text = "Load fixtures while keeping dependencies in mind."
     args = "[app_label] [fixture_name]"
+    # Fixtures which are loaded concurrently report their progress in complete
+    # lines, so the output of different fixtures doesn't interleave.
+    concurrent = False
 
     def add_arguments(self, parser):
         parser.add_argument("app_label", default=None, nargs="?", type=str)
@@ -26,9 +37,179 @@ class Command(BaseCommand):
             dest="dry_run",
             help="Don't actually load the fixtures.",
         )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            dest="database",
+            help="Database to load the fixtures in which don't set their own "
+            'database. Defaults to the "default" database.',
+        )
+        parser.add_argument(
+            "--workers",
+            default=None,
+            type=int,
+            dest="workers",
+            help="Load independent fixtures in parallel using this number of "
+            "worker threads.",
+        )
+        parser.add_argument(
+            "--commit-every",
+            default=None,
+            type=int,
+            dest="commit_every",
+            help="Commit every time this number of instances collected in "
+            "bulk is inserted, instead of using one transaction.",
+        )
+        parser.add_argument(
+            "--commit-each",
+            action="store_true",
+            dest="commit_each",
+            help="Commit every fixture in its own transaction and record it as "
+            "completed, so a failed run can be continued with --resume.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            dest="resume",
+            help="Continue the previous run with --commit-each, skipping the "
+            "unchanged fixtures it completed.",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            dest="incremental",
+            help="Only load fixtures which changed since they were loaded "
+            "incrementally before.",
+        )
+        parser.add_argument(
+            "--snapshot-dir",
+            default=None,
+            dest="snapshot_dir",
+            help="Restore the database from a snapshot of the same fixtures "
+            "in this directory, or save a snapshot after loading.",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            dest="profile",
+            help="Profile the fixtures and print the slowest first.",
+        )
+        parser.add_argument(
+            "--profile-output",
+            default=None,
+            dest="profile_output",
+            help="Write the profile of the fixtures as JSON to this file.",
+        )
+        parser.add_argument(
+            "--memory",
+            action="store_true",
+            dest="memory_report",
+            help="Print the peak and retained memory after every fixture.",
+        )
+        parser.add_argument(
+            "--gc",
+            action="store_true",
+            dest="collect_garbage",
+            help="Run a full garbage collection after every fixture.",
+        )
+        parser.add_argument(
+            "--graph",
+            choices=["dot", "json"],
+            default=None,
+            dest="graph",
+            help="Write the dependency graph of the fixtures in this format.",
+        )
+        parser.add_argument(
+            "--plan-stats",
+            action="store_true",
+            dest="plan_stats",
+            help="Show the levels, critical path and bottlenecks of the plan.",
+        )
+        parser.add_argument(
+            "--durations",
+            default=None,
+            dest="durations",
+            help="JSON profile (see --profile-output) with the durations of "
+            "the fixtures, used by --graph, --plan-stats and --shard.",
+        )
+        parser.add_argument(
+            "--shard",
+            default=None,
+            dest="shard",
+            help="Only load the fixtures of one shard, e.g. 3/8 for the third "
+            "of eight shards.",
+        )
+        parser.add_argument(
+            "--lazy",
+            action="store_true",
+            dest="lazy",
+            help="Only import the fixture modules which are needed.",
+        )
+        parser.add_argument(
+            "--cache-dir",
+            default=getattr(settings, "DYNAMIC_FIXTURES_CACHE_DIR", None),
+            dest="cache_dir",
+            help="Directory to cache the fixture dependencies in, implies --lazy.",
+        )
+        parser.add_argument(
+            "--import-workers",
+            default=None,
+            type=int,
+            dest="import_workers",
+            help="Import and validate the fixture modules in this number of "
+            "worker processes first.",
+        )
+        parser.add_argument(
+            "--serve",
+            default=None,
+            dest="serve",
+            metavar="SOCKET",
+            help="Keep the fixtures loaded in memory and load them on request "
+            "of clients connecting to this Unix socket.",
+        )
+        parser.add_argument(
+            "--connect",
+            default=None,
+            dest="connect",
+            metavar="SOCKET",
+            help="Let the server listening on this Unix socket load the fixtures.",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="use_async",
+            help="Load the fixtures with an asyncio event loop, running async "
+            "load() methods concurrently.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            default=10,
+            type=int,
+            dest="concurrency",
+            help="Maximum number of fixtures loaded concurrently with --async.",
+        )
 
     def handle(self, *args, **options):
-        runner = LoadFixtureRunner()
+        if options.get("connect"):
+            return self.handle_connect(*args, **options)
+
+        loader = Loader(
+            lazy=options.get("lazy", False),
+            cache_dir=options.get("cache_dir"),
+            import_workers=options.get("import_workers"),
+        )
+        if options.get("use_async"):
+            self.check_async_options(options)
+            from dynamic_fixtures.fixtures.async_runner import AsyncLoadFixtureRunner
+
+            runner = AsyncLoadFixtureRunner(loader=loader)
+        else:
+            runner = LoadFixtureRunner(loader=loader)
+
+        if (
+            options.get("profile") or options.get("profile_output")
+        ) and not FixtureProfiler.is_supported():
+            raise CommandError("Profiling fixtures requires Django 2.0+")
 
         if len(args) == 1:
             fixture_name = None
@@ -51,13 +232,86 @@ class Command(BaseCommand):
         if options.get("verbosity") > 1:
             logger.setLevel(logging.DEBUG)
 
+        if options.get("serve"):
+            self.stdout.write("Serving fixtures on {}".format(options["serve"]))
+            FixtureServer(socket_path=options["serve"], runner=runner).serve_forever()
+            return
+
+        durations = None
+        if options.get("durations"):
+            durations = read_durations(options["durations"])
+
+        if options.get("shard"):
+            index, count = self.parse_shard(options["shard"])
+            nodes = runner.get_shard(
+                runner.get_plan(nodes=nodes), index, count, durations=durations
+            )
+            if not nodes:
+                self.stdout.write("Total of 0 fixtures")
+                return
+
+        if options.get("graph") or options.get("plan_stats"):
+            analysis = PlanAnalysis(
+                graph=runner.graph,
+                plan=runner.get_plan(nodes=nodes),
+                durations=durations,
+            )
+            if options.get("graph") == "dot":
+                self.stdout.write(analysis.as_dot())
+            elif options.get("graph") == "json":
+                self.stdout.write(analysis.as_json())
+            else:
+                self.write_plan_stats(analysis)
+            return
+
         if not options.get("list", False):
+            profiler = None
+            if options.get("profile") or options.get("profile_output"):
+                profiler = FixtureProfiler()
+            memory_tracker = None
+            if options.get("memory_report"):
+                memory_tracker = MemoryTracker()
 
-            fixture_count = runner.load_fixtures(
-                nodes=nodes,
-                progress_callback=self.progress_callback,
-                dry_run=options.get("dry_run", False),
+            self.concurrent = bool(
+                options.get("use_async") or (options.get("workers") or 0) > 1
             )
+            if options.get("use_async"):
+                from asgiref.sync import async_to_sync
+
+                fixture_count = async_to_sync(runner.aload_fixtures)(
+                    nodes=nodes,
+                    progress_callback=self.progress_callback,
+                    dry_run=options.get("dry_run", False),
+                    concurrency=options.get("concurrency", 10),
+                    database=options.get("database", DEFAULT_DB_ALIAS),
+                )
+            else:
+                try:
+                    fixture_count = runner.load_fixtures(
+                        nodes=nodes,
+                        progress_callback=self.progress_callback,
+                        dry_run=options.get("dry_run", False),
+                        workers=options.get("workers"),
+                        incremental=options.get("incremental", False),
+                        snapshot_dir=options.get("snapshot_dir"),
+                        profiler=profiler,
+                        commit_every=options.get("commit_every"),
+                        database=options.get("database", DEFAULT_DB_ALIAS),
+                        commit_each=options.get("commit_each", False),
+                        resume=options.get("resume", False),
+                        collect_garbage=options.get("collect_garbage", False),
+                        memory_tracker=memory_tracker,
+                    )
+                except UnsupportedOptionsError as e:
+                    raise CommandError(str(e))
+
+            if options.get("profile"):
+                self.write_profile(profiler)
+            if memory_tracker is not None:
+                self.write_memory(memory_tracker)
+            if options.get("profile_output"):
+                with open(options["profile_output"], "w") as profile_file:
+                    profile_file.write(profiler.as_json())
 
         else:
             plan = runner.get_plan(nodes=nodes)
@@ -73,20 +327,202 @@ class Command(BaseCommand):
         if not options.get("list") and options.get("dry_run"):
             self.stdout.write("Dry-run: all changes are rolled back.")
 
-    def progress_callback(self, action, node, elapsed_time=None):
+    def handle_connect(self, *args, **options):
+        """
+        Send the request to a fixture server, see `--serve`.
+        """
+        if len(args) == 2:
+            app_label, fixture_name = args
+        elif len(args) == 1:
+            (app_label,), fixture_name = args, None
+        else:
+            app_label = options.get("app_label")
+            fixture_name = options.get("fixture_name")
+
+        try:
+            response = send_request(
+                options["connect"],
+                {
+                    "action": "list" if options.get("list") else "load",
+                    "app_label": app_label,
+                    "fixture_name": fixture_name,
+                    "dry_run": options.get("dry_run", False),
+                    "database": options.get("database"),
+                },
+            )
+        except (IOError, OSError) as e:
+            raise CommandError("Can't connect to {}: {}".format(options["connect"], e))
+        if not response["ok"]:
+            raise CommandError(response["error"])
+
+        if options.get("list"):
+            self.stdout.write("Discovery all dynamic fixtures...")
+            for node in response["nodes"]:
+                self.stdout.write("{}.{}".format(*node))
+        for event in response.get("events", []):
+            self.progress_callback(
+                event["action"],
+                tuple(event["node"]) if event["node"] else event["node"],
+                elapsed_time=event["elapsed_time"],
+                rows=event["rows"],
+            )
+
+        self.stdout.write("Total of {} fixtures".format(response["count"]))
+        if not options.get("list") and options.get("dry_run"):
+            self.stdout.write("Dry-run: all changes are rolled back.")
+
+    @staticmethod
+    def check_async_options(options):
+        """
+        Check that no options are given which the async runner doesn't support.
+
+        :param dict options:
+        """
+        unsupported = [
+            "commit_each",
+            "resume",
+            "workers",
+            "incremental",
+            "snapshot_dir",
+            "commit_every",
+            "profile",
+            "profile_output",
+            "memory_report",
+            "collect_garbage",
+        ]
+        for option in unsupported:
+            if options.get(option):
+                raise CommandError(
+                    "--async can't be combined with --{}".format(
+                        option.replace("_", "-")
+                    )
+                )
+
+    @staticmethod
+    def parse_shard(shard):
+        """
+        :param str shard: shard as index/count, e.g. 3/8
+        :return: tuple of index and count
+        """
+        try:
+            index, count = [int(part) for part in shard.split("/")]
+        except ValueError:
+            raise CommandError("Shard should be given as index/count, e.g. 3/8")
+        if not 1 <= index <= count:
+            raise CommandError("Shard %s is not in the range 1-%s" % (index, count))
+        return index, count
+
+    def write_plan_stats(self, analysis):
+        """
+        Write the levels, critical path and bottlenecks of a plan.
+
+        :param PlanAnalysis analysis:
+        """
+        levels = analysis.levels
+        self.stdout.write("Levels: {}".format(len(levels)))
+        for depth, level in enumerate(levels, 1):
+            self.stdout.write("  Level {}: {} fixtures".format(depth, len(level)))
+
+        path, total = analysis.get_critical_path()
+        self.stdout.write("Critical path ({:.3f} seconds):".format(total))
+        for node in path:
+            self.stdout.write(
+                "  {}.{} ({:.3f})".format(node[0], node[1], analysis.get_duration(node))
+            )
+
+        self.stdout.write("Bottlenecks:")
+        for node, count in analysis.get_bottlenecks():
+            self.stdout.write(
+                "  {}.{}: {} dependent fixtures".format(node[0], node[1], count)
+            )
+
+    def write_profile(self, profiler):
+        """
+        Write the profile of the loaded fixtures, the slowest first.
+
+        :param FixtureProfiler profiler:
+        """
+        row = "{:<50} {:>10} {:>10} {:>8} {:>10} {:>10} {:>12}"
+        self.stdout.write(
+            row.format(
+                "Fixture",
+                "Wall (s)",
+                "CPU (s)",
+                "Queries",
+                "Query (s)",
+                "Rows",
+                "Memory (KiB)",
+            )
+        )
+        for profile in profiler.get_sorted():
+            self.stdout.write(
+                row.format(
+                    "{}.{}".format(*profile.node),
+                    "{:.3f}".format(profile.wall_time),
+                    "{:.3f}".format(profile.cpu_time),
+                    profile.queries,
+                    "{:.3f}".format(profile.query_time),
+                    profile.total_rows,
+                    profile.peak_memory // 1024,
+                )
+            )
+
+    def write_memory(self, memory_tracker):
+        """
+        Write the peak and retained memory of the loaded fixtures, in the
+        order they were loaded.
+
+        :param MemoryTracker memory_tracker:
+        """
+        row = "{:<50} {:>12} {:>14} {:>9}"
+        self.stdout.write(
+            row.format("Fixture", "Peak (KiB)", "Retained (KiB)", "Released")
+        )
+        for step in memory_tracker.steps:
+            self.stdout.write(
+                row.format(
+                    "{}.{}".format(*step.node),
+                    step.peak // 1024,
+                    step.retained // 1024,
+                    len(step.released),
+                )
+            )
+        self.stdout.write("Peak memory: {} KiB".format(memory_tracker.peak // 1024))
+
+    def progress_callback(self, action, node, elapsed_time=None, rows=None):
         """
         Callback to report progress
 
         :param str action:
         :param list node: app, module
         :param int | None elapsed_time:
+        :param int | None rows: number of rows inserted in bulk
         """
         if action == "load_start":
-            self.stdout.write("Loading fixture {}.{}...".format(*node), ending="")
-            self.stdout.flush()
+            if self.concurrent:
+                self.stdout.write("Loading fixture {}.{}...".format(*node))
+            else:
+                self.stdout.write("Loading fixture {}.{}...".format(*node), ending="")
+                self.stdout.flush()
         elif action == "load_success":
             message = "SUCCESS"
             if elapsed_time:
                 message += " ({:.03} seconds) ".format(elapsed_time)
+            if self.concurrent:
+                message = "Loaded fixture {}.{}: {}".format(node[0], node[1], message)
 
             self.stdout.write(message)
+        elif action == "snapshot_restore":
+            self.stdout.write(
+                "Restored fixtures from snapshot ({:.03} seconds)".format(elapsed_time)
+            )
+        elif action == "snapshot_save":
+            self.stdout.write(
+                "Saved snapshot of fixtures ({:.03} seconds)".format(elapsed_time)
+            )
+        elif action == "resume_skip":
+            self.stdout.write("Skipping completed fixture {}.{}".format(*node))
+        elif action == "bulk_flush":
+            self.stdout.write(
+                "  Inserted {} rows in bulk ({:.03} seconds)".format(rows, elapsed_time)
+            )
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="AppliedFixture",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("app_label", models.CharField(max_length=255)),
+                ("name", models.CharField(max_length=255)),
+                ("hash", models.CharField(max_length=64)),
+                ("applied", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "unique_together": {("app_label", "name")},
+            },
+        ),
+    ]
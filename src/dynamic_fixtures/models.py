@@ -0,0 +1,38 @@
+from django.db import models
+
+
+class AppliedFixture(models.Model):
+    """
+    Bookkeeping of fixtures which are loaded in incremental mode.
+    """
+
+    app_label = models.CharField(max_length=255)
+    name = models.CharField(max_length=255)
+    # Hash of the fixture source and the hashes of its dependencies.
+    hash = models.CharField(max_length=64)
+    applied = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("app_label", "name")
+
+    def __str__(self):
+        return "%s.%s" % (self.app_label, self.name)
+
+
+class FixtureCheckpoint(models.Model):
+    """
+    Bookkeeping of fixtures which are completed in a run which commits every
+    fixture, so the run can be resumed after a failure.
+    """
+
+    app_label = models.CharField(max_length=255)
+    name = models.CharField(max_length=255)
+    # Hash of the fixture source and the hashes of its dependencies.
+    hash = models.CharField(max_length=64)
+    completed = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("app_label", "name")
+
+    def __str__(self):
+        return "%s.%s" % (self.app_label, self.name)
@@ -0,0 +1,63 @@
+"""
+Pytest fixtures for pytest-django users.
+
+Enable the plugin in your `conftest.py`::
+
+    pytest_plugins = ["dynamic_fixtures.pytest_plugin"]
+"""
+
+import sys
+
+import pytest
+from django.db import transaction
+from dynamic_fixtures.testcases import get_runner, load_dynamic_fixtures
+
+
+@pytest.fixture(scope="session")
+def dynamic_fixtures_runner():
+    """
+    Runner which is shared by all tests.
+    """
+    return get_runner()
+
+
+def dynamic_fixtures_fixture(fixtures, scope="session"):
+    """
+    Create a pytest fixture which loads the given dynamic fixtures once per
+    scope.
+
+    The fixtures are loaded in a transaction which is rolled back when the
+    scope ends. Tests using the `db` fixture are rolled back to the state right
+    after the fixtures were loaded::
+
+        # conftest.py
+        library = dynamic_fixtures_fixture([("my_app", "0002")], scope="module")
+
+        # test_books.py
+        def test_books(library, db):
+            ...
+
+    :param list fixtures: list of ('app_label', 'fixture_prefix')
+    :param str scope: pytest scope of the fixture
+    """
+
+    @pytest.fixture(scope=scope)
+    def _dynamic_fixtures(django_db_setup, django_db_blocker, dynamic_fixtures_runner):
+        # The database is only unblocked to load and roll back the fixtures,
+        # tests still need the `db` fixture to access it.
+        atomic = transaction.atomic()
+        with django_db_blocker.unblock():
+            atomic.__enter__()
+            try:
+                load_dynamic_fixtures(fixtures, runner=dynamic_fixtures_runner)
+            except BaseException:
+                atomic.__exit__(*sys.exc_info())
+                raise
+        try:
+            yield
+        finally:
+            with django_db_blocker.unblock():
+                transaction.set_rollback(True)
+                atomic.__exit__(None, None, None)
+
+    return _dynamic_fixtures
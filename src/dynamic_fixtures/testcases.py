@@ -0,0 +1,69 @@
+from django.test import TestCase
+from dynamic_fixtures.fixtures.runner import LoadFixtureRunner
+
+_runner = None
+
+
+def get_runner():
+    """
+    Runner which is shared by all tests, so the fixtures are only discovered
+    once per process.
+
+    :rtype: LoadFixtureRunner
+    """
+    global _runner
+    if _runner is None:
+        _runner = LoadFixtureRunner()
+    return _runner
+
+
+def get_nodes(fixtures, runner=None):
+    """
+    Get the nodes of the given fixtures.
+
+    :param list fixtures: list of ('app_label', 'fixture_prefix')
+    :param LoadFixtureRunner runner: runner to use, the shared runner when
+                                     omitted.
+    :return: list of nodes
+    """
+    runner = runner or get_runner()
+    return runner.get_fixture_nodes(fixtures)
+
+
+def load_dynamic_fixtures(fixtures, runner=None):
+    """
+    Load the given fixtures and their dependencies.
+
+    :param list fixtures: list of ('app_label', 'fixture_prefix')
+    :param LoadFixtureRunner runner: runner to use, the shared runner when
+                                     omitted.
+    :return: number of loaded fixtures
+    """
+    runner = runner or get_runner()
+    nodes = get_nodes(fixtures, runner=runner)
+    if not nodes:
+        # No nodes would load all fixtures.
+        return 0
+    return runner.load_fixtures(nodes=nodes)
+
+
+class DynamicFixturesMixin(object):
+    """
+    Mixin for Django's TestCase which loads dynamic fixtures once per class.
+
+    The fixtures are loaded in `setUpTestData`, which runs in the atomic
+    block of the class, so every test is rolled back to the state right
+    after the fixtures were loaded.
+    """
+
+    # Fixtures to load, a list of ('app_label', 'fixture_prefix')
+    dynamic_fixtures = []
+
+    @classmethod
+    def setUpTestData(cls):
+        super(DynamicFixturesMixin, cls).setUpTestData()
+        load_dynamic_fixtures(cls.dynamic_fixtures)
+
+
+class DynamicFixturesTestCase(DynamicFixturesMixin, TestCase):
+    pass
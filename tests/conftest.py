@@ -0,0 +1,8 @@
+collect_ignore = []
+
+try:
+    import asgiref  # noqa: F401
+except ImportError:
+    # The async runner needs Python 3.5+ and asgiref, which is installed with
+    # Django 3.0+. Its tests can't even be compiled on older versions.
+    collect_ignore.append("fixtures/runner/test_async_runner.py")
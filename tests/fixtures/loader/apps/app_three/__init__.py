@@ -0,0 +1 @@
+# No app config in this app.
@@ -0,0 +1,5 @@
+from dynamic_fixtures.fixtures.basefixture import BaseFixture
+
+
+class Fixture(BaseFixture):
+    dependencies = [("app_three", "001_load_base_data")]
@@ -1,5 +1,6 @@
 from unittest.case import TestCase
 
+from dynamic_fixtures.fixtures.exceptions import CircularDependencyError
 from dynamic_fixtures.fixtures.loader import Graph
 
 
@@ -60,11 +61,34 @@ class GraphTestCase(TestCase):
         Expected: An error get raised
         """
         self.graph.add_dependency("c", "a")
-        with self.assertRaises(Exception) as e:
+        with self.assertRaises(CircularDependencyError) as e:
             self.graph.resolve_node()
-        self.assertEqual(
-            e.exception.args[0] % e.exception.args[1:], "Circular dependency c > a"
-        )
+        self.assertEqual(str(e.exception), "Circular dependency a > b > c > a")
+        self.assertListEqual(e.exception.cycle, ["a", "b", "c", "a"])
+
+    def test_circular_dependency_subset(self):
+        """
+        Case: a circular dependency is reached while resolving a sub-set
+        Expected: An error get raised containing the full cycle
+        """
+        self.graph.add_dependency("e", "b")
+        with self.assertRaises(CircularDependencyError) as e:
+            self.graph.resolve_nodes(["c"])
+        self.assertListEqual(e.exception.cycle, ["c", "e", "b", "c"])
+
+    def test_deep_dependency_chain(self):
+        """
+        Case: a chain of dependencies deeper than the recursion limit
+        Expected: The chain get resolved without errors, deepest node first
+        """
+        graph = Graph()
+        depth = 5000
+        for index in range(depth):
+            graph.add_node(index)
+        for index in range(1, depth):
+            graph.add_dependency(index, index - 1)
+
+        self.assertListEqual(graph.resolve_node(depth - 1), list(range(depth)))
 
     def test_subset(self):
         """
@@ -74,6 +98,9 @@ class GraphTestCase(TestCase):
         flat_list = self.graph.resolve_nodes(["b", "c"])
         self.assertEqual(flat_list, ["d", "e", "c", "b"])
 
+        flat_list = self.graph.resolve_nodes(["c", "b"])
+        self.assertEqual(flat_list, ["d", "e", "c", "b"])
+
     def test_error_missing_dependency(self):
         """
         Case: A dependency is required which is not available
@@ -86,3 +113,46 @@ class GraphTestCase(TestCase):
             e.exception.args[0] % e.exception.args[1:],
             'Dependency "x" required for "c" but is not set.',
         )
+
+    def test_get_levels(self):
+        """
+        Case: A resolved plan get split in levels
+        Expected: Every node is in a level after all its dependencies
+        """
+        levels = self.graph.get_levels(self.graph.resolve_node())
+        self.assertListEqual(levels, [["d", "e"], ["c"], ["b"], ["a"]])
+
+    def test_get_levels_subset(self):
+        """
+        Case: A resolved sub-set get split in levels
+        Expected: Only the resolved nodes are in the levels
+        """
+        levels = self.graph.get_levels(self.graph.resolve_nodes(["c"]))
+        self.assertListEqual(levels, [["d", "e"], ["c"]])
+
+    def test_get_levels_without_dependencies(self):
+        """
+        Case: A plan without some of the dependencies get split in levels
+        Expected: The missing dependencies are ignored
+        """
+        self.assertListEqual(self.graph.get_levels(["c", "b"]), [["c"], ["b"]])
+        self.assertListEqual(self.graph.get_levels(["e", "b"]), [["e"], ["b"]])
+
+    def test_get_components_without_dependencies(self):
+        """
+        Case: A plan without some of the dependencies get split in components
+        Expected: The missing dependencies are ignored
+        """
+        self.assertListEqual(self.graph.get_components(["d", "b"]), [["d"], ["b"]])
+
+    def test_get_components(self):
+        """
+        Case: A resolved plan get split in connected components
+        Expected: Nodes connected in either direction are in one component
+        """
+        self.graph.add_node("f")
+        self.graph.add_node("g")
+        self.graph.add_dependency("g", "f")
+
+        components = self.graph.get_components(self.graph.resolve_node())
+        self.assertListEqual(components, [["d", "e", "c", "b", "a"], ["f", "g"]])
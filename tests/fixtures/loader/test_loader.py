@@ -1,9 +1,14 @@
+import hashlib
 import os
+import shutil
 import sys
+import tempfile
+from importlib import import_module
 from unittest import mock
 
 from django.test.testcases import TestCase
 from django.test.utils import override_settings
+from dynamic_fixtures.fixtures.exceptions import BadFixtureError
 from dynamic_fixtures.fixtures.loader import Loader
 
 # Make sure the test apps can be imported
@@ -37,6 +42,63 @@ class FixturesLoaderTestCase(TestCase):
             self.assertEqual(key[1], fixture._name)
             self.assertIsInstance(fixture, BaseFixture)
 
+    def test_release_fixture(self):
+        """
+        Case: A loaded fixture get released
+        Expected: It is only instantiated again when it is requested
+        """
+        self.loader.load_disk()
+        node = ("app_one", "001_load_some_data")
+        fixture = self.loader.disk_fixtures[node]
+
+        with mock.patch.object(
+            self.loader, "load_fixture", wraps=self.loader.load_fixture
+        ) as load_fixture_mock:
+            self.loader.release_fixture(node)
+            self.assertFalse(load_fixture_mock.called)
+            self.assertIn(node, self.loader.disk_fixtures)
+
+            released = self.loader.disk_fixtures[node]
+            load_fixture_mock.assert_called_once_with(node)
+
+        self.assertIsNot(released, fixture)
+        self.assertIsInstance(released, type(fixture))
+        self.assertIs(self.loader.disk_fixtures.get(node), released)
+
+    def test_get_fixture_hash(self):
+        """
+        Case: The hash of a fixture get requested
+        Expected: The hash of the source file is returned
+        """
+        self.loader.load_disk()
+        node = ("app_one", "001_load_some_data")
+
+        with open(self.loader.fixture_files[node], "rb") as fixture_file:
+            expected = hashlib.sha256(fixture_file.read()).hexdigest()
+
+        self.assertEqual(self.loader.get_fixture_hash(node), expected)
+
+    @override_settings(INSTALLED_APPS=["app_one", "dynamic_fixtures"])
+    @mock.patch("dynamic_fixtures.fixtures.loader.logger")
+    @mock.patch("dynamic_fixtures.fixtures.loader.import_module", wraps=import_module)
+    def test_skip_own_package(self, import_module_mock, logger_mock):
+        """
+        Case: Fixtures get loaded with this package in the installed apps
+        Expected: The modules of the package itself are not imported as
+                  fixtures.
+        """
+        self.loader.load_disk()
+
+        self.assertSetEqual(
+            set(self.loader.disk_fixtures),
+            {("app_one", "001_load_some_data"), ("app_one", "002_load_other_data")},
+        )
+        imported = [call[1][0] for call in import_module_mock.mock_calls]
+        self.assertFalse(
+            [name for name in imported if name.startswith("dynamic_fixtures.")]
+        )
+        self.assertFalse(logger_mock.error.called)
+
     @override_settings(INSTALLED_APPS=["app_broken_fixture"])
     @mock.patch("dynamic_fixtures.fixtures.loader.logger")
     def test_no_fixture_class(self, logger_mock):
@@ -87,3 +149,263 @@ class FixturesLoaderTestCase(TestCase):
         """
         self.loader.load_disk()
         self.assertDictEqual(self.loader.disk_fixtures, {})
+
+
+@override_settings(
+    INSTALLED_APPS=["app_one", "app_two", "app_three", "app_broken_fixture"]
+)
+class LazyFixturesLoaderTestCase(TestCase):
+    def setUp(self):
+        self.loader = Loader(lazy=True)
+
+    @mock.patch("dynamic_fixtures.fixtures.loader.import_module", wraps=import_module)
+    def test_load_disk(self, import_module_mock):
+        """
+        Case: Fixtures get discovered by a lazy loader
+        Expected: All fixtures are available but no fixture module is imported
+        """
+        self.loader.load_disk()
+
+        self.assertSetEqual(
+            set(self.loader.disk_fixtures),
+            {
+                ("app_one", "001_load_some_data"),
+                ("app_one", "002_load_other_data"),
+                ("app_two", "001_load_some_data"),
+                ("app_three", "001_load_base_data"),
+                ("app_three", "002_load_dependent_data"),
+                ("app_broken_fixture", "003_empty_fixture"),
+            },
+        )
+        imported = [call[1][0] for call in import_module_mock.mock_calls]
+        self.assertNotIn("app_one.fixtures.001_load_some_data", imported)
+
+    def test_get_fixture(self):
+        """
+        Case: A fixture get requested from a lazy loader
+        Expected: Only the requested fixture get imported
+        """
+        self.loader.load_disk()
+
+        fixture = self.loader.disk_fixtures["app_three", "002_load_dependent_data"]
+
+        from dynamic_fixtures.fixtures.basefixture import BaseFixture
+
+        self.assertIsInstance(fixture, BaseFixture)
+        self.assertEqual(fixture._name, "002_load_dependent_data")
+        self.assertTrue(
+            self.loader.disk_fixtures.is_loaded(
+                ("app_three", "002_load_dependent_data")
+            )
+        )
+        self.assertFalse(
+            self.loader.disk_fixtures.is_loaded(("app_three", "001_load_base_data"))
+        )
+        self.assertListEqual(
+            self.loader.get_dependencies(("app_three", "002_load_dependent_data")),
+            [("app_three", "001_load_base_data")],
+        )
+
+    def test_release_fixture(self):
+        """
+        Case: A fixture get released from a lazy loader
+        Expected: It is instantiated again when it is requested
+        """
+        self.loader.load_disk()
+        node = ("app_three", "002_load_dependent_data")
+        fixture = self.loader.disk_fixtures[node]
+
+        self.loader.release_fixture(node)
+
+        self.assertFalse(self.loader.disk_fixtures.is_loaded(node))
+        self.assertIsNot(self.loader.disk_fixtures[node], fixture)
+
+    @mock.patch("dynamic_fixtures.fixtures.loader.logger")
+    def test_no_fixture_class(self, logger_mock):
+        """
+        Case: A fixture without fixture class get requested from a lazy loader
+        Expected: The error is logged and the fixture is left out
+        """
+        self.loader.load_disk()
+        node = ("app_broken_fixture", "003_empty_fixture")
+
+        with self.assertRaises(KeyError):
+            self.loader.disk_fixtures[node]
+
+        self.assertNotIn(node, set(self.loader.disk_fixtures))
+        self.assertEqual(len(self.loader.disk_fixtures), 5)
+        logger_mock.error.assert_called_once_with(
+            "Fixture 003_empty_fixture in app app_broken_fixture has no Fixture class"
+        )
+
+    def test_unknown_fixture(self):
+        """
+        Case: An unknown fixture get requested from a lazy loader
+        Expected: A KeyError get raised
+        """
+        self.loader.load_disk()
+
+        with self.assertRaises(KeyError):
+            self.loader.disk_fixtures["app_one", "999_unknown"]
+
+
+@override_settings(INSTALLED_APPS=["app_one", "app_two", "app_three"])
+class CachedLoaderTestCase(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def test_cache_implies_lazy(self):
+        """
+        Case: A loader get initialized with a cache directory
+        Expected: The loader is lazy
+        """
+        self.assertTrue(Loader(cache_dir=self.cache_dir).lazy)
+
+    def test_dependencies_from_cache(self):
+        """
+        Case: Dependencies get requested for a second time
+        Expected: The dependencies are read from the manifest without importing
+                  the fixture.
+        """
+        node = ("app_three", "002_load_dependent_data")
+        loader = Loader(cache_dir=self.cache_dir)
+        loader.load_disk()
+        self.assertListEqual(
+            loader.get_dependencies(node), [("app_three", "001_load_base_data")]
+        )
+        loader.save_cache()
+
+        loader = Loader(cache_dir=self.cache_dir)
+        loader.load_disk()
+        with mock.patch.object(loader, "load_fixture") as load_fixture_mock:
+            self.assertListEqual(
+                loader.get_dependencies(node), [("app_three", "001_load_base_data")]
+            )
+        self.assertFalse(load_fixture_mock.called)
+
+    def test_changed_fixture_file(self):
+        """
+        Case: Dependencies get requested for a fixture file which changed since
+              the manifest was written.
+        Expected: The fixture get imported again
+        """
+        node = ("app_three", "002_load_dependent_data")
+        loader = Loader(cache_dir=self.cache_dir)
+        loader.load_disk()
+        loader.get_dependencies(node)
+        loader.save_cache()
+
+        loader = Loader(cache_dir=self.cache_dir)
+        loader.load_disk()
+        with mock.patch.object(
+            loader, "get_fixture_stamp", return_value=[0, 0]
+        ), mock.patch.object(
+            loader, "load_fixture", wraps=loader.load_fixture
+        ) as load_fixture_mock:
+            self.assertListEqual(
+                loader.get_dependencies(node), [("app_three", "001_load_base_data")]
+            )
+        load_fixture_mock.assert_called_once_with(node)
+
+    @override_settings(INSTALLED_APPS=["app_three", "app_broken_fixture"])
+    @mock.patch("dynamic_fixtures.fixtures.loader.logger")
+    def test_no_fixture_class_from_cache(self, logger_mock):
+        """
+        Case: A module without Fixture class get discovered for a second time
+        Expected: It is left out according to the manifest, without importing
+                  it.
+        """
+        node = ("app_broken_fixture", "003_empty_fixture")
+        loader = Loader(cache_dir=self.cache_dir)
+        loader.load_disk()
+        with self.assertRaises(KeyError):
+            loader.get_dependencies(node)
+        loader.save_cache()
+
+        loader = Loader(cache_dir=self.cache_dir)
+        with mock.patch.object(loader, "load_fixture") as load_fixture_mock:
+            loader.load_disk()
+            self.assertNotIn(node, set(loader.disk_fixtures))
+            self.assertEqual(len(loader.disk_fixtures), 2)
+            with self.assertRaises(KeyError):
+                loader.get_dependencies(node)
+        self.assertFalse(load_fixture_mock.called)
+        self.assertEqual(logger_mock.error.call_count, 2)
+
+    def test_corrupt_manifest(self):
+        """
+        Case: The manifest in the cache directory is not valid
+        Expected: The manifest is ignored
+        """
+        with open(os.path.join(self.cache_dir, "manifest.json"), "w") as manifest:
+            manifest.write("{not json")
+
+        loader = Loader(cache_dir=self.cache_dir)
+        loader.load_disk()
+        self.assertListEqual(
+            loader.get_dependencies(("app_three", "002_load_dependent_data")),
+            [("app_three", "001_load_base_data")],
+        )
+
+
+@override_settings(
+    INSTALLED_APPS=["app_one", "app_two", "app_three", "app_broken_fixture"]
+)
+class PrefetchLoaderTestCase(TestCase):
+    @mock.patch("dynamic_fixtures.fixtures.loader.logger")
+    def test_prefetch_lazy(self, logger_mock):
+        """
+        Case: A lazy loader prefetches the fixture modules in worker processes
+        Expected: The dependencies are known without importing the fixtures
+        """
+        loader = Loader(lazy=True, import_workers=2)
+        loader.load_disk()
+
+        node = ("app_three", "002_load_dependent_data")
+        self.assertListEqual(
+            loader.get_dependencies(node), [("app_three", "001_load_base_data")]
+        )
+        self.assertFalse(loader.disk_fixtures.is_loaded(node))
+        logger_mock.error.assert_called_once_with(
+            "Fixture 003_empty_fixture in app app_broken_fixture has no Fixture class"
+        )
+
+    def test_prefetch_eager(self):
+        """
+        Case: An eager loader prefetches the fixture modules in worker processes
+        Expected: The fixtures are imported afterwards
+        """
+        loader = Loader(import_workers=2)
+        loader.load_disk()
+
+        self.assertSetEqual(
+            set(loader.disk_fixtures),
+            {
+                ("app_one", "001_load_some_data"),
+                ("app_one", "002_load_other_data"),
+                ("app_two", "001_load_some_data"),
+                ("app_three", "001_load_base_data"),
+                ("app_three", "002_load_dependent_data"),
+            },
+        )
+
+    def test_prefetch_import_error(self):
+        """
+        Case: A fixture module can't be imported in a worker process
+        Expected: An error get raised for all broken modules
+        """
+        loader = Loader(lazy=True, import_workers=2)
+        with mock.patch(
+            "dynamic_fixtures.fixtures.loader.ProcessPoolExecutor"
+        ) as executor_mock:
+            executor_mock.return_value.__enter__.return_value.map.side_effect = (
+                lambda function, modules: [(None, "SyntaxError: invalid")]
+                * len(modules)
+            )
+            with self.assertRaises(BadFixtureError) as e:
+                loader.load_disk()
+
+        self.assertIn(
+            "app_one.001_load_some_data (SyntaxError: invalid)", str(e.exception)
+        )
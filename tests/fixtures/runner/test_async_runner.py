@@ -0,0 +1,129 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from dynamic_fixtures.fixtures.async_runner import AsyncLoadFixtureRunner
+from dynamic_fixtures.fixtures.basefixture import BaseFixture
+from dynamic_fixtures.fixtures.loader import Loader
+
+
+class AsyncLoadFixtureRunnerTestCase(TestCase):
+    def setUp(self):
+        self.events = []
+        events = self.events
+
+        class SlowFixture(BaseFixture):
+            async def load(self):
+                events.append(("start", self._name))
+                await asyncio.sleep(0.01)
+                events.append(("end", self._name))
+
+        class GroupFixture(BaseFixture):
+            dependencies = [("app", "slow_one"), ("app", "slow_two")]
+
+            def load(self):
+                events.append(("sync", self._name))
+                Group.objects.create(name="async")
+
+        loader = mock.MagicMock(spec=Loader)
+        loader.disk_fixtures = {
+            ("app", "slow_one"): SlowFixture("slow_one", "app"),
+            ("app", "slow_two"): SlowFixture("slow_two", "app"),
+            ("app", "groups"): GroupFixture("groups", "app"),
+        }
+        self.runner = AsyncLoadFixtureRunner(loader=loader)
+
+    def test_load_fixtures(self):
+        """
+        Case: Fixtures get loaded with the async runner
+        Expected: Independent async fixtures overlap, dependent fixtures wait
+        """
+        callback = mock.Mock(return_value=None)
+
+        count = async_to_sync(self.runner.aload_fixtures)(progress_callback=callback)
+
+        self.assertEqual(count, 3)
+        self.assertListEqual(
+            self.events,
+            [
+                ("start", "slow_one"),
+                ("start", "slow_two"),
+                ("end", "slow_one"),
+                ("end", "slow_two"),
+                ("sync", "groups"),
+            ],
+        )
+        self.assertTrue(Group.objects.filter(name="async").exists())
+        callback.assert_called_with("load_success", ("app", "groups"), mock.ANY)
+
+    def test_concurrency(self):
+        """
+        Case: Fixtures get loaded with a concurrency of one
+        Expected: Fixtures are loaded one after another
+        """
+        async_to_sync(self.runner.aload_fixtures)(concurrency=1)
+
+        self.assertListEqual(
+            self.events[:4],
+            [
+                ("start", "slow_one"),
+                ("end", "slow_one"),
+                ("start", "slow_two"),
+                ("end", "slow_two"),
+            ],
+        )
+
+    def test_dry_run(self):
+        """
+        Case: Fixtures get loaded in dry-run mode
+        Expected: The changes are rolled back
+        """
+        async_to_sync(self.runner.aload_fixtures)(dry_run=True)
+
+        self.assertEqual(len(self.events), 5)
+        self.assertFalse(Group.objects.filter(name="async").exists())
+
+    def test_thread_sensitive(self):
+        """
+        Case: Fixtures get loaded with the async runner
+        Expected: All database work runs thread sensitive, e.g. on the thread
+                  and connection of the transaction.
+        """
+        with mock.patch(
+            "dynamic_fixtures.fixtures.async_runner.sync_to_async",
+            wraps=sync_to_async,
+        ) as sync_to_async_mock:
+            async_to_sync(self.runner.aload_fixtures)(dry_run=True)
+
+        self.assertTrue(sync_to_async_mock.called)
+        for call in sync_to_async_mock.call_args_list:
+            self.assertIs(call[1].get("thread_sensitive"), True)
+
+    def test_bulk_and_get_object(self):
+        """
+        Case: An async fixture adds more instances than its batch size and
+              looks up an object which isn't registered
+        Expected: The instances are inserted when the fixture is done and the
+                  object is queried outside of the event loop
+        """
+        Group.objects.create(name="existing")
+        found = []
+
+        class BulkFixture(BaseFixture):
+            bulk_batch_size = 2
+
+            async def load(self):
+                found.append(await self.aget_object(Group, name="existing"))
+                for index in range(5):
+                    self.bulk.add(Group(name="bulk-%s" % index))
+
+        loader = mock.MagicMock(spec=Loader)
+        loader.disk_fixtures = {("app", "bulk"): BulkFixture("bulk", "app")}
+        runner = AsyncLoadFixtureRunner(loader=loader)
+
+        async_to_sync(runner.aload_fixtures)()
+
+        self.assertEqual(found[0].name, "existing")
+        self.assertEqual(Group.objects.filter(name__startswith="bulk-").count(), 5)
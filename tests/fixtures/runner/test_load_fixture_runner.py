@@ -1,10 +1,32 @@
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
 from unittest import TestCase, mock
 
-from dynamic_fixtures.fixtures.exceptions import FixtureNotFound, MultipleFixturesFound
-from dynamic_fixtures.fixtures.loader import Graph
+from django.contrib.auth.models import Group
+from django.test import TestCase as DjangoTestCase
+from django.test.utils import override_settings
+from dynamic_fixtures.fixtures.basefixture import BaseFixture
+from dynamic_fixtures.fixtures.exceptions import (
+    FixtureNotFound,
+    MultipleFixturesFound,
+    UnsupportedOptionsError,
+)
+from dynamic_fixtures.fixtures.loader import Graph, Loader
+from dynamic_fixtures.fixtures.profiler import MemoryTracker
+from dynamic_fixtures.fixtures.recorder import CheckpointRecorder
 from dynamic_fixtures.fixtures.runner import LoadFixtureRunner
 from tests.mixins import MockTestCaseMixin
 
+# Make sure the test apps can be imported
+sys.path.append(
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "loader", "apps"
+    )
+)
+
 
 class LoadFixtureRunnerTestCase(MockTestCaseMixin, TestCase):
     def setUp(self):
@@ -147,6 +169,77 @@ class LoadFixtureRunnerTestCase(MockTestCaseMixin, TestCase):
             str(e.exception),
         )
 
+    def test_get_fixture_node_memoized(self):
+        """
+        Case: The same fixture prefix get requested twice
+        Expected: The app nodes are indexed and matched only once
+        """
+        runner = LoadFixtureRunner()
+        runner.get_app_nodes = mock.MagicMock(
+            return_value=[
+                ("app_one", "0003_my_other_fixture"),
+                ("app_one", "0001_my_fixture"),
+                ("app_one", "0002_my_other_fixture"),
+            ]
+        )
+
+        for _ in range(2):
+            self.assertListEqual(
+                runner.get_fixture_node(app_label="app_one", fixture_prefix="0002"),
+                [("app_one", "0002_my_other_fixture")],
+            )
+        self.assertListEqual(
+            runner.find_fixture_nodes(app_label="app_one", fixture_prefix="000"),
+            [
+                ("app_one", "0001_my_fixture"),
+                ("app_one", "0002_my_other_fixture"),
+                ("app_one", "0003_my_other_fixture"),
+            ],
+        )
+        runner.get_app_nodes.assert_called_once_with(app_label="app_one")
+
+    def test_get_fixture_nodes_bulk(self):
+        """
+        Case: Multiple fixtures get requested at once
+        Expected: The nodes get returned in the requested order
+        """
+        runner = LoadFixtureRunner()
+        graph = self.graph_mock()
+        graph.nodes = [
+            ("app_one", "0001_foo"),
+            ("app_one", "0002_bar"),
+            ("app_two", "0001_foo"),
+        ]
+        runner._graph = graph
+
+        nodes = runner.get_fixture_nodes(
+            [("app_two", "0001"), ("app_one", "0002"), ("app_one", "0001")]
+        )
+
+        self.assertListEqual(
+            nodes,
+            [("app_two", "0001_foo"), ("app_one", "0002_bar"), ("app_one", "0001_foo")],
+        )
+        with self.assertRaises(FixtureNotFound):
+            runner.get_fixture_nodes([("app_three", "0001")])
+
+    def test_refresh(self):
+        """
+        Case: The runner get refreshed
+        Expected: The fixtures are discovered again and the indexes rebuilt
+        """
+        runner = LoadFixtureRunner()
+        graph = self.graph_mock()
+        graph.nodes = [("app_one", "0001_foo")]
+        runner._graph = graph
+        runner.get_fixture_node(app_label="app_one", fixture_prefix="0001")
+
+        runner.refresh()
+
+        self.assertEqual(self.loader_mock.return_value.load_disk.call_count, 2)
+        self.assertIsNone(runner._graph)
+        self.assertDictEqual(runner._matches, {})
+
     def test_load_fixtures_return_value_two_fixtures(self):
         """
         Case: Two fictures get loaded
@@ -261,3 +354,711 @@ class LoadFixtureRunnerTestCase(MockTestCaseMixin, TestCase):
                 ("app_two", "0001_my_other_fixture")
             ].load.called
         )
+
+    def test_load_fixtures_parallel(self):
+        """
+        Case: Fixtures get loaded with multiple workers
+        Expected: Every fixture get loaded, dependencies first
+        """
+        connections_mock = self.setup_mock(
+            "dynamic_fixtures.fixtures.runner.connections"
+        )
+        runner = LoadFixtureRunner()
+        runner._graph = Graph()
+        for node in [("app_one", "0001"), ("app_two", "0001"), ("app_one", "0002")]:
+            runner._graph.add_node(node)
+        runner._graph.add_dependency(("app_one", "0002"), ("app_one", "0001"))
+        runner._graph.add_dependency(("app_one", "0002"), ("app_two", "0001"))
+
+        loaded = []
+        serial_fixture = mock.MagicMock(parallel=False)
+        serial_fixture.load.side_effect = lambda: loaded.append("serial")
+        runner.loader = self.loader_mock()
+        runner.loader.disk_fixtures = {
+            ("app_one", "0001"): mock.MagicMock(parallel=True),
+            ("app_two", "0001"): serial_fixture,
+            ("app_one", "0002"): mock.MagicMock(parallel=True),
+        }
+        runner.loader.disk_fixtures[("app_one", "0002")].load.side_effect = (
+            lambda: loaded.append("last")
+        )
+
+        call_back = mock.Mock(return_value=None)
+
+        self.assertEqual(
+            runner.load_fixtures(progress_callback=call_back, workers=2), 3
+        )
+
+        for fixture_mock in runner.loader.disk_fixtures.values():
+            fixture_mock.load.assert_called_once_with()
+        self.assertListEqual(loaded, ["serial", "last"])
+        self.assertEqual(call_back.call_count, 6)
+        starts = [c[0][1] for c in call_back.call_args_list if c[0][0] == "load_start"]
+        self.assertEqual(starts[-1], ("app_one", "0002"))
+        call_back.assert_called_with("load_success", ("app_one", "0002"), mock.ANY)
+        self.assertEqual(connections_mock.close_all.call_count, 2)
+
+    def test_load_fixtures_parallel_dry_run(self):
+        """
+        Case: Fixtures get loaded in parallel in dry-run mode
+        Expected: An error get raised, the changes can't be rolled back
+        """
+        runner = LoadFixtureRunner()
+
+        with self.assertRaises(UnsupportedOptionsError):
+            runner.load_fixtures(dry_run=True, workers=2)
+
+    def test_load_fixtures_bulk(self):
+        """
+        Case: A fixture adds instances to its bulk collector
+        Expected: The collector get flushed and the rows are reported
+        """
+        bulk_collector_mock = self.setup_mock(
+            "dynamic_fixtures.fixtures.runner.BulkCollector"
+        )
+        bulk_collector_mock.return_value.rows = 10
+        bulk_collector_mock.return_value.flush_time = 0.5
+
+        runner = LoadFixtureRunner()
+        runner._graph = self.graph_mock()
+        runner._graph.resolve_node.return_value = [("app_one", "0001_my_fixture")]
+        runner.loader = self.loader_mock()
+        fixture = mock.MagicMock(bulk_batch_size=500)
+        runner.loader.disk_fixtures = {("app_one", "0001_my_fixture"): fixture}
+
+        call_back = mock.Mock(return_value=None)
+
+        runner.load_fixtures(progress_callback=call_back)
+
+        bulk_collector_mock.assert_called_once_with(batch_size=500, using="default")
+        self.assertEqual(fixture.bulk, bulk_collector_mock.return_value)
+        fixture.bulk.flush.assert_called_once_with()
+        call_back.assert_called_with(
+            "bulk_flush", ("app_one", "0001_my_fixture"), 0.5, rows=10
+        )
+
+    def test_load_fixtures_bulk_old_callback(self):
+        """
+        Case: A fixture inserts rows in bulk, the callback doesn't take rows
+        Expected: The callback doesn't get the bulk_flush event
+        """
+        bulk_collector_mock = self.setup_mock(
+            "dynamic_fixtures.fixtures.runner.BulkCollector"
+        )
+        bulk_collector_mock.return_value.rows = 10
+
+        runner = LoadFixtureRunner()
+        runner._graph = self.graph_mock()
+        runner._graph.resolve_node.return_value = [("app_one", "0001_my_fixture")]
+        runner.loader = self.loader_mock()
+        runner.loader.disk_fixtures = {
+            ("app_one", "0001_my_fixture"): mock.MagicMock(bulk_batch_size=500)
+        }
+        calls = []
+
+        def call_back(action, node, elapsed_time=None):
+            calls.append(action)
+
+        runner.load_fixtures(progress_callback=call_back)
+
+        self.assertListEqual(calls, ["load_start", "load_success"])
+
+    def test_get_node_hashes(self):
+        """
+        Case: The hashes of a plan get requested
+        Expected: The hash of a node changes when a dependency changes
+        """
+        runner = LoadFixtureRunner()
+        runner._graph = Graph()
+        runner._graph.add_node("a")
+        runner._graph.add_node("b")
+        runner._graph.add_dependency("b", "a")
+        runner.loader = self.loader_mock()
+        sources = {"a": "1", "b": "2"}
+        runner.loader.get_fixture_hash.side_effect = lambda node: sources[node]
+
+        hashes = runner.get_node_hashes(["a", "b"])
+
+        sources["a"] = "3"
+        changed_hashes = runner.get_node_hashes(["a", "b"])
+        self.assertNotEqual(hashes["a"], changed_hashes["a"])
+        self.assertNotEqual(hashes["b"], changed_hashes["b"])
+
+    def test_load_fixtures_incremental(self):
+        """
+        Case: Fixtures get loaded in incremental mode
+        Expected: Only the fixtures with a changed hash get loaded and recorded
+        """
+        recorder_mock = self.setup_mock(
+            "dynamic_fixtures.fixtures.runner.FixtureRecorder"
+        )
+        runner = LoadFixtureRunner()
+        runner._graph = self.graph_mock()
+        runner._graph.resolve_node.return_value = [
+            ("app_one", "0001_my_fixture"),
+            ("app_one", "0002_my_other_fixture"),
+        ]
+        runner.loader = self.loader_mock()
+        runner.loader.disk_fixtures = {
+            ("app_one", "0001_my_fixture"): mock.MagicMock(),
+            ("app_one", "0002_my_other_fixture"): mock.MagicMock(),
+        }
+        runner.get_node_hashes = mock.MagicMock(
+            return_value={
+                ("app_one", "0001_my_fixture"): "unchanged",
+                ("app_one", "0002_my_other_fixture"): "changed",
+            }
+        )
+        recorder_mock.return_value.applied_hashes.return_value = {
+            ("app_one", "0001_my_fixture"): "unchanged",
+            ("app_one", "0002_my_other_fixture"): "old",
+        }
+
+        self.assertEqual(runner.load_fixtures(incremental=True), 1)
+
+        self.assertFalse(
+            runner.loader.disk_fixtures[("app_one", "0001_my_fixture")].load.called
+        )
+        runner.loader.disk_fixtures[
+            ("app_one", "0002_my_other_fixture")
+        ].load.assert_called_once_with()
+        recorder_mock.return_value.record_applied.assert_called_once_with(
+            ("app_one", "0002_my_other_fixture"), "changed"
+        )
+
+    def test_load_fixtures_incremental_parallel(self):
+        """
+        Case: Fixtures get loaded in incremental mode with multiple workers
+              while the dependency of a changed fixture is unchanged
+        Expected: Only the changed fixture get loaded
+        """
+        self.setup_mock("dynamic_fixtures.fixtures.runner.connections")
+        recorder_mock = self.setup_mock(
+            "dynamic_fixtures.fixtures.runner.FixtureRecorder"
+        )
+        runner = LoadFixtureRunner()
+        runner._graph = Graph()
+        runner._graph.add_node(("app_one", "0001"))
+        runner._graph.add_node(("app_one", "0002"))
+        runner._graph.add_dependency(("app_one", "0002"), ("app_one", "0001"))
+        runner.loader = self.loader_mock()
+        runner.loader.disk_fixtures = {
+            ("app_one", "0001"): mock.MagicMock(parallel=True),
+            ("app_one", "0002"): mock.MagicMock(parallel=True),
+        }
+        runner.get_node_hashes = mock.MagicMock(
+            return_value={("app_one", "0001"): "unchanged", ("app_one", "0002"): "new"}
+        )
+        recorder_mock.return_value.applied_hashes.return_value = {
+            ("app_one", "0001"): "unchanged",
+            ("app_one", "0002"): "old",
+        }
+
+        self.assertEqual(runner.load_fixtures(incremental=True, workers=2), 1)
+
+        self.assertFalse(runner.loader.disk_fixtures[("app_one", "0001")].load.called)
+        runner.loader.disk_fixtures[("app_one", "0002")].load.assert_called_once_with()
+
+    def test_load_fixtures_snapshot_restore(self):
+        """
+        Case: Fixtures get loaded while a snapshot of the plan exists
+        Expected: The snapshot get restored instead of loading the fixtures
+        """
+        snapshot_store_mock = self.setup_mock(
+            "dynamic_fixtures.fixtures.runner.SnapshotStore"
+        )
+        snapshot_store_mock.return_value.exists.return_value = True
+
+        runner = LoadFixtureRunner()
+        runner._graph = self.graph_mock()
+        runner._graph.resolve_node.return_value = [("app_one", "0001_my_fixture")]
+        runner.loader = self.loader_mock()
+        runner.loader.disk_fixtures = {("app_one", "0001_my_fixture"): mock.MagicMock()}
+        runner.get_node_hashes = mock.MagicMock(
+            return_value={("app_one", "0001_my_fixture"): "abc"}
+        )
+
+        self.assertEqual(runner.load_fixtures(snapshot_dir="/tmp/snapshots"), 1)
+
+        snapshot_store_mock.assert_called_once_with("/tmp/snapshots", using="default")
+        snapshot_store_mock.return_value.get_key.assert_called_once_with(
+            {("app_one", "0001_my_fixture"): "abc"}
+        )
+        snapshot_store_mock.return_value.restore.assert_called_once_with(
+            snapshot_store_mock.return_value.get_key.return_value
+        )
+        self.assertFalse(
+            runner.loader.disk_fixtures[("app_one", "0001_my_fixture")].load.called
+        )
+
+    def test_load_fixtures_snapshot_save(self):
+        """
+        Case: Fixtures get loaded while no snapshot of the plan exists
+        Expected: The fixtures get loaded and a snapshot is saved
+        """
+        snapshot_store_mock = self.setup_mock(
+            "dynamic_fixtures.fixtures.runner.SnapshotStore"
+        )
+        snapshot_store_mock.return_value.exists.return_value = False
+
+        runner = LoadFixtureRunner()
+        runner._graph = self.graph_mock()
+        runner._graph.resolve_node.return_value = [("app_one", "0001_my_fixture")]
+        runner.loader = self.loader_mock()
+        runner.loader.disk_fixtures = {("app_one", "0001_my_fixture"): mock.MagicMock()}
+        runner.get_node_hashes = mock.MagicMock(
+            return_value={("app_one", "0001_my_fixture"): "abc"}
+        )
+
+        runner.load_fixtures(snapshot_dir="/tmp/snapshots")
+
+        runner.loader.disk_fixtures[
+            ("app_one", "0001_my_fixture")
+        ].load.assert_called_once_with()
+        snapshot_store_mock.return_value.save.assert_called_once_with(
+            snapshot_store_mock.return_value.get_key.return_value
+        )
+
+    def test_load_fixtures_commit_every(self):
+        """
+        Case: Fixtures get loaded while committing in chunks
+        Expected: The fixtures are not loaded in one transaction and the bulk
+                  collectors use the chunk size.
+        """
+        bulk_collector_mock = self.setup_mock(
+            "dynamic_fixtures.fixtures.runner.BulkCollector"
+        )
+        runner = LoadFixtureRunner()
+        runner._graph = self.graph_mock()
+        runner._graph.resolve_node.return_value = [("app_one", "0001_my_fixture")]
+        runner.loader = self.loader_mock()
+        fixture = mock.MagicMock(bulk_batch_size=500)
+        runner.loader.disk_fixtures = {("app_one", "0001_my_fixture"): fixture}
+
+        self.assertEqual(runner.load_fixtures(commit_every=100), 1)
+
+        fixture.load.assert_called_once_with()
+        bulk_collector_mock.assert_called_once_with(batch_size=100, using="default")
+        self.assertFalse(self.transaction_mock.atomic.called)
+
+    def test_load_fixtures_commit_every_dry_run(self):
+        """
+        Case: Fixtures get loaded in dry-run mode while committing in chunks
+        Expected: An error get raised, the changes can't be rolled back
+        """
+        runner = LoadFixtureRunner()
+
+        with self.assertRaises(UnsupportedOptionsError):
+            runner.load_fixtures(dry_run=True, commit_every=100)
+
+    def test_load_fixtures_databases(self):
+        """
+        Case: Fixtures get loaded in a given database while one fixture sets
+              its own database.
+        Expected: A transaction is opened for both databases and every fixture
+                  is loaded in its own database.
+        """
+        runner = LoadFixtureRunner()
+        runner._graph = self.graph_mock()
+        runner._graph.resolve_node.return_value = [
+            ("app_one", "0001_my_fixture"),
+            ("app_two", "0001_my_fixture"),
+        ]
+
+        class ReplicaFixture(BaseFixture):
+            database = "replica"
+
+            def load(self):
+                pass
+
+        runner.loader = self.loader_mock()
+        runner.loader.disk_fixtures = {
+            ("app_one", "0001_my_fixture"): mock.MagicMock(),
+            ("app_two", "0001_my_fixture"): ReplicaFixture("0001", "app_two"),
+        }
+
+        runner.load_fixtures(database="other")
+
+        self.transaction_mock.atomic.assert_has_calls(
+            [mock.call(using="other"), mock.call(using="replica")], any_order=True
+        )
+        self.assertEqual(
+            runner.loader.disk_fixtures[("app_one", "0001_my_fixture")].database,
+            "other",
+        )
+        self.assertEqual(
+            runner.loader.disk_fixtures[("app_two", "0001_my_fixture")].bulk.using,
+            "replica",
+        )
+
+    def test_get_shard(self):
+        """
+        Case: A plan get split in shards
+        Expected: Every component is in exactly one shard, balanced on duration
+        """
+        runner = LoadFixtureRunner()
+        runner._graph = Graph()
+        for node in ["a", "b", "c", "d", "e"]:
+            runner._graph.add_node(node)
+        runner._graph.add_dependency("b", "a")
+        runner._graph.add_dependency("d", "c")
+        plan = runner._graph.resolve_node()
+
+        durations = {"a": 5.0, "b": 5.0, "c": 4.0, "d": 4.0, "e": 3.0}
+        shards = [runner.get_shard(plan, index, 2, durations) for index in (1, 2)]
+
+        self.assertListEqual(shards, [["a", "b"], ["c", "d", "e"]])
+        self.assertListEqual(runner.get_shard(plan, 1, 1), plan)
+        self.assertListEqual(runner.get_shard(plan, 3, 4), ["e"])
+        self.assertListEqual(runner.get_shard(plan, 4, 4), [])
+
+        with self.assertRaises(ValueError):
+            runner.get_shard(plan, 3, 2)
+
+    def test_get_plan_memoized(self):
+        """
+        Case: A plan get requested twice for the same nodes
+        Expected: The graph is only resolved once
+        """
+        self.loader_mock.return_value.disk_fixtures = {}
+        runner = LoadFixtureRunner()
+        graph = self.graph_mock()
+        graph.nodes = {("app", "a"): [], ("app", "b"): [("app", "a")]}
+        graph.resolve_nodes.return_value = [("app", "a"), ("app", "b")]
+        runner._graph = graph
+
+        plan = runner.get_plan(nodes=[("app", "a"), ("app", "b")])
+        plan.append(("app", "c"))
+        compiled = runner.compile_plan(nodes=[("app", "a"), ("app", "b")])
+
+        self.assertListEqual(compiled.plan, [("app", "a"), ("app", "b")])
+        self.assertDictEqual(
+            compiled.dependencies, {("app", "a"): [], ("app", "b"): [("app", "a")]}
+        )
+        graph.resolve_nodes.assert_called_once_with([("app", "a"), ("app", "b")])
+
+    def test_get_plan_memoized_order(self):
+        """
+        Case: Plans get requested for the same nodes in another order
+        Expected: Every order is resolved, so the plan doesn't depend on the
+                  plans requested before
+        """
+        self.loader_mock.return_value.disk_fixtures = {}
+        runner = LoadFixtureRunner()
+        graph = self.graph_mock()
+        graph.nodes = {("app", "a"): [], ("app", "b"): []}
+        graph.resolve_nodes.side_effect = lambda nodes: list(nodes)
+        runner._graph = graph
+
+        runner.get_plan(nodes=[("app", "a"), ("app", "b")])
+
+        self.assertListEqual(
+            runner.get_plan(nodes=[("app", "b"), ("app", "a")]),
+            [("app", "b"), ("app", "a")],
+        )
+
+    def test_get_plan_evicted(self):
+        """
+        Case: More plans get requested than fit in the cache
+        Expected: The least recently used plan gets resolved again
+        """
+        self.loader_mock.return_value.disk_fixtures = {}
+        runner = LoadFixtureRunner()
+        runner.plan_cache_size = 1
+        graph = self.graph_mock()
+        graph.nodes = {("app", "a"): [], ("app", "b"): []}
+        graph.resolve_nodes.side_effect = lambda nodes: list(nodes)
+        runner._graph = graph
+
+        runner.get_plan(nodes=[("app", "a")])
+        runner.get_plan(nodes=[("app", "b")])
+        runner.get_plan(nodes=[("app", "a")])
+
+        self.assertEqual(graph.resolve_nodes.call_count, 3)
+
+    def test_graph_empty(self):
+        """
+        Case: The graph of a runner without fixtures get requested twice
+        Expected: The empty graph is not rebuilt
+        """
+        self.graph_mock.side_effect = Graph
+        self.loader_mock.return_value.disk_fixtures = {}
+        runner = LoadFixtureRunner()
+
+        runner.graph
+        runner.graph
+
+        self.graph_mock.assert_called_once_with()
+
+
+class RunFixtureTestCase(DjangoTestCase):
+    def test_run_generator_fixture(self):
+        """
+        Case: A fixture with a generator as load method get run
+        Expected: The yielded instances get inserted in batches
+        """
+        inserted = []
+
+        class Fixture(BaseFixture):
+            bulk_batch_size = 2
+
+            def load(self):
+                for index in range(3):
+                    yield Group(name="group-%s" % index)
+                    inserted.append(Group.objects.count())
+                yield [Group(name="group-3"), Group(name="group-4")]
+
+        LoadFixtureRunner.run_fixture(Fixture("0001_my_fixture", "app_one"))
+
+        self.assertListEqual(inserted, [0, 2, 2])
+        self.assertEqual(Group.objects.count(), 5)
+
+    def test_resume(self):
+        """
+        Case: A run which commits every fixture fails and is resumed
+        Expected: The fixtures completed before the failure are skipped
+        """
+        failing = [True]
+
+        class FirstFixture(BaseFixture):
+            def load(self):
+                Group.objects.create(name="first")
+
+        class SecondFixture(BaseFixture):
+            dependencies = [("app_one", "0001_first")]
+
+            def load(self):
+                Group.objects.create(name="second")
+                if failing[0]:
+                    raise ValueError("Broken")
+
+        loader = mock.MagicMock(spec=Loader)
+        loader.disk_fixtures = {
+            ("app_one", "0001_first"): FirstFixture("0001_first", "app_one"),
+            ("app_one", "0002_second"): SecondFixture("0002_second", "app_one"),
+        }
+        loader.get_fixture_hash.side_effect = lambda node: node[1]
+        runner = LoadFixtureRunner(loader=loader)
+
+        with self.assertRaises(ValueError):
+            runner.load_fixtures(commit_each=True)
+
+        self.assertListEqual(
+            list(Group.objects.values_list("name", flat=True)), ["first"]
+        )
+        self.assertListEqual(
+            list(CheckpointRecorder().applied_hashes()), [("app_one", "0001_first")]
+        )
+
+        failing[0] = False
+        callback = mock.Mock(return_value=None)
+        self.assertEqual(
+            runner.load_fixtures(resume=True, progress_callback=callback), 1
+        )
+
+        callback.assert_any_call("resume_skip", ("app_one", "0001_first"))
+        self.assertEqual(Group.objects.count(), 2)
+        self.assertEqual(len(CheckpointRecorder().applied_hashes()), 2)
+
+    def test_commit_each_dry_run(self):
+        """
+        Case: Fixtures get loaded committing every fixture in dry-run mode
+        Expected: An error get raised
+        """
+        loader = mock.MagicMock(spec=Loader)
+        loader.disk_fixtures = {}
+        runner = LoadFixtureRunner(loader=loader)
+
+        with self.assertRaises(UnsupportedOptionsError):
+            runner.load_fixtures(resume=True, dry_run=True)
+        with self.assertRaises(UnsupportedOptionsError):
+            runner.load_fixtures(commit_each=True, workers=2)
+
+    def test_registry(self):
+        """
+        Case: A fixture looks up an object returned by its dependency
+        Expected: The object is found without a query and released, with the
+                  fixtures, when no fixture depends on it anymore
+        """
+        test = self
+        found = []
+        registered = []
+
+        class FirstFixture(BaseFixture):
+            def load(self):
+                return [Group.objects.create(name="first")]
+
+        class SecondFixture(BaseFixture):
+            dependencies = [("app_one", "0001_first")]
+
+            def load(self):
+                registered.append(("app_one", "0001_first") in self.registry)
+                with test.assertNumQueries(0):
+                    found.append(self.get_object(Group, name="first"))
+                return [Group.objects.create(name="second")]
+
+        loader = mock.MagicMock(spec=Loader)
+        loader.disk_fixtures = {
+            ("app_one", "0001_first"): FirstFixture("0001_first", "app_one"),
+            ("app_one", "0002_second"): SecondFixture("0002_second", "app_one"),
+        }
+        runner = LoadFixtureRunner(loader=loader)
+
+        released = []
+
+        def complete_node(node, *args):
+            LoadFixtureRunner.complete_node(runner, node, *args)
+            released.append(node not in runner.registry)
+
+        runner.complete_node = complete_node
+        runner.load_fixtures()
+
+        self.assertEqual(found[0], Group.objects.get(name="first"))
+        # The objects of the first fixture stay registered until the second
+        # fixture, which depends on it, is loaded.
+        self.assertListEqual(registered, [True])
+        self.assertListEqual(released, [False, True])
+        self.assertEqual(len(runner.registry), 0)
+        self.assertListEqual(
+            loader.release_fixture.call_args_list,
+            [
+                mock.call(("app_one", "0002_second")),
+                mock.call(("app_one", "0001_first")),
+            ],
+        )
+
+    def test_memory_tracker(self):
+        """
+        Case: Fixtures get loaded with a memory tracker and garbage collection
+        Expected: A step is recorded for every fixture with the fixtures which
+                  were released after it
+        """
+
+        class FirstFixture(BaseFixture):
+            def load(self):
+                self.data = [str(index) * 10 for index in range(10000)]
+
+        class SecondFixture(BaseFixture):
+            dependencies = [("app_one", "0001_first")]
+
+            def load(self):
+                pass
+
+        loader = mock.MagicMock(spec=Loader)
+        loader.disk_fixtures = {
+            ("app_one", "0001_first"): FirstFixture("0001_first", "app_one"),
+            ("app_one", "0002_second"): SecondFixture("0002_second", "app_one"),
+        }
+        runner = LoadFixtureRunner(loader=loader)
+        tracker = MemoryTracker()
+
+        with mock.patch("dynamic_fixtures.fixtures.runner.gc") as gc_mock:
+            runner.load_fixtures(collect_garbage=True, memory_tracker=tracker)
+
+        self.assertEqual(gc_mock.collect.call_count, 2)
+        self.assertListEqual(
+            [(step.node, step.released) for step in tracker.steps],
+            [
+                (("app_one", "0001_first"), []),
+                (
+                    ("app_one", "0002_second"),
+                    [("app_one", "0002_second"), ("app_one", "0001_first")],
+                ),
+            ],
+        )
+        self.assertGreater(tracker.steps[0].peak, 100000)
+        self.assertGreater(tracker.steps[0].retained, 100000)
+        self.assertGreaterEqual(tracker.peak, tracker.steps[0].peak)
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+@override_settings(
+    INSTALLED_APPS=["app_one", "app_two", "app_three", "app_broken_fixture"]
+)
+class LazyLoadFixtureRunnerTestCase(DjangoTestCase):
+    def test_get_plan(self):
+        """
+        Case: A plan get requested from a runner with a lazy loader
+        Expected: Only the fixtures in the plan get imported
+        """
+        runner = LoadFixtureRunner(loader=Loader(lazy=True))
+
+        plan = runner.get_plan(
+            nodes=runner.get_fixture_node(app_label="app_three", fixture_prefix="002")
+        )
+
+        self.assertListEqual(
+            plan,
+            [
+                ("app_three", "001_load_base_data"),
+                ("app_three", "002_load_dependent_data"),
+            ],
+        )
+        self.assertFalse(
+            runner.loader.disk_fixtures.is_loaded(("app_two", "001_load_some_data"))
+        )
+        self.assertFalse(
+            runner.loader.disk_fixtures.is_loaded(
+                ("app_broken_fixture", "003_empty_fixture")
+            )
+        )
+
+    @mock.patch("dynamic_fixtures.fixtures.loader.logger")
+    def test_get_full_plan(self, logger_mock):
+        """
+        Case: The plan of all fixtures get requested from a lazy loader, an
+              app has a fixture module without Fixture class
+        Expected: The module is logged and left out, like an eager loader does
+        """
+        expected = [
+            ("app_one", "001_load_some_data"),
+            ("app_one", "002_load_other_data"),
+            ("app_two", "001_load_some_data"),
+            ("app_three", "001_load_base_data"),
+            ("app_three", "002_load_dependent_data"),
+        ]
+
+        for loader in [Loader(lazy=True), Loader()]:
+            runner = LoadFixtureRunner(loader=loader)
+            self.assertListEqual(sorted(runner.get_plan()), sorted(expected))
+            self.assertListEqual(runner.get_app_nodes("app_broken_fixture"), [])
+
+        plan = runner.get_plan()
+        self.assertLess(
+            plan.index(("app_three", "001_load_base_data")),
+            plan.index(("app_three", "002_load_dependent_data")),
+        )
+        self.assertEqual(logger_mock.error.call_count, 2)
+
+    def test_compile_plan_cached(self):
+        """
+        Case: A plan get requested from a runner with a cache directory
+        Expected: The plan is stored on disk and reused by a next runner
+                  until a fixture file changes
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        nodes = [("app_three", "002_load_dependent_data")]
+        expected = [
+            ("app_three", "001_load_base_data"),
+            ("app_three", "002_load_dependent_data"),
+        ]
+
+        runner = LoadFixtureRunner(loader=Loader(cache_dir=cache_dir))
+        self.assertListEqual(runner.get_plan(nodes=nodes), expected)
+        self.assertEqual(len(os.listdir(os.path.join(cache_dir, "plans"))), 1)
+
+        runner = LoadFixtureRunner(loader=Loader(cache_dir=cache_dir))
+        with mock.patch.object(runner, "resolve_plan") as resolve_mock:
+            self.assertListEqual(runner.get_plan(nodes=nodes), expected)
+        self.assertFalse(resolve_mock.called)
+        self.assertListEqual(runner.graph.nodes[expected[1]], [expected[0]])
+
+        runner = LoadFixtureRunner(loader=Loader(cache_dir=cache_dir))
+        with mock.patch.object(
+            runner.loader, "get_fingerprint", return_value="changed"
+        ), mock.patch.object(
+            runner, "resolve_plan", return_value=expected
+        ) as resolve_mock:
+            runner.get_plan(nodes=nodes)
+        self.assertTrue(resolve_mock.called)
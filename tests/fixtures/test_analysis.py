@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from dynamic_fixtures.fixtures.analysis import PlanAnalysis, read_durations
+from dynamic_fixtures.fixtures.loader import Graph
+
+
+class PlanAnalysisTestCase(TestCase):
+    def setUp(self):
+        """
+        Setup a graph with the following dependencies
+
+        a -> b, c
+        b -> d
+        c -> d
+        d ->
+        e ->
+        """
+        self.graph = Graph()
+        for node in ["a", "b", "c", "d", "e"]:
+            self.graph.add_node(("app", node))
+        self.graph.add_dependency(("app", "a"), ("app", "b"))
+        self.graph.add_dependency(("app", "a"), ("app", "c"))
+        self.graph.add_dependency(("app", "b"), ("app", "d"))
+        self.graph.add_dependency(("app", "c"), ("app", "d"))
+        self.plan = self.graph.resolve_node()
+
+    def test_critical_path(self):
+        """
+        Case: The critical path get requested with durations
+        Expected: The path with the longest total duration is returned
+        """
+        analysis = PlanAnalysis(
+            self.graph,
+            self.plan,
+            durations={
+                ("app", "a"): 1.0,
+                ("app", "b"): 1.0,
+                ("app", "c"): 5.0,
+                ("app", "d"): 2.0,
+                ("app", "e"): 6.0,
+            },
+        )
+        path, total = analysis.get_critical_path()
+        self.assertListEqual(path, [("app", "d"), ("app", "c"), ("app", "a")])
+        self.assertEqual(total, 8.0)
+
+    def test_critical_path_without_durations(self):
+        """
+        Case: The critical path get requested without durations
+        Expected: Every node counts for one second
+        """
+        path, total = PlanAnalysis(self.graph, self.plan).get_critical_path()
+        self.assertEqual(len(path), 3)
+        self.assertEqual(total, 3.0)
+
+    def test_bottlenecks(self):
+        """
+        Case: The bottlenecks get requested
+        Expected: The nodes with the most dependent nodes are returned first
+        """
+        analysis = PlanAnalysis(self.graph, self.plan)
+        self.assertListEqual(
+            analysis.get_bottlenecks(),
+            [(("app", "d"), 3), (("app", "b"), 1), (("app", "c"), 1)],
+        )
+
+    def test_as_dict(self):
+        """
+        Case: The analysis get exported
+        Expected: The levels and edges of the graph are included
+        """
+        data = PlanAnalysis(self.graph, self.plan).as_dict()
+        self.assertListEqual(data["level_widths"], [2, 2, 1])
+        self.assertDictEqual(
+            data["nodes"][3],
+            {
+                "app_label": "app",
+                "fixture": "a",
+                "level": 2,
+                "duration": 1.0,
+                "dependencies": [["app", "b"], ["app", "c"]],
+            },
+        )
+
+    def test_as_dot(self):
+        """
+        Case: The graph get exported as DOT
+        Expected: Every dependency is an edge
+        """
+        dot = PlanAnalysis(self.graph, self.plan).as_dot()
+        self.assertTrue(dot.startswith("digraph fixtures {"))
+        self.assertIn('"app.d" -> "app.b";', dot)
+        self.assertIn('"app.e" [label="app.e\\n1.000s"];', dot)
+
+    def test_read_durations(self):
+        """
+        Case: Durations get read from a profile
+        Expected: The wall time of every fixture is returned
+        """
+        handle, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "w") as profile_file:
+            json.dump(
+                [{"app_label": "app", "fixture": "a", "wall_time": 1.5}], profile_file
+            )
+
+        self.assertDictEqual(read_durations(path), {("app", "a"): 1.5})
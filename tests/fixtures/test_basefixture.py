@@ -1,6 +1,11 @@
-from unittest import TestCase
+import os
+from unittest import TestCase, mock
+
+from django.contrib.auth.models import Group
 
 from dynamic_fixtures.fixtures.basefixture import BaseFixture
+from dynamic_fixtures.fixtures.bulk import BulkCollector
+from dynamic_fixtures.fixtures.writers import CopyWriter
 
 
 class BaseFixtureTestCase(TestCase):
@@ -12,3 +17,68 @@ class BaseFixtureTestCase(TestCase):
         fixture = BaseFixture("Name", "Module")
         with self.assertRaises(NotImplementedError):
             fixture.load()
+
+    def test_bulk_collector(self):
+        """
+        Case: A fixture get initialized
+        Expected: A bulk collector with the batch size of the fixture is set
+        """
+        fixture = BaseFixture("Name", "Module")
+        self.assertIsInstance(fixture.bulk, BulkCollector)
+        self.assertEqual(fixture.bulk.batch_size, BaseFixture.bulk_batch_size)
+
+    def test_get_data_path(self):
+        """
+        Case: The path of a data file get requested
+        Expected: The path is relative to the module of the fixture
+        """
+
+        class Fixture(BaseFixture):
+            pass
+
+        fixture = Fixture("Name", "Module")
+        self.assertEqual(
+            fixture.get_data_path("authors.csv"),
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "authors.csv"),
+        )
+
+    def test_copy_writer(self):
+        """
+        Case: A copy writer get requested
+        Expected: The writer writes into the database of the fixture
+        """
+        fixture = BaseFixture("Name", "Module")
+        fixture.database = "other"
+
+        writer = fixture.copy_writer(Group, batch_size=10)
+
+        self.assertIsInstance(writer, CopyWriter)
+        self.assertEqual(writer.using, "other")
+        self.assertEqual(writer.batch_size, 10)
+        self.assertListEqual([field.name for field in writer.fields], ["name"])
+
+    def test_get_object(self):
+        """
+        Case: Objects get requested from the registry of a fixture
+        Expected: Only objects of the dependencies are looked up in memory,
+                  other lookups are queried from the database
+        """
+        fixture = BaseFixture("0002_fixture", "app_one")
+        fixture.dependencies = [("app_one", "0001_groups")]
+        group = Group(pk=1, name="a-group")
+        other = Group(pk=2, name="other")
+        fixture.registry.register(("app_one", "0001_groups"), [group])
+        fixture.registry.register(("app_two", "0001_groups"), [other])
+
+        with mock.patch.object(Group._meta, "default_manager") as manager_mock:
+            self.assertIs(fixture.get_object(Group, name="a-group"), group)
+            self.assertFalse(manager_mock.db_manager.called)
+
+            fixture.get_object(Group, name="other")
+            fixture.get_object(Group, name__startswith="a")
+
+        db_manager_mock = manager_mock.db_manager.return_value
+        self.assertListEqual(
+            db_manager_mock.get.call_args_list,
+            [mock.call(name="other"), mock.call(name__startswith="a")],
+        )
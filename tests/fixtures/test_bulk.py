@@ -0,0 +1,69 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from dynamic_fixtures.fixtures.bulk import BulkCollector
+
+
+class BulkCollectorTestCase(TestCase):
+    def test_flush(self):
+        """
+        Case: Instances get added and the collector get flushed
+        Expected: All instances are inserted and have a primary key
+        """
+        collector = BulkCollector()
+        users = [User(username="user-%s" % index) for index in range(3)]
+        collector.add_all(users)
+
+        self.assertFalse(User.objects.exists())
+        self.assertEqual(collector.flush(), 3)
+
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(collector.rows, 3)
+        for user in users:
+            self.assertIsNotNone(user.pk)
+
+        # Nothing left to flush
+        self.assertEqual(collector.flush(), 0)
+
+    def test_batch_size(self):
+        """
+        Case: More instances get added than the batch size
+        Expected: The instances get inserted when the batch size is reached
+        """
+        collector = BulkCollector(batch_size=2)
+        collector.add(Group(name="one"))
+        self.assertEqual(Group.objects.count(), 0)
+        collector.add(Group(name="two"))
+        self.assertEqual(Group.objects.count(), 2)
+        collector.add(Group(name="three"))
+        self.assertEqual(Group.objects.count(), 2)
+
+        collector.flush()
+        self.assertEqual(Group.objects.count(), 3)
+        self.assertEqual(collector.rows, 3)
+
+    def test_foreign_key_order(self):
+        """
+        Case: An instance get added before the instance it refers to
+        Expected: The referred instance get inserted first
+        """
+        collector = BulkCollector()
+        content_type = ContentType(app_label="bulk", model="book")
+        collector.add(
+            Permission(codename="read", name="Can read", content_type=content_type)
+        )
+        collector.add(content_type)
+        collector.flush()
+
+        permission = Permission.objects.get(codename="read")
+        self.assertEqual(permission.content_type_id, content_type.pk)
+
+    def test_get_flush_order(self):
+        """
+        Case: The flush order of models get requested
+        Expected: Every model comes after the models it refers to
+        """
+        self.assertListEqual(
+            BulkCollector.get_flush_order([Permission, Group, ContentType]),
+            [ContentType, Permission, Group],
+        )
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from dynamic_fixtures.fixtures.datafiles import iter_lines, read_csv, read_jsonl
+
+
+class DataFilesTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write(self, filename, content):
+        path = os.path.join(self.directory, filename)
+        with open(path, "wb") as data_file:
+            data_file.write(content)
+        return path
+
+    def test_read_csv(self):
+        """
+        Case: A CSV file with a byte order mark and a multi-line value get read
+        Expected: The rows are returned as dicts
+        """
+        path = self.write(
+            "authors.csv",
+            b'\xef\xbb\xbfname;bio\r\nJohn Doe;"Writes\r\nbooks"\r\nJane;\r\n',
+        )
+
+        rows = read_csv(path, delimiter=";")
+
+        self.assertEqual(next(rows), {"name": "John Doe", "bio": "Writes\r\nbooks"})
+        self.assertListEqual(list(rows), [{"name": "Jane", "bio": ""}])
+
+    def test_read_jsonl(self):
+        """
+        Case: A JSON lines file with an empty line get read
+        Expected: The decoded objects are returned
+        """
+        path = self.write("authors.jsonl", b'{"name": "John"}\n\n{"name": "J\\u00e9"}')
+
+        self.assertListEqual(list(read_jsonl(path)), [{"name": "John"}, {"name": "Jé"}])
+
+    def test_empty_file(self):
+        """
+        Case: An empty file get read
+        Expected: No lines are returned
+        """
+        path = self.write("empty.csv", b"")
+
+        self.assertListEqual(list(iter_lines(path)), [])
+        self.assertListEqual(list(read_csv(path)), [])
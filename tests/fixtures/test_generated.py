@@ -0,0 +1,180 @@
+import datetime
+import random
+from unittest import TestCase, mock, skipIf, skipUnless
+
+from django.contrib.auth.models import Group
+from django.test import TestCase as DjangoTestCase
+from dynamic_fixtures.fixtures import generated
+from dynamic_fixtures.fixtures.generated import (
+    Choice,
+    Constant,
+    DateTime,
+    Float,
+    Function,
+    GeneratedFixture,
+    Integer,
+    RandomSource,
+    Sequence,
+)
+
+
+class RandomSourceTestCase(TestCase):
+    def assert_columns(self, source):
+        integers = source.integers(1, 3, 100)
+        self.assertSetEqual(set(integers), {1, 2, 3})
+        self.assertIsInstance(integers[0], int)
+
+        floats = source.uniform(0.5, 1.0, 100)
+        self.assertTrue(all(0.5 <= value <= 1.0 for value in floats))
+        self.assertIsInstance(floats[0], float)
+
+        self.assertSetEqual(
+            set(source.choices(["a", "b", "c"], 100, weights=[1, 1, 0])), {"a", "b"}
+        )
+
+    def test_python(self):
+        """
+        Case: Columns get generated without NumPy
+        Expected: The values are in range and reproducible with a seed
+        """
+        self.assert_columns(RandomSource(seed=1, use_numpy=False))
+        self.assertListEqual(
+            RandomSource(seed=1, use_numpy=False).integers(0, 1000, 10),
+            RandomSource(seed=1, use_numpy=False).integers(0, 1000, 10),
+        )
+
+    def test_python_without_choices(self):
+        """
+        Case: Choices get generated on a Python without random.choices
+        Expected: The choices are made with the fallback
+        """
+        source = RandomSource(seed=1, use_numpy=False)
+        source._rng = mock.Mock(spec=["random"], random=random.Random(1).random)
+
+        self.assertSetEqual(
+            set(source.choices(["a", "b", "c"], 100, weights=[1, 1, 0])), {"a", "b"}
+        )
+        self.assertSetEqual(set(source.choices(["a", "b"], 100)), {"a", "b"})
+
+    @skipUnless(generated.get_numpy(), "NumPy is not installed")
+    def test_numpy(self):
+        """
+        Case: Columns get generated with NumPy
+        Expected: The values are in range and converted to Python types
+        """
+        self.assert_columns(RandomSource(seed=1, use_numpy=True))
+
+    @skipIf(generated.get_numpy(), "NumPy is installed")
+    def test_numpy_not_installed(self):
+        """
+        Case: NumPy is requested but not installed
+        Expected: An error get raised
+        """
+        with self.assertRaises(Exception):
+            RandomSource(use_numpy=True)
+
+
+class ColumnTestCase(TestCase):
+    def setUp(self):
+        self.source = RandomSource(seed=1, use_numpy=False)
+
+    def test_sequence(self):
+        """
+        Case: A sequence get generated for the second chunk
+        Expected: The values continue from the start of the chunk
+        """
+        self.assertListEqual(
+            Sequence("user-{}", start=1).generate(self.source, 10, 3),
+            ["user-11", "user-12", "user-13"],
+        )
+        self.assertListEqual(Sequence().generate(self.source, 2, 2), [2, 3])
+
+    def test_date_time(self):
+        """
+        Case: Dates and datetimes get generated
+        Expected: The values are within the range
+        """
+        start = datetime.datetime(2020, 1, 1)
+        end = datetime.datetime(2020, 1, 2)
+        for value in DateTime(start, end).generate(self.source, 0, 50):
+            self.assertTrue(start <= value <= end)
+
+        days = DateTime(start.date(), end.date()).generate(self.source, 0, 50)
+        self.assertSetEqual(set(days), {start.date(), end.date()})
+
+    def test_constant_and_function(self):
+        """
+        Case: Constant and function columns get generated
+        Expected: The constant is repeated and the function called per row
+        """
+        self.assertListEqual(Constant("x").generate(self.source, 0, 2), ["x", "x"])
+        self.assertListEqual(
+            Function(lambda index, source: index * 2).generate(self.source, 5, 2),
+            [10, 12],
+        )
+
+
+class GeneratedFixtureTestCase(DjangoTestCase):
+    def test_load(self):
+        """
+        Case: A generated fixture get loaded
+        Expected: Chunks of model instances are yielded
+        """
+
+        class Fixture(GeneratedFixture):
+            model = Group
+            count = 5
+            chunk_size = 2
+            seed = 1
+            columns = {"name": Sequence("group-{}")}
+
+        chunks = list(Fixture("generated", "app").load())
+
+        self.assertListEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(chunks[2][0].name, "group-4")
+        self.assertIsInstance(chunks[0][0], Group)
+
+    def test_load_copy(self):
+        """
+        Case: A generated fixture get loaded with the copy writer
+        Expected: The rows are written to the database
+        """
+
+        class Fixture(GeneratedFixture):
+            model = Group
+            count = 25
+            chunk_size = 10
+            use_copy = True
+            columns = {
+                "name": Function(
+                    lambda index, source: "{}-{}".format(
+                        source.choices(["a", "b"], 1)[0], index
+                    )
+                )
+            }
+
+        list(Fixture("generated", "app").load())
+
+        self.assertEqual(Group.objects.count(), 25)
+
+    def test_mixed_columns(self):
+        """
+        Case: Rows get generated from different columns
+        Expected: The columns are combined per row
+        """
+
+        class Fixture(GeneratedFixture):
+            count = 3
+            columns = {
+                "id": Sequence(),
+                "score": Integer(1, 1),
+                "ratio": Float(0.0, 0.0),
+                "kind": Choice(["a"]),
+            }
+
+        columns = list(Fixture("generated", "app").iter_columns())
+
+        self.assertListEqual(
+            list(zip(*columns[0])),
+            [(0, 1, 0.0, "a"), (1, 1, 0.0, "a"), (2, 1, 0.0, "a")],
+        )
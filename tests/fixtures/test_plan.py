@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from dynamic_fixtures.fixtures.plan import CompiledPlan
+
+
+class CompiledPlanTestCase(TestCase):
+    def setUp(self):
+        self.compiled = CompiledPlan(
+            nodes=[("app", "b")],
+            plan=[("app", "a"), ("app", "b")],
+            dependencies={("app", "a"): [], ("app", "b"): [("app", "a")]},
+            fingerprint="abc",
+        )
+
+    def test_get_key(self):
+        """
+        Case: Keys get created for lists of nodes
+        Expected: The key depends on the nodes, their order and the fingerprint
+        """
+        key = CompiledPlan.get_key([("app", "a"), ("app", "b")], "abc")
+
+        self.assertEqual(key, CompiledPlan.get_key([("app", "a"), ("app", "b")], "abc"))
+        self.assertNotEqual(
+            key, CompiledPlan.get_key([("app", "b"), ("app", "a")], "abc")
+        )
+        self.assertNotEqual(
+            key, CompiledPlan.get_key([("app", "a"), ("app", "b")], "def")
+        )
+        self.assertNotEqual(key, CompiledPlan.get_key(None, "abc"))
+
+    def test_save_and_load(self):
+        """
+        Case: A plan get saved and loaded again
+        Expected: The loaded plan equals the saved plan
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "plans", "plan.json")
+
+        self.compiled.save(path)
+        loaded = CompiledPlan.load(path)
+
+        self.assertEqual(loaded.nodes, [("app", "b")])
+        self.assertListEqual(loaded.plan, self.compiled.plan)
+        self.assertDictEqual(loaded.dependencies, self.compiled.dependencies)
+        self.assertEqual(loaded.fingerprint, "abc")
+        self.assertEqual(len(loaded), 2)
+
+    def test_load_corrupt(self):
+        """
+        Case: A missing or corrupt plan get loaded
+        Expected: None is returned
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "plan.json")
+
+        self.assertIsNone(CompiledPlan.load(path))
+        with open(path, "w") as plan_file:
+            plan_file.write('{"version": 0}')
+        self.assertIsNone(CompiledPlan.load(path))
@@ -0,0 +1,69 @@
+import json
+from unittest import skipUnless
+
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from dynamic_fixtures.fixtures.profiler import FixtureProfiler
+
+
+class FixtureProfilerTestCase(TestCase):
+    @skipUnless(FixtureProfiler.is_supported(), "Profiling requires Django 2.0+")
+    def test_profile(self):
+        """
+        Case: A fixture get profiled
+        Expected: Time, queries, inserted rows and memory are recorded
+        """
+        profiler = FixtureProfiler()
+        with profiler.profile(("app_one", "0001_my_fixture")):
+            Group.objects.create(name="one")
+            Group.objects.bulk_create([Group(name="two"), Group(name="three")])
+            list(Group.objects.all())
+            data = [0] * 100000  # noqa: F841
+
+        (profile,) = profiler.profiles
+        self.assertEqual(profile.node, ("app_one", "0001_my_fixture"))
+        self.assertGreater(profile.wall_time, 0)
+        self.assertGreaterEqual(profile.queries, 3)
+        self.assertDictEqual(profile.rows, {"auth.Group": 3})
+        self.assertEqual(profile.total_rows, 3)
+        self.assertGreater(profile.peak_memory, 100000)
+
+    @skipUnless(FixtureProfiler.is_supported(), "Profiling requires Django 2.0+")
+    def test_get_sorted(self):
+        """
+        Case: The profiles get requested sorted
+        Expected: The slowest profile is returned first
+        """
+        profiler = FixtureProfiler()
+        with profiler.profile(("app_one", "0001_fast")):
+            pass
+        with profiler.profile(("app_one", "0002_slow")) as profile:
+            pass
+        profile.wall_time = 10
+
+        self.assertListEqual(
+            [profile.node for profile in profiler.get_sorted()],
+            [("app_one", "0002_slow"), ("app_one", "0001_fast")],
+        )
+        self.assertEqual(json.loads(profiler.as_json())[0]["fixture"], "0002_slow")
+
+    def test_count_inserted_rows(self):
+        """
+        Case: The number of inserted rows of queries get counted
+        Expected: Every row of values is counted
+        """
+        count = FixtureProfiler.count_inserted_rows
+        self.assertEqual(count('INSERT INTO "a" ("b") VALUES (%s)', [1], False), 1)
+        self.assertEqual(
+            count(
+                'INSERT INTO "a" ("b", "c") VALUES (%s, %s), (%s, %s) '
+                'RETURNING "a"."id"',
+                [1, 2, 3, 4],
+                False,
+            ),
+            2,
+        )
+        self.assertEqual(
+            count('INSERT INTO "a" ("b") VALUES (%s)', [[1], [2], [3]], True), 3
+        )
+        self.assertEqual(count('INSERT INTO "a" SELECT * FROM "b"', [], False), 0)
@@ -0,0 +1,34 @@
+from django.test import TestCase
+from dynamic_fixtures.fixtures.recorder import CheckpointRecorder, FixtureRecorder
+from dynamic_fixtures.models import AppliedFixture, FixtureCheckpoint
+
+
+class FixtureRecorderTestCase(TestCase):
+    def test_record_applied(self):
+        """
+        Case: A fixture get recorded as applied twice
+        Expected: The last hash is stored once
+        """
+        recorder = FixtureRecorder()
+        recorder.record_applied(("app_one", "0001_my_fixture"), "abc")
+        recorder.record_applied(("app_one", "0001_my_fixture"), "def")
+
+        self.assertEqual(AppliedFixture.objects.count(), 1)
+        self.assertDictEqual(
+            recorder.applied_hashes(), {("app_one", "0001_my_fixture"): "def"}
+        )
+
+    def test_checkpoints(self):
+        """
+        Case: A fixture get recorded as completed and the checkpoints cleared
+        Expected: The checkpoint is stored apart from the applied fixtures
+                  and removed again
+        """
+        recorder = CheckpointRecorder()
+        recorder.record_applied(("app_one", "0001_my_fixture"), "abc")
+
+        self.assertEqual(FixtureCheckpoint.objects.count(), 1)
+        self.assertFalse(AppliedFixture.objects.exists())
+
+        recorder.clear()
+        self.assertDictEqual(recorder.applied_hashes(), {})
@@ -0,0 +1,110 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.test import SimpleTestCase
+from dynamic_fixtures.fixtures.registry import FixtureRegistry
+
+
+class FixtureRegistryTestCase(SimpleTestCase):
+    def setUp(self):
+        self.registry = FixtureRegistry()
+        self.users = [User(pk=1, username="john"), User(pk=2, username="jane")]
+        self.registry.register(("app_one", "0001_users"), self.users)
+
+    def test_get(self):
+        """
+        Case: A registered object is looked up by a field
+        Expected: The object is returned
+        """
+        self.assertIs(self.registry.get(User, username="jane"), self.users[1])
+        self.assertIs(self.registry.get(User, pk=1, username="john"), self.users[0])
+
+    def test_get_missing(self):
+        """
+        Case: An object which is not registered is looked up
+        Expected: DoesNotExist of the model is raised
+        """
+        with self.assertRaises(User.DoesNotExist):
+            self.registry.get(User, username="unknown")
+        with self.assertRaises(Group.DoesNotExist):
+            self.registry.get(Group, name="john")
+
+    def test_get_multiple(self):
+        """
+        Case: Two registered objects match the lookup
+        Expected: MultipleObjectsReturned of the model is raised
+        """
+        self.registry.register(("app_one", "0002_users"), [User(username="john")])
+
+        with self.assertRaises(User.MultipleObjectsReturned):
+            self.registry.get(User, username="john")
+
+    def test_register_updates_index(self):
+        """
+        Case: An object is registered after an index was built
+        Expected: The object can be looked up
+        """
+        self.registry.get(User, username="john")
+        user = User(username="other")
+        self.registry.register(("app_one", "0002_users"), [user, "no model"])
+
+        self.assertIs(self.registry.get(User, username="other"), user)
+        self.assertEqual(len(self.registry), 3)
+
+    def test_get_by_natural_key(self):
+        """
+        Case: A registered object is looked up by its natural key
+        Expected: The object is returned
+        """
+        self.assertIs(self.registry.get_by_natural_key(User, "jane"), self.users[1])
+
+    def test_release(self):
+        """
+        Case: The objects of a fixture are released
+        Expected: They can no longer be looked up
+        """
+        self.registry.get(User, username="john")
+        self.registry.release(("app_one", "0001_users"))
+
+        self.assertNotIn(("app_one", "0001_users"), self.registry)
+        self.assertListEqual(self.registry.get_objects(("app_one", "0001_users")), [])
+        with self.assertRaises(User.DoesNotExist):
+            self.registry.get(User, username="john")
+
+    def test_lookup(self):
+        """
+        Case: An object is looked up in the objects of given fixtures
+        Expected: Only objects of these fixtures are found
+        """
+        user = User(pk=3, username="john")
+        self.registry.register(("app_one", "0002_users"), [user])
+
+        self.assertIs(
+            self.registry.lookup(
+                [("app_one", "0002_users")], User, {"username": "john"}
+            ),
+            user,
+        )
+        with self.assertRaises(User.DoesNotExist):
+            self.registry.lookup([("app_one", "0002_users")], User, {"pk": 1})
+
+    def test_lookup_relation(self):
+        """
+        Case: An object is looked up by a foreign key
+        Expected: The object is found by the primary key of the related object
+        """
+        group = Group(pk=1, name="group")
+        permission = Permission(pk=1, codename="change", content_type_id=4)
+        self.registry.register(("app_one", "0002_permissions"), [permission])
+
+        self.assertIs(
+            self.registry.get(Permission, content_type_id=4, codename="change"),
+            permission,
+        )
+        self.assertIs(
+            self.registry.get(Permission, content_type=ContentType(pk=4)), permission
+        )
+        self.assertFalse(self.registry.can_lookup(Group, {"name__startswith": "g"}))
+        self.assertFalse(self.registry.can_lookup(Group, {"permissions": group}))
+        self.assertTrue(self.registry.can_lookup(Group, {"pk": 1}))
+        with self.assertRaises(ValueError):
+            self.registry.get(Group, name__startswith="g")
@@ -0,0 +1,142 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from unittest import mock
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from dynamic_fixtures.client import send_request
+from dynamic_fixtures.fixtures.loader import Loader
+from dynamic_fixtures.fixtures.runner import LoadFixtureRunner
+from dynamic_fixtures.fixtures.server import FixtureServer
+
+# Make sure the test apps can be imported
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "loader", "apps")
+)
+
+
+@override_settings(INSTALLED_APPS=["app_one", "app_two"])
+class FixtureServerTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.socket_path = os.path.join(self.directory, "fixtures.sock")
+        self.server = FixtureServer(
+            socket_path=self.socket_path, runner=LoadFixtureRunner(loader=Loader())
+        )
+
+    def test_list(self):
+        """
+        Case: The fixtures of an app get listed
+        Expected: The plan is returned
+        """
+        response = self.server.handle_request(
+            {"action": "list", "app_label": "app_two"}
+        )
+
+        self.assertDictEqual(
+            response,
+            {
+                "ok": True,
+                "reloaded": False,
+                "nodes": [["app_two", "001_load_some_data"]],
+                "count": 1,
+            },
+        )
+
+    def test_load(self):
+        """
+        Case: A fixture get loaded in dry-run mode
+        Expected: The runner loads the fixture and the progress is returned
+        """
+
+        def load_fixtures(nodes, progress_callback, dry_run):
+            progress_callback("load_success", nodes[0], 0.5)
+            return 1
+
+        with mock.patch.object(
+            self.server.runner, "load_fixtures", side_effect=load_fixtures
+        ) as load_mock:
+            response = self.server.handle_request(
+                {
+                    "action": "load",
+                    "app_label": "app_one",
+                    "fixture_name": "002",
+                    "dry_run": True,
+                }
+            )
+
+        load_mock.assert_called_once_with(
+            nodes=[("app_one", "002_load_other_data")],
+            progress_callback=mock.ANY,
+            dry_run=True,
+        )
+        self.assertEqual(response["count"], 1)
+        self.assertListEqual(
+            response["events"],
+            [
+                {
+                    "action": "load_success",
+                    "node": ["app_one", "002_load_other_data"],
+                    "elapsed_time": 0.5,
+                    "rows": None,
+                }
+            ],
+        )
+
+    def test_error(self):
+        """
+        Case: Loading a fixture fails
+        Expected: The error is returned
+        """
+        response = self.server.handle_request(
+            {"action": "load", "app_label": "app_two"}
+        )
+
+        self.assertDictEqual(response, {"ok": False, "error": "NotImplementedError: "})
+        self.assertFalse(self.server.handle_request({"action": "drop"})["ok"])
+
+    def test_reload(self):
+        """
+        Case: A fixture file changed since the last request
+        Expected: The module is imported again and the fixtures rediscovered
+        """
+        node = ("app_one", "002_load_other_data")
+        stamps = dict(self.server._stamps)
+        stamps[node] = (0, 0)
+        module_name = self.server.runner.loader.fixture_modules[node]
+
+        with mock.patch.object(
+            self.server, "get_stamps", return_value=stamps
+        ), mock.patch.object(self.server.runner, "refresh") as refresh_mock:
+            self.assertTrue(self.server.reload())
+            self.assertFalse(self.server.reload())
+
+        refresh_mock.assert_called_once_with()
+        self.assertNotIn(module_name, sys.modules)
+
+    def test_serve(self):
+        """
+        Case: A client sends requests to the server over the socket
+        Expected: The responses are returned until the server is stopped
+        """
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        for _ in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            thread.join(0.01)
+
+        self.assertDictEqual(
+            send_request(self.socket_path, {"action": "ping"}), {"ok": True}
+        )
+        self.assertDictEqual(
+            send_request(self.socket_path, {"action": "stop"}), {"ok": True}
+        )
+        thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
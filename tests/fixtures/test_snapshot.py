@@ -0,0 +1,110 @@
+import shutil
+import sqlite3
+import tempfile
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import Group
+from django.test import TransactionTestCase
+from dynamic_fixtures.fixtures.snapshot import SnapshotStore
+
+
+class SnapshotStoreTestCase(TransactionTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = SnapshotStore(self.directory)
+
+    def test_get_key(self):
+        """
+        Case: Keys get requested for plans
+        Expected: The key changes when a hash changes
+        """
+        key = self.store.get_key({("app_one", "0001"): "a", ("app_one", "0002"): "b"})
+        self.assertEqual(
+            key,
+            self.store.get_key({("app_one", "0002"): "b", ("app_one", "0001"): "a"}),
+        )
+        self.assertNotEqual(
+            key,
+            self.store.get_key({("app_one", "0001"): "a", ("app_one", "0002"): "c"}),
+        )
+
+    def test_get_key_migrations(self):
+        """
+        Case: A key get requested after another migration is applied
+        Expected: The key changes
+        """
+        hashes = {("app_one", "0001"): "a"}
+        key = self.store.get_key(hashes)
+
+        with mock.patch.object(
+            self.store,
+            "get_applied_migrations",
+            return_value=self.store.get_applied_migrations() + [("auth", "9999_new")],
+        ):
+            self.assertNotEqual(self.store.get_key(hashes), key)
+
+    @skipUnless(
+        hasattr(sqlite3.Connection, "backup"), "SQLite backup requires Python 3.7+"
+    )
+    def test_save_restore(self):
+        """
+        Case: A snapshot get saved and restored
+        Expected: The state of the database is restored
+        """
+        Group.objects.create(name="snapshot")
+        self.assertFalse(self.store.exists("key"))
+        self.store.save("key")
+        self.assertTrue(self.store.exists("key"))
+
+        Group.objects.all().delete()
+        Group.objects.create(name="other")
+
+        self.store.restore("key")
+
+        self.assertListEqual(
+            list(Group.objects.values_list("name", flat=True)), ["snapshot"]
+        )
+
+    def test_save_restore_serialized(self):
+        """
+        Case: A snapshot get saved and restored for a non-SQLite database
+        Expected: The data is restored from a serialized dump
+        """
+        Group.objects.create(name="snapshot")
+        with mock.patch.object(
+            SnapshotStore, "connection", new_callable=mock.PropertyMock
+        ) as connection_mock:
+            connection_mock.return_value.vendor = "postgresql"
+            self.store.save("key")
+            self.assertTrue(self.store.get_path("key").endswith(".json"))
+
+            Group.objects.all().delete()
+            self.store.restore("key")
+
+        reset_mock = connection_mock.return_value.ops.sequence_reset_sql
+        self.assertIn(Group, reset_mock.call_args[0][1])
+        self.assertListEqual(
+            list(Group.objects.values_list("name", flat=True)), ["snapshot"]
+        )
+
+    def test_save_restore_without_backup(self):
+        """
+        Case: A snapshot get saved and restored for SQLite without the backup
+              API, e.g. on Python < 3.7
+        Expected: The data is restored from a serialized dump
+        """
+        Group.objects.create(name="snapshot")
+        with mock.patch.object(
+            SnapshotStore, "use_backup", new_callable=mock.PropertyMock
+        ) as use_backup_mock:
+            use_backup_mock.return_value = False
+            self.store.save("key")
+            self.assertTrue(self.store.get_path("key").endswith(".json"))
+
+            Group.objects.all().delete()
+            self.store.restore("key")
+
+        self.assertListEqual(
+            list(Group.objects.values_list("name", flat=True)), ["snapshot"]
+        )
@@ -0,0 +1,134 @@
+import datetime
+import json
+from unittest import mock
+
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+from django.test import TestCase
+from dynamic_fixtures.fixtures.writers import CopyWriter, format_copy_value
+
+
+class CopyWriterTestCase(TestCase):
+    def test_executemany(self):
+        """
+        Case: Rows get written to SQLite
+        Expected: The rows are inserted with executemany once the batch size
+                  is reached
+        """
+        writer = CopyWriter(Group, batch_size=2)
+        self.assertEqual(writer.method, "executemany")
+
+        writer.add(Group(name="one"))
+        self.assertEqual(Group.objects.count(), 0)
+        writer.add({"name": "two"})
+        self.assertEqual(Group.objects.count(), 2)
+        with writer:
+            writer.add(["three"])
+
+        self.assertListEqual(
+            sorted(Group.objects.values_list("name", flat=True)),
+            ["one", "three", "two"],
+        )
+        self.assertEqual(writer.rows, 3)
+
+    def test_insert(self):
+        """
+        Case: Rows get written to a database without a faster method
+        Expected: The rows are inserted with multi-row INSERT statements
+        """
+        with mock.patch.object(
+            CopyWriter, "method", new_callable=mock.PropertyMock, return_value="insert"
+        ):
+            with CopyWriter(User) as writer:
+                writer.add_all(User(username="user-%s" % index) for index in range(5))
+
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(writer.rows, 5)
+
+    def test_copy(self):
+        """
+        Case: Rows get written to PostgreSQL
+        Expected: The rows are streamed with COPY
+        """
+        writer = CopyWriter(Group, fields=["name"])
+        connection = mock.MagicMock(vendor="postgresql")
+        connection.ops.quote_name.side_effect = lambda name: '"%s"' % name
+        raw_cursor = connection.cursor.return_value.__enter__.return_value.cursor
+
+        with mock.patch(
+            "dynamic_fixtures.fixtures.writers.connections", {"default": connection}
+        ), mock.patch("dynamic_fixtures.fixtures.writers.transaction"):
+            writer.add_all([["one"], ["two\tthree"]])
+            writer.flush()
+
+        sql, data = raw_cursor.copy_expert.call_args[0]
+        self.assertEqual(sql, 'COPY "auth_group" ("name") FROM STDIN')
+        self.assertEqual(data.getvalue(), "one\ntwo\\tthree\n")
+
+    def test_add_columns(self):
+        """
+        Case: Rows get added as columns
+        Expected: The rows are written
+        """
+        with CopyWriter(Group, batch_size=2) as writer:
+            writer.add_columns([["one", "two", "three"]])
+            with self.assertRaises(ValueError):
+                writer.add_columns([["four"], ["five"]])
+
+        self.assertEqual(Group.objects.count(), 3)
+
+    def test_rollback(self):
+        """
+        Case: The transaction rows were written in get rolled back
+        Expected: The rows are gone
+        """
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                with CopyWriter(Group) as writer:
+                    writer.add(["one"])
+                writer.add(["two"])
+                raise ValueError
+
+        self.assertFalse(Group.objects.exists())
+        self.assertEqual(writer.rows, 1)
+
+    def test_wrong_number_of_values(self):
+        """
+        Case: A row with too many values get added
+        Expected: An error get raised
+        """
+        with self.assertRaises(ValueError):
+            CopyWriter(Group).add(["one", "two"])
+
+    def test_format_copy_value(self):
+        """
+        Case: Values get formatted for COPY
+        Expected: Special values and characters are escaped
+        """
+        self.assertEqual(format_copy_value(None), "\\N")
+        self.assertEqual(format_copy_value(True), "t")
+        self.assertEqual(format_copy_value(b"\x01\xff"), "\\\\x01ff")
+        self.assertEqual(format_copy_value(datetime.date(2020, 1, 2)), "2020-01-02")
+        self.assertEqual(format_copy_value("a\\b\nc\r"), "a\\\\b\\nc\\r")
+        self.assertEqual(format_copy_value(1.5), "1.5")
+
+    def test_format_copy_value_array(self):
+        """
+        Case: Lists, e.g. of an ArrayField, get formatted for COPY
+        Expected: They are written as array literals
+        """
+        self.assertEqual(format_copy_value([1, 2]), '{"1","2"}')
+        self.assertEqual(format_copy_value([[1, None], []]), '{{"1",NULL},{}}')
+        self.assertEqual(format_copy_value(['a"b', "c\\d"]), '{"a\\\\"b","c\\\\\\\\d"}')
+
+    def test_format_copy_value_json(self):
+        """
+        Case: JSON values, as dict or wrapped by a database adapter, get
+              formatted for COPY
+        Expected: They are written as JSON
+        """
+        adapter = mock.Mock(spec=["adapted", "dumps"], adapted={"a": [1]})
+        adapter.dumps.side_effect = json.dumps
+
+        self.assertEqual(format_copy_value({"a": "b"}), '{"a": "b"}')
+        self.assertEqual(format_copy_value(adapter), '{"a": [1]}')
@@ -1,9 +1,18 @@
-from unittest import mock
+from io import StringIO
+from unittest import mock, skipUnless
 
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+from dynamic_fixtures.fixtures.exceptions import UnsupportedOptionsError
+from dynamic_fixtures.fixtures.profiler import FixtureProfile, MemoryStep
+from dynamic_fixtures.management.commands.load_dynamic_fixtures import Command
 from tests.mixins import MockTestCaseMixin
 
+try:
+    import asgiref
+except ImportError:
+    asgiref = None
+
 
 class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
     def setUp(self):
@@ -11,6 +20,9 @@ class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
             "dynamic_fixtures.management.commands.load_dynamic_fixtures"
             ".LoadFixtureRunner"
         )
+        self.loader_mock = self.setup_mock(
+            "dynamic_fixtures.management.commands.load_dynamic_fixtures.Loader"
+        )
 
     def test_service_got_called(self):
         """
@@ -19,11 +31,28 @@ class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
         """
         call_command("load_dynamic_fixtures")
 
-        self.fixtures_runner_mock.assert_called_once_with()
+        self.loader_mock.assert_called_once_with(
+            lazy=False, cache_dir=None, import_workers=None
+        )
+        self.fixtures_runner_mock.assert_called_once_with(
+            loader=self.loader_mock.return_value
+        )
         self.assertFalse(self.fixtures_runner_mock.return_value.get_app_nodes.called)
 
         self.fixtures_runner_mock.return_value.load_fixtures.assert_called_once_with(
-            progress_callback=mock.ANY, nodes=None, dry_run=False
+            progress_callback=mock.ANY,
+            nodes=None,
+            dry_run=False,
+            workers=None,
+            incremental=False,
+            snapshot_dir=None,
+            profiler=None,
+            commit_every=None,
+            database="default",
+            commit_each=False,
+            resume=False,
+            collect_garbage=False,
+            memory_tracker=None,
         )
 
     def test_one_argument(self):
@@ -33,7 +62,9 @@ class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
         """
         call_command("load_dynamic_fixtures", "my_app")
 
-        self.fixtures_runner_mock.assert_called_once_with()
+        self.fixtures_runner_mock.assert_called_once_with(
+            loader=self.loader_mock.return_value
+        )
         self.fixtures_runner_mock.return_value.get_app_nodes.assert_called_once_with(
             app_label="my_app"
         )
@@ -42,6 +73,16 @@ class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
             progress_callback=mock.ANY,
             nodes=self.fixtures_runner_mock.return_value.get_app_nodes.return_value,
             dry_run=False,
+            workers=None,
+            incremental=False,
+            snapshot_dir=None,
+            profiler=None,
+            commit_every=None,
+            database="default",
+            commit_each=False,
+            resume=False,
+            collect_garbage=False,
+            memory_tracker=None,
         )
 
     def test_two_arguments(self):
@@ -51,7 +92,9 @@ class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
         """
         call_command("load_dynamic_fixtures", "my_app", "0001")
 
-        self.fixtures_runner_mock.assert_called_once_with()
+        self.fixtures_runner_mock.assert_called_once_with(
+            loader=self.loader_mock.return_value
+        )
         self.fixtures_runner_mock.return_value.get_fixture_node.assert_called_once_with(
             app_label="my_app", fixture_prefix="0001"
         )
@@ -60,6 +103,16 @@ class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
             progress_callback=mock.ANY,
             nodes=self.fixtures_runner_mock.return_value.get_fixture_node.return_value,
             dry_run=False,
+            workers=None,
+            incremental=False,
+            snapshot_dir=None,
+            profiler=None,
+            commit_every=None,
+            database="default",
+            commit_each=False,
+            resume=False,
+            collect_garbage=False,
+            memory_tracker=None,
         )
 
     def test_app_label_argument(self):
@@ -69,7 +122,9 @@ class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
         """
         call_command("load_dynamic_fixtures", app_label="my_app")
 
-        self.fixtures_runner_mock.assert_called_once_with()
+        self.fixtures_runner_mock.assert_called_once_with(
+            loader=self.loader_mock.return_value
+        )
         self.fixtures_runner_mock.return_value.get_app_nodes.assert_called_once_with(
             app_label="my_app"
         )
@@ -78,6 +133,16 @@ class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
             progress_callback=mock.ANY,
             nodes=self.fixtures_runner_mock.return_value.get_app_nodes.return_value,
             dry_run=False,
+            workers=None,
+            incremental=False,
+            snapshot_dir=None,
+            profiler=None,
+            commit_every=None,
+            database="default",
+            commit_each=False,
+            resume=False,
+            collect_garbage=False,
+            memory_tracker=None,
         )
 
     def test_app_label_and_fixture_prefix_arguments(self):
@@ -87,7 +152,9 @@ class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
         """
         call_command("load_dynamic_fixtures", app_label="my_app", fixture_name="0001")
 
-        self.fixtures_runner_mock.assert_called_once_with()
+        self.fixtures_runner_mock.assert_called_once_with(
+            loader=self.loader_mock.return_value
+        )
         self.fixtures_runner_mock.return_value.get_fixture_node.assert_called_once_with(
             app_label="my_app", fixture_prefix="0001"
         )
@@ -96,4 +163,487 @@ class ManagementCommandLoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
             progress_callback=mock.ANY,
             nodes=self.fixtures_runner_mock.return_value.get_fixture_node.return_value,
             dry_run=False,
+            workers=None,
+            incremental=False,
+            snapshot_dir=None,
+            profiler=None,
+            commit_every=None,
+            database="default",
+            commit_each=False,
+            resume=False,
+            collect_garbage=False,
+            memory_tracker=None,
+        )
+
+    def test_workers(self):
+        """
+        Case: management command is called with the workers option
+        Expected: the number of workers is passed to the runner
+        """
+        call_command("load_dynamic_fixtures", workers=4)
+
+        self.fixtures_runner_mock.return_value.load_fixtures.assert_called_once_with(
+            progress_callback=mock.ANY,
+            nodes=None,
+            dry_run=False,
+            workers=4,
+            incremental=False,
+            snapshot_dir=None,
+            profiler=None,
+            commit_every=None,
+            database="default",
+            commit_each=False,
+            resume=False,
+            collect_garbage=False,
+            memory_tracker=None,
+        )
+
+    def test_lazy(self):
+        """
+        Case: management command is called with the lazy option
+        Expected: the runner uses a lazy loader
+        """
+        call_command("load_dynamic_fixtures", lazy=True)
+
+        self.loader_mock.assert_called_once_with(
+            lazy=True, cache_dir=None, import_workers=None
+        )
+        self.fixtures_runner_mock.assert_called_once_with(
+            loader=self.loader_mock.return_value
+        )
+
+    def test_cache_dir(self):
+        """
+        Case: management command is called with a cache directory
+        Expected: the loader uses the cache directory
+        """
+        call_command("load_dynamic_fixtures", cache_dir="/tmp/fixtures-cache")
+
+        self.loader_mock.assert_called_once_with(
+            lazy=False, cache_dir="/tmp/fixtures-cache", import_workers=None
+        )
+
+    def test_import_workers(self):
+        """
+        Case: management command is called with import workers
+        Expected: the loader prefetches the fixtures in worker processes
+        """
+        call_command("load_dynamic_fixtures", import_workers=4)
+
+        self.loader_mock.assert_called_once_with(
+            lazy=False, cache_dir=None, import_workers=4
+        )
+
+    def test_incremental(self):
+        """
+        Case: management command is called with the incremental option
+        Expected: the fixtures get loaded incrementally
+        """
+        call_command("load_dynamic_fixtures", incremental=True)
+
+        self.fixtures_runner_mock.return_value.load_fixtures.assert_called_once_with(
+            progress_callback=mock.ANY,
+            nodes=None,
+            dry_run=False,
+            workers=None,
+            incremental=True,
+            snapshot_dir=None,
+            profiler=None,
+            commit_every=None,
+            database="default",
+            commit_each=False,
+            resume=False,
+            collect_garbage=False,
+            memory_tracker=None,
+        )
+
+    def test_snapshot_dir(self):
+        """
+        Case: management command is called with a snapshot directory
+        Expected: the snapshot directory is passed to the runner
+        """
+        call_command("load_dynamic_fixtures", snapshot_dir="/tmp/snapshots")
+
+        self.fixtures_runner_mock.return_value.load_fixtures.assert_called_once_with(
+            progress_callback=mock.ANY,
+            nodes=None,
+            dry_run=False,
+            workers=None,
+            incremental=False,
+            snapshot_dir="/tmp/snapshots",
+            profiler=None,
+            commit_every=None,
+            database="default",
+            commit_each=False,
+            resume=False,
+            collect_garbage=False,
+            memory_tracker=None,
+        )
+
+    def test_progress_callback(self):
+        """
+        Case: Progress get reported
+        Expected: The progress is written to stdout
+        """
+        stdout = StringIO()
+        command = Command(stdout=stdout)
+        command.progress_callback("load_start", ("my_app", "0001"))
+        command.progress_callback("load_success", ("my_app", "0001"), 1.5)
+        command.progress_callback("bulk_flush", ("my_app", "0001"), 0.5, rows=10)
+        command.progress_callback("snapshot_save", None, 2.0)
+
+        self.assertEqual(
+            stdout.getvalue(),
+            "Loading fixture my_app.0001...SUCCESS (1.5 seconds) \n"
+            "  Inserted 10 rows in bulk (0.5 seconds)\n"
+            "Saved snapshot of fixtures (2.0 seconds)\n",
+        )
+
+    def test_progress_callback_concurrent(self):
+        """
+        Case: Progress get reported while fixtures are loaded concurrently
+        Expected: Every message is written as a complete line
+        """
+        stdout = StringIO()
+        command = Command(stdout=stdout)
+        command.concurrent = True
+        command.progress_callback("load_start", ("my_app", "0001"))
+        command.progress_callback("load_start", ("my_app", "0002"))
+        command.progress_callback("load_success", ("my_app", "0001"), 1.5)
+
+        self.assertEqual(
+            stdout.getvalue(),
+            "Loading fixture my_app.0001...\n"
+            "Loading fixture my_app.0002...\n"
+            "Loaded fixture my_app.0001: SUCCESS (1.5 seconds) \n",
+        )
+
+    def test_profile(self):
+        """
+        Case: management command is called with the profile option
+        Expected: the fixtures get profiled and the profile is written
+        """
+        profiler_mock = self.setup_mock(
+            "dynamic_fixtures.management.commands.load_dynamic_fixtures"
+            ".FixtureProfiler"
+        )
+        profile = FixtureProfile(("my_app", "0001_slow"))
+        profile.wall_time = 2.5
+        profile.rows = {"auth.User": 3}
+        profiler_mock.return_value.get_sorted.return_value = [profile]
+        stdout = StringIO()
+
+        call_command("load_dynamic_fixtures", profile=True, stdout=stdout)
+
+        self.assertEqual(
+            self.fixtures_runner_mock.return_value.load_fixtures.call_args[1][
+                "profiler"
+            ],
+            profiler_mock.return_value,
+        )
+        lines = stdout.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("Fixture"))
+        self.assertTrue(lines[1].startswith("my_app.0001_slow"))
+        self.assertIn("2.500", lines[1])
+
+    def test_profile_not_supported(self):
+        """
+        Case: management command is called with the profile option on a
+              Django version which doesn't support profiling
+        Expected: an error get raised
+        """
+        profiler_mock = self.setup_mock(
+            "dynamic_fixtures.management.commands.load_dynamic_fixtures"
+            ".FixtureProfiler"
+        )
+        profiler_mock.is_supported.return_value = False
+
+        with self.assertRaises(CommandError):
+            call_command("load_dynamic_fixtures", profile=True)
+
+        self.assertFalse(self.fixtures_runner_mock.return_value.load_fixtures.called)
+
+    def test_memory(self):
+        """
+        Case: management command is called with the memory and gc options
+        Expected: the memory of every fixture is tracked and written
+        """
+        tracker_mock = self.setup_mock(
+            "dynamic_fixtures.management.commands.load_dynamic_fixtures"
+            ".MemoryTracker"
+        )
+        tracker_mock.return_value.steps = [
+            MemoryStep(("my_app", "0001_big"), 4096, 2048, [("my_app", "0001_big")])
+        ]
+        tracker_mock.return_value.peak = 4096
+        stdout = StringIO()
+
+        call_command(
+            "load_dynamic_fixtures",
+            memory_report=True,
+            collect_garbage=True,
+            stdout=stdout,
+        )
+
+        kwargs = self.fixtures_runner_mock.return_value.load_fixtures.call_args[1]
+        self.assertEqual(kwargs["memory_tracker"], tracker_mock.return_value)
+        self.assertTrue(kwargs["collect_garbage"])
+        lines = stdout.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("Fixture"))
+        self.assertTrue(lines[1].startswith("my_app.0001_big"))
+        self.assertEqual(lines[2], "Peak memory: 4 KiB")
+
+    def test_plan_stats(self):
+        """
+        Case: management command is called with the plan-stats option
+        Expected: the plan get analysed and no fixtures are loaded
+        """
+        analysis_mock = self.setup_mock(
+            "dynamic_fixtures.management.commands.load_dynamic_fixtures" ".PlanAnalysis"
+        )
+        analysis_mock.return_value.levels = [["a", "b"], ["c"]]
+        analysis_mock.return_value.get_critical_path.return_value = (
+            [("my_app", "0001"), ("my_app", "0002")],
+            3.0,
+        )
+        analysis_mock.return_value.get_duration.return_value = 1.5
+        analysis_mock.return_value.get_bottlenecks.return_value = [
+            (("my_app", "0001"), 1)
+        ]
+        stdout = StringIO()
+
+        call_command("load_dynamic_fixtures", plan_stats=True, stdout=stdout)
+
+        runner = self.fixtures_runner_mock.return_value
+        analysis_mock.assert_called_once_with(
+            graph=runner.graph,
+            plan=runner.get_plan.return_value,
+            durations=None,
+        )
+        self.assertFalse(runner.load_fixtures.called)
+        self.assertEqual(
+            stdout.getvalue(),
+            "Levels: 2\n"
+            "  Level 1: 2 fixtures\n"
+            "  Level 2: 1 fixtures\n"
+            "Critical path (3.000 seconds):\n"
+            "  my_app.0001 (1.500)\n"
+            "  my_app.0002 (1.500)\n"
+            "Bottlenecks:\n"
+            "  my_app.0001: 1 dependent fixtures\n",
+        )
+
+    def test_graph(self):
+        """
+        Case: management command is called with the graph option
+        Expected: only the graph is written
+        """
+        analysis_mock = self.setup_mock(
+            "dynamic_fixtures.management.commands.load_dynamic_fixtures" ".PlanAnalysis"
+        )
+        analysis_mock.return_value.as_dot.return_value = "digraph fixtures {}"
+        stdout = StringIO()
+
+        call_command("load_dynamic_fixtures", graph="dot", stdout=stdout)
+
+        self.assertEqual(stdout.getvalue(), "digraph fixtures {}\n")
+
+    def test_database(self):
+        """
+        Case: management command is called with a database
+        Expected: the database is passed to the runner
+        """
+        call_command("load_dynamic_fixtures", database="other")
+
+        self.assertEqual(
+            self.fixtures_runner_mock.return_value.load_fixtures.call_args[1][
+                "database"
+            ],
+            "other",
+        )
+
+    def test_shard(self):
+        """
+        Case: management command is called with a shard
+        Expected: only the nodes of the shard get loaded
+        """
+        runner = self.fixtures_runner_mock.return_value
+
+        call_command("load_dynamic_fixtures", shard="3/8")
+
+        runner.get_shard.assert_called_once_with(
+            runner.get_plan.return_value, 3, 8, durations=None
+        )
+        self.assertEqual(
+            runner.load_fixtures.call_args[1]["nodes"], runner.get_shard.return_value
+        )
+
+    def test_empty_shard(self):
+        """
+        Case: management command is called with a shard without fixtures
+        Expected: nothing gets loaded
+        """
+        runner = self.fixtures_runner_mock.return_value
+        runner.get_shard.return_value = []
+
+        call_command("load_dynamic_fixtures", shard="8/8", stdout=StringIO())
+
+        self.assertFalse(runner.load_fixtures.called)
+
+    def test_invalid_shard(self):
+        """
+        Case: management command is called with an invalid shard
+        Expected: an error get raised
+        """
+        with self.assertRaises(CommandError):
+            call_command("load_dynamic_fixtures", shard="9/8")
+        with self.assertRaises(CommandError):
+            call_command("load_dynamic_fixtures", shard="three")
+
+    @skipUnless(
+        asgiref and hasattr(mock, "AsyncMock"), "Requires asgiref and Python 3.8+"
+    )
+    @mock.patch("dynamic_fixtures.fixtures.async_runner.AsyncLoadFixtureRunner")
+    def test_async(self, async_runner_mock):
+        """
+        Case: management command is called with --async
+        Expected: the fixtures are loaded by the async runner
+        """
+        runner = async_runner_mock.return_value
+        runner.aload_fixtures = mock.AsyncMock(return_value=3)
+
+        call_command(
+            "load_dynamic_fixtures", use_async=True, concurrency=4, stdout=StringIO()
+        )
+
+        async_runner_mock.assert_called_once_with(loader=self.loader_mock.return_value)
+        runner.aload_fixtures.assert_awaited_once_with(
+            nodes=None,
+            progress_callback=mock.ANY,
+            dry_run=False,
+            concurrency=4,
+            database="default",
+        )
+        self.assertFalse(self.fixtures_runner_mock.called)
+
+    def test_unsupported_options(self):
+        """
+        Case: management command is called with options which can't be
+              combined
+        Expected: the error of the runner is raised as command error
+        """
+        self.fixtures_runner_mock.return_value.load_fixtures.side_effect = (
+            UnsupportedOptionsError("Dry-run is not supported when loading in parallel")
+        )
+
+        with self.assertRaisesMessage(CommandError, "Dry-run is not supported"):
+            call_command("load_dynamic_fixtures", dry_run=True, workers=2)
+
+    def test_async_unsupported_option(self):
+        """
+        Case: management command is called with --async and --workers
+        Expected: an error get raised
+        """
+        with self.assertRaises(CommandError):
+            call_command("load_dynamic_fixtures", use_async=True, workers=2)
+
+    @mock.patch(
+        "dynamic_fixtures.management.commands.load_dynamic_fixtures.FixtureServer"
+    )
+    def test_serve(self, server_mock):
+        """
+        Case: management command is called with --serve
+        Expected: a server is started with the runner
+        """
+        call_command(
+            "load_dynamic_fixtures", serve="/tmp/fixtures.sock", stdout=StringIO()
+        )
+
+        server_mock.assert_called_once_with(
+            socket_path="/tmp/fixtures.sock",
+            runner=self.fixtures_runner_mock.return_value,
+        )
+        server_mock.return_value.serve_forever.assert_called_once_with()
+        self.assertFalse(self.fixtures_runner_mock.return_value.load_fixtures.called)
+
+    @mock.patch(
+        "dynamic_fixtures.management.commands.load_dynamic_fixtures.send_request"
+    )
+    def test_connect(self, send_request_mock):
+        """
+        Case: management command is called with --connect
+        Expected: the server loads the fixtures and the progress is written
+        """
+        send_request_mock.return_value = {
+            "ok": True,
+            "count": 1,
+            "events": [
+                {
+                    "action": "load_success",
+                    "node": ["app_one", "0001_fixture"],
+                    "elapsed_time": 0.5,
+                    "rows": None,
+                }
+            ],
+        }
+        stdout = StringIO()
+
+        call_command(
+            "load_dynamic_fixtures",
+            "app_one",
+            connect="/tmp/fixtures.sock",
+            dry_run=True,
+            stdout=stdout,
+        )
+
+        send_request_mock.assert_called_once_with(
+            "/tmp/fixtures.sock",
+            {
+                "action": "load",
+                "app_label": "app_one",
+                "fixture_name": None,
+                "dry_run": True,
+                "database": "default",
+            },
+        )
+        self.assertFalse(self.loader_mock.called)
+        self.assertIn("SUCCESS (0.5 seconds)", stdout.getvalue())
+        self.assertIn("Total of 1 fixtures", stdout.getvalue())
+
+    @mock.patch(
+        "dynamic_fixtures.management.commands.load_dynamic_fixtures.send_request"
+    )
+    def test_connect_error(self, send_request_mock):
+        """
+        Case: the server fails to load the fixtures
+        Expected: an error get raised
+        """
+        send_request_mock.return_value = {"ok": False, "error": "KeyError: 'x'"}
+
+        with self.assertRaises(CommandError):
+            call_command("load_dynamic_fixtures", connect="/tmp/fixtures.sock")
+
+    def test_resume(self):
+        """
+        Case: management command is called with the resume option
+        Expected: the runner resumes the previous run
+        """
+        call_command("load_dynamic_fixtures", resume=True)
+
+        call_kwargs = self.fixtures_runner_mock.return_value.load_fixtures.call_args[1]
+        self.assertTrue(call_kwargs["resume"])
+        self.assertFalse(call_kwargs["commit_each"])
+
+    def test_progress_callback_resume_skip(self):
+        """
+        Case: a completed fixture is skipped while resuming
+        Expected: the skipped fixture is written
+        """
+        stdout = StringIO()
+        command = Command(stdout=stdout)
+
+        command.progress_callback("resume_skip", ("app_one", "0001_fixture"))
+
+        self.assertEqual(
+            stdout.getvalue(), "Skipping completed fixture app_one.0001_fixture\n"
         )
@@ -0,0 +1,85 @@
+from io import StringIO
+from unittest import TestCase, mock
+
+from dynamic_fixtures.client import format_event, main
+
+
+class ClientTestCase(TestCase):
+    @mock.patch("dynamic_fixtures.client.send_request")
+    def test_main(self, send_request_mock):
+        """
+        Case: The client is run to load fixtures
+        Expected: The request is sent and the progress is written
+        """
+        send_request_mock.return_value = {
+            "ok": True,
+            "count": 1,
+            "events": [
+                {
+                    "action": "load_success",
+                    "node": ["app_one", "0001_fixture"],
+                    "elapsed_time": 0.5,
+                    "rows": None,
+                }
+            ],
+        }
+
+        with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+            self.assertEqual(main(["/tmp/fixtures.sock", "app_one", "--dry-run"]), 0)
+
+        send_request_mock.assert_called_once_with(
+            "/tmp/fixtures.sock",
+            {
+                "action": "load",
+                "app_label": "app_one",
+                "fixture_name": None,
+                "dry_run": True,
+                "database": None,
+            },
+        )
+        self.assertEqual(
+            stdout.getvalue(),
+            "Loaded fixture app_one.0001_fixture (0.5 seconds)\n"
+            "Total of 1 fixtures\n"
+            "Dry-run: all changes are rolled back.\n",
+        )
+
+    @mock.patch("dynamic_fixtures.client.send_request")
+    def test_main_error(self, send_request_mock):
+        """
+        Case: The server returns an error
+        Expected: The error is written and the exit code is 1
+        """
+        send_request_mock.return_value = {"ok": False, "error": "Broken"}
+
+        with mock.patch("sys.stderr", new_callable=StringIO) as stderr:
+            self.assertEqual(main(["/tmp/fixtures.sock", "--list"]), 1)
+
+        self.assertEqual(stderr.getvalue(), "Broken\n")
+
+    def test_format_event(self):
+        """
+        Case: Progress events get formatted
+        Expected: Only finished fixtures and bulk inserts are written
+        """
+        self.assertEqual(
+            format_event(
+                {
+                    "action": "bulk_flush",
+                    "node": ["a", "b"],
+                    "elapsed_time": 1,
+                    "rows": 5,
+                }
+            ),
+            "  Inserted 5 rows in bulk",
+        )
+        self.assertIsNone(
+            format_event(
+                {
+                    "action": "load_start",
+                    "node": ["a", "b"],
+                    "elapsed_time": None,
+                    "rows": None,
+                }
+            )
+        )
@@ -0,0 +1,73 @@
+import os
+
+pytest_plugins = ["pytester"]
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFTEST = """
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import Group
+from dynamic_fixtures.pytest_plugin import dynamic_fixtures_fixture
+
+pytest_plugins = ["dynamic_fixtures.pytest_plugin"]
+
+
+def load_fixtures(nodes):
+    Group.objects.create(name="loaded")
+    return len(nodes)
+
+
+@pytest.fixture(scope="session")
+def dynamic_fixtures_runner():
+    runner = mock.Mock()
+    runner.get_fixture_nodes.return_value = [("app_one", "0001_groups")]
+    runner.load_fixtures.side_effect = load_fixtures
+    return runner
+
+
+groups = dynamic_fixtures_fixture([("app_one", "0001")], scope="module")
+"""
+
+TESTS = """
+import pytest
+from django.contrib.auth.models import Group
+
+
+def test_loaded(groups, db):
+    assert Group.objects.filter(name="loaded").exists()
+
+
+def test_blocked(groups):
+    with pytest.raises(RuntimeError):
+        Group.objects.count()
+"""
+
+ROLLED_BACK = """
+from django.contrib.auth.models import Group
+
+
+def test_rolled_back(db):
+    assert not Group.objects.exists()
+"""
+
+
+def test_dynamic_fixtures_fixture(pytester, monkeypatch):
+    """
+    Case: Tests use a fixture created with dynamic_fixtures_fixture
+    Expected: The fixtures are loaded, tests without db fixture can't access
+              the database and the fixtures are rolled back afterwards
+    """
+    monkeypatch.setenv(
+        "PYTHONPATH",
+        os.pathsep.join([ROOT_DIR, os.path.join(ROOT_DIR, "src")]),
+    )
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(test_a_groups=TESTS, test_b_rolled_back=ROLLED_BACK)
+
+    result = pytester.runpytest_subprocess(
+        "-p", "pytest_django", "--ds", "tests.dynamic_fixtures_test_settings"
+    )
+
+    result.assert_outcomes(passed=3)
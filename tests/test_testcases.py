@@ -0,0 +1,69 @@
+from unittest import TestCase, mock
+
+from dynamic_fixtures.testcases import (
+    DynamicFixturesTestCase,
+    get_runner,
+    load_dynamic_fixtures,
+)
+from tests.mixins import MockTestCaseMixin
+
+
+class LoadDynamicFixturesTestCase(MockTestCaseMixin, TestCase):
+    def setUp(self):
+        self.runner_mock = self.setup_mock(
+            "dynamic_fixtures.testcases.LoadFixtureRunner"
+        )
+        self.setup_mock("dynamic_fixtures.testcases._runner", new=None, autospec=False)
+
+    def test_get_runner(self):
+        """
+        Case: The shared runner get requested twice
+        Expected: The runner is only initialized once
+        """
+        self.assertIs(get_runner(), get_runner())
+        self.runner_mock.assert_called_once_with()
+
+    def test_load_dynamic_fixtures(self):
+        """
+        Case: Fixtures get loaded
+        Expected: The nodes get resolved and loaded by the runner
+        """
+        runner = self.runner_mock.return_value
+        runner.get_fixture_nodes.return_value = [
+            ("app_one", "0001_fixture"),
+            ("app_two", "0002_fixture"),
+        ]
+
+        load_dynamic_fixtures([("app_one", "0001"), ("app_two", "0002")])
+
+        runner.get_fixture_nodes.assert_called_once_with(
+            [("app_one", "0001"), ("app_two", "0002")]
+        )
+        runner.load_fixtures.assert_called_once_with(
+            nodes=[("app_one", "0001_fixture"), ("app_two", "0002_fixture")]
+        )
+
+    def test_load_no_dynamic_fixtures(self):
+        """
+        Case: An empty list of fixtures get loaded
+        Expected: Nothing gets loaded
+        """
+        self.runner_mock.return_value.get_fixture_nodes.return_value = []
+        self.assertEqual(load_dynamic_fixtures([]), 0)
+        self.assertFalse(self.runner_mock.return_value.load_fixtures.called)
+
+    def test_set_up_test_data(self):
+        """
+        Case: The test data of a test case get set up
+        Expected: The dynamic fixtures of the test case get loaded
+        """
+
+        class MyTestCase(DynamicFixturesTestCase):
+            dynamic_fixtures = [("app_one", "0001")]
+
+        with mock.patch(
+            "dynamic_fixtures.testcases.load_dynamic_fixtures"
+        ) as load_mock:
+            MyTestCase.setUpTestData()
+
+        load_mock.assert_called_once_with([("app_one", "0001")])